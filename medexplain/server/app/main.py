@@ -8,12 +8,25 @@ from app.routes.summary import router as summary_router
 from app.routes.explain import router as explain_router
 from app.routes.records import router as records_router
 from app.routes.questions import router as questions_router
+from app.routes.analyze import router as analyze_router
+from app.routes.session import router as session_router
+from app.routes.batch import router as batch_router
+import os
 import re
 import json
 import asyncio
 import logging
 
 from app.ws_stt import ws_stt_endpoint
+from app.services.glossary import get_glossary_store, glossary_reload_loop
+from app.services.llm_cache import get_llm_cache, get_llm_inflight, llm_call_stats
+from app.services.llm_client import close_llm_client, get_llm_client, init_llm_client, llm_enabled
+from app.services.llm_resilience import llm_deadline, retry_with_backoff
+from app.services.response_cache import get_response_cache
+from app.services.translation import get_translation_service
+from app.storage.importer import import_json
+from app.storage.search import get_search_index
+from app.storage.writer import close_writer, get_writer
 
 # ----------------------------
 # logging
@@ -26,7 +39,7 @@ logger = logging.getLogger(__name__)
 # ws_stt.py 안에서 session_manager를 이미 만들어 쓰고 있을 가능성이 높아서,
 # "같은 인스턴스"를 잡아오려고 시도함.
 try:
-    from ws_stt import session_manager as stt_session_manager  # type: ignore
+    from app.ws_stt import session_manager as stt_session_manager
 except Exception:
     stt_session_manager = None  # ws_stt.py에 없으면 None
 
@@ -61,9 +74,25 @@ app.include_router(summary_router)
 app.include_router(explain_router)
 app.include_router(records_router)
 app.include_router(questions_router)
+app.include_router(analyze_router)
+app.include_router(session_router)
+app.include_router(batch_router)
+
+# 요청 하나가 LLM을 기다리는 총 시간. 넘기면 각 서비스의 로컬 fallback으로 응답
+LLM_REQUEST_DEADLINE_SECONDS = float(os.getenv("LLM_REQUEST_DEADLINE_SECONDS", "10"))
+
+
+@app.middleware("http")
+async def llm_deadline_middleware(request, call_next):
+    with llm_deadline(LLM_REQUEST_DEADLINE_SECONDS):
+        return await call_next(request)
+
 
 @app.on_event("startup")
 async def on_startup():
+    # 프로세스 전체에서 공유하는 LLM 클라이언트 (키가 없으면 fallback만 사용)
+    init_llm_client()
+
     # 서버가 켜질 때 타임아웃 정리 루프 시작
     asyncio.create_task(
         session_cleanup_loop(
@@ -73,6 +102,21 @@ async def on_startup():
         )
     )
 
+    # 용어 사전 인덱스 로딩 (없거나 원본이 바뀌었으면 컴파일) 후 변경 감시
+    await asyncio.to_thread(get_glossary_store().reload)
+    asyncio.create_task(glossary_reload_loop(interval_seconds=30))
+
+    # 기록/질문 저장소 열기 (검색 색인 버전 확인, 처음 한 번은 예전 JSON 파일을 가져옴)
+    await asyncio.to_thread(get_search_index().ensure_built)
+    await asyncio.to_thread(import_json)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await close_llm_client()
+    # 받아둔 저장은 마저 commit
+    await asyncio.to_thread(close_writer)
+
 
 # ----------------------------
 # WebSocket STT endpoint
@@ -203,12 +247,32 @@ def fallback(reason: str) -> dict:
     }
 
 
-# TODO: 여기서 실제 LLM 호출로 바꾸면 됨 (지금은 임시)
-def call_llm(raw_text: str) -> str:
+def _build_legacy_prompt(raw_text: str) -> str:
+    return f"""
+너는 환자 이해 보조 시스템이다.
+아래 진료 설명을 환자가 이해하기 쉽게 정리하라. 진단하거나 치료를 추천하지 말 것.
+
+출력은 JSON만 할 것:
+{{
+  "summary_3sent": "세 문장 요약",
+  "easy_terms": [{{"term": "...", "easy": "..."}}],
+  "next_actions": [{{"title": "...", "detail": "..."}}],
+  "warnings": ["..."]
+}}
+
+입력 텍스트:
+\"\"\"{raw_text}\"\"\"
+""".strip()
+
+
+async def call_llm(raw_text: str) -> str:
     """
     반환은 문자열 하나.
-    나중에 Gemini/OpenAI 붙이면 이 함수를 바꾸면 됨.
+    LLM backend(Gemini 또는 LLM_BACKEND=fake)가 있으면 그걸 쓰고, 없으면 예전 임시 응답.
     """
+    if llm_enabled():
+        return await get_llm_client().generate(_build_legacy_prompt(raw_text))
+
     return f"""
 아래는 결과입니다.
 {json.dumps({
@@ -221,20 +285,18 @@ def call_llm(raw_text: str) -> str:
 """.strip()
 
 
-def safe_summarize(raw_text: str) -> dict:
-    last_err = None
-
-    # 최대 3번 재시도
-    for _ in range(3):
-        try:
-            out = call_llm(raw_text)
-            j = extract_json_block(out)
-            obj = json.loads(j)
-            return sanitize_to_schema(obj)
-        except Exception as e:
-            last_err = str(e)
+async def safe_summarize(raw_text: str) -> dict:
+    async def attempt() -> dict:
+        out = await call_llm(raw_text)
+        j = extract_json_block(out)
+        obj = json.loads(j)
+        return sanitize_to_schema(obj)
 
-    return fallback(last_err or "unknown")
+    # 최대 3번, 지수 backoff로 재시도하되 전체 5초를 넘기지 않음
+    try:
+        return await retry_with_backoff(attempt, attempts=3, deadline_seconds=5.0)
+    except Exception as e:
+        return fallback(str(e) or "unknown")
 
 
 # ============================
@@ -246,6 +308,19 @@ def health():
     return {"ok": True}
 
 
+@app.get("/metrics")
+def metrics():
+    return {
+        "llm": get_llm_client().stats() if llm_enabled() else None,
+        "llm_calls": llm_call_stats(),
+        "llm_cache": get_llm_cache().stats(),
+        "llm_inflight": get_llm_inflight().stats(),
+        "translation": get_translation_service().stats(),
+        "db_writer": get_writer().stats(),
+        "response_cache": get_response_cache().stats(),
+    }
+
+
 @app.post("/summarize", response_model=SummarizeResponse)
-def summarize(req: SummarizeRequest):
-    return safe_summarize(req.raw_text)
+async def summarize(req: SummarizeRequest):
+    return await safe_summarize(req.raw_text)
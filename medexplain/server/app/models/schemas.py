@@ -1,22 +1,32 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 
 class TextRequest(BaseModel):
     text: str
 
 
+class BatchTextRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=1000)
+
+
 class TermItem(BaseModel):
     term: str
     description: str
 
 
+class UnknownTermItem(BaseModel):
+    term: str
+    label: str = "확인 필요"
+
+
 class SummaryResponse(BaseModel):
     summary: List[str]
 
 
 class ExplainResponse(BaseModel):
     terms: List[TermItem]
+    terms_unknown: List[UnknownTermItem] = []
 
 
 class RecordCreateRequest(BaseModel):
@@ -36,6 +46,27 @@ class RecordListItem(BaseModel):
 
 class RecordListResponse(BaseModel):
     records: List[RecordListItem]
+    next_cursor: Optional[str] = None  # 다음 페이지 요청에 cursor로 (마지막 페이지면 None)
+
+
+class RecordSearchItem(BaseModel):
+    record_id: str
+    date: str
+    department: str
+    summary_preview: str
+    snippet: str
+    score: float
+
+
+class RecordSearchResponse(BaseModel):
+    results: List[RecordSearchItem]
+
+
+class RecordImportResponse(BaseModel):
+    records: int  # 새로 저장된 기록 수
+    questions: int
+    skipped: int  # 이미 있는 record_id
+    invalid_lines: List[int] = []  # JSON이 아니거나 clean_text가 없는 줄 (앞 100개)
 
 
 class RecordDetailResponse(BaseModel):
@@ -82,6 +113,7 @@ class QuestionListItem(BaseModel):
 
 class QuestionListResponse(BaseModel):
     questions: List[QuestionListItem]
+    next_cursor: Optional[str] = None
 
 
 class QuestionDetailResponse(BaseModel):
@@ -91,4 +123,40 @@ class QuestionDetailResponse(BaseModel):
     general_info: List[GeneralInfoItem]
     ask_doctor: List[str]
     caution: List[str]
-    record_id: Optional[str]
\ No newline at end of file
+    record_id: Optional[str]
+
+
+# ── 한 번에 분석 (요약 + 용어 + 질문) ──────────────────────
+
+class AnalyzeRequest(BaseModel):
+    text: str
+    questions_text: Optional[str] = None  # 진료 전 질문 (있으면 같이 분류)
+    save: bool = False  # true면 기록(과 질문)을 서버에 바로 저장
+    date: Optional[str] = None  # 저장 시 사용, 없으면 오늘
+    department: str = ""
+
+
+class AnalyzeResponse(BaseModel):
+    summary: List[str]
+    terms: List[TermItem]
+    terms_unknown: List[UnknownTermItem] = []
+    questions: Optional[QuestionAnalyzeResponse] = None
+    record_id: Optional[str] = None
+    question_id: Optional[str] = None
+
+
+# ── STT 세션 종료 (전사문 + 분석 + 저장) ──────────────────────
+
+class SessionOutput2(BaseModel):
+    translation: Dict[str, str]  # target_lang -> 세그먼트별 번역을 줄바꿈으로 이은 것
+    terms_found: List[TermItem]
+    terms_unknown: List[UnknownTermItem] = []
+    warnings: List[str] = []
+
+
+class SessionEndResponse(BaseModel):
+    session_id: str
+    output1_transcript: str
+    output2: SessionOutput2
+    summary: List[str]
+    record_id: Optional[str] = None  # 전사문이 비어 있으면 저장하지 않음
@@ -0,0 +1,240 @@
+"""
+저장된 기록의 요약/용어를 다시 만드는 작업 (프롬프트나 용어 사전을 바꾼 뒤).
+
+- 기록을 seq 순서로 읽어서 처리하고, page-size개 끝날 때마다 결과와 진행 위치를 같이 저장
+  -> 중간에 멈춰도 다시 실행하면 이어서 (--restart로 처음부터)
+- 실패한 기록은 reprocess_state.error에 남기고 진행 위치는 계속 나아감
+  -> 다음 실행 때 진행 위치 앞의 실패 기록부터 다시
+- 입력(clean_text)과 버전(프롬프트, 용어 사전, 모델)이 지난번과 같은 기록은 건너뜀 (--force로 전부)
+- LLM이 있으면 summarize_text / extract_terms를 async로 동시에 (--concurrency)
+- LLM이 없거나 --local이면 로컬 추출 요약 + 사전 용어 매칭을 프로세스 풀에서 (--processes)
+
+실행 (medexplain/server 에서):
+    python -m app.reprocess
+    python -m app.reprocess --local --processes 8
+    python -m app.reprocess --tier fast --restart --limit 1000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services import term_extractor
+from app.services.llm_cache import current_model, llm_call_stats, normalize_input
+from app.services.llm_client import close_llm_client, init_llm_client, llm_enabled
+from app.services.record_fields import normalize_summary, normalize_terms_for_save
+from app.services.summarizer import TIER_FAST, summarize_text, summarize_text_rule_based, summary_version
+from app.storage.database import get_database
+from app.storage.repositories import RecordRepository
+
+_CHECKPOINT_KEY = "reprocess_checkpoint:{}"
+
+
+def _process_local(text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    # 프로세스 풀에서 실행 (LLM 없이 CPU만 쓰는 단계: 추출 요약 + 사전 용어 매칭)
+    return summarize_text_rule_based(text), term_extractor.extract_terms_local(text)
+
+
+async def _process_llm(text: str, tier: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    summary, terms = await asyncio.gather(summarize_text(text, tier=tier), term_extractor.extract_terms(text))
+    return summary, terms
+
+
+def _versions(local: bool, tier: str) -> Dict[str, str]:
+    if local:
+        return {"mode": "local", "summary": summary_version(TIER_FAST), "terms": term_extractor.terms_version()}
+    return {
+        "mode": "llm",
+        "summary": summary_version(tier),
+        "terms": term_extractor.terms_version(),
+        "model": current_model(),
+    }
+
+
+def _fingerprint(text: str, versions_key: str) -> str:
+    payload = json.dumps([normalize_input(text), versions_key], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def run(
+    *,
+    tier: str,
+    local: bool,
+    processes: int,
+    concurrency: int,
+    page_size: int,
+    restart: bool,
+    force: bool,
+    limit: Optional[int],
+) -> Dict[str, Any]:
+    db = get_database()
+    repo = RecordRepository(db)
+
+    versions = _versions(local, tier)
+    versions_key = json.dumps(versions, sort_keys=True)
+    job = hashlib.sha256(versions_key.encode("utf-8")).hexdigest()[:12]
+    checkpoint_key = _CHECKPOINT_KEY.format(job)
+
+    after_seq = None if restart else int(db.get_meta(checkpoint_key) or 0) or None
+    print(f"[reprocess] job={job} versions={versions} resume_after_seq={after_seq}")
+
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(processes) if local else None
+    slots = asyncio.Semaphore(concurrency)
+    totals = {"seen": 0, "updated": 0, "skipped": 0, "failed": 0, "retried": 0}
+    fallbacks_before = llm_call_stats()["fallbacks"]
+    started = time.perf_counter()
+
+    # 페이지 단위로 기다리지 않고 항상 concurrency개가 돌도록 (느린 LLM 호출 하나가 페이지 전체를 막지 않게)
+    pending: Dict[int, Tuple[str, asyncio.Task]] = {}
+    finished: List[Tuple[str, List[str], List[Dict[str, Any]], str]] = []
+    failures: List[Tuple[str, str]] = []
+    state = {"read_seq": after_seq or 0}
+
+    async def process(row: Dict[str, Any], fingerprint: str):
+        try:
+            text = row["clean_text"]
+            if pool is not None:
+                summary, terms = await loop.run_in_executor(pool, _process_local, text)
+            else:
+                summary, terms = await _process_llm(text, tier)
+        finally:
+            slots.release()
+        return row["record_id"], normalize_summary(summary), normalize_terms_for_save(terms), fingerprint
+
+    def harvest() -> None:
+        for seq, (record_id, task) in list(pending.items()):
+            if not task.done():
+                continue
+            del pending[seq]
+            error = task.exception()
+            if error is not None:
+                print(f"[reprocess] failed seq={seq} record_id={record_id}: {error!r}")
+                totals["failed"] += 1
+                failures.append((record_id, repr(error)))
+            else:
+                finished.append(task.result())
+
+    async def flush() -> None:
+        # 진행 위치 = 아직 안 끝난 것 중 가장 앞 바로 전 (실패는 error로 따로 남기므로 막지 않음).
+        # 앞쪽 실패 기록을 다시 도는 중에는 시작 위치 밑으로 내려가지 않음
+        checkpoint = min(pending) - 1 if pending else state["read_seq"]
+        checkpoint = max(checkpoint, after_seq or 0)
+        batch, failed = finished[:], failures[:]
+        finished.clear()
+        failures.clear()
+
+        def commit():
+            with db.transaction():
+                repo.save_reprocessed(batch)
+                repo.save_reprocess_failures(failed)
+                db.set_meta(checkpoint_key, str(checkpoint))
+
+        await asyncio.to_thread(commit)
+        totals["updated"] += len(batch)
+        elapsed = time.perf_counter() - started
+        print(
+            f"[reprocess] checkpoint_seq={checkpoint} seen={totals['seen']} updated={totals['updated']} "
+            f"skipped={totals['skipped']} failed={totals['failed']} {totals['seen'] / elapsed:.1f} rec/s"
+        )
+
+    async def submit(row: Dict[str, Any]) -> None:
+        fingerprint = _fingerprint(row["clean_text"], versions_key)
+        # 지난번에 실패한 기록은 입력이 같아도 다시
+        if force or row["error"] is not None or row["fingerprint"] != fingerprint:
+            await slots.acquire()
+            pending[row["seq"]] = (row["record_id"], asyncio.create_task(process(row, fingerprint)))
+        else:
+            totals["skipped"] += 1
+        totals["seen"] += 1
+        harvest()
+        if len(finished) + len(failures) >= page_size:
+            await flush()
+
+    async def read(*, failed_only: bool, until_seq: Optional[int] = None) -> None:
+        cursor = 0 if failed_only else state["read_seq"]
+        while limit is None or totals["seen"] < limit:
+            size = page_size if limit is None else min(page_size, limit - totals["seen"])
+            page = await asyncio.to_thread(repo.reprocess_page, limit=size, after_seq=cursor, failed_only=failed_only)
+            if until_seq is not None:
+                page = [row for row in page if row["seq"] <= until_seq]
+            if not page:
+                return
+            for row in page:
+                await submit(row)
+                cursor = row["seq"]
+                if failed_only:
+                    totals["retried"] += 1
+                else:
+                    state["read_seq"] = cursor
+
+    try:
+        if after_seq:
+            # 진행 위치 앞에서 실패했던 기록부터 (뒤쪽 실패는 이어서 읽을 때 다시 만남)
+            await read(failed_only=True, until_seq=after_seq)
+        await read(failed_only=False)
+
+        if pending:
+            await asyncio.wait([task for _, task in pending.values()])
+        harvest()
+        await flush()
+    finally:
+        for _, task in pending.values():
+            task.cancel()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    totals["seconds"] = round(elapsed, 2)
+    totals["records_per_second"] = round(totals["seen"] / elapsed, 1) if elapsed else 0.0
+    totals["llm_fallbacks"] = llm_call_stats()["fallbacks"] - fallbacks_before
+    if totals["failed"]:
+        print(f"[reprocess] {totals['failed']} records failed, they are retried on the next run (reprocess_state.error)")
+    if totals["llm_fallbacks"]:
+        # fallback 결과도 저장되고 fingerprint가 남으므로, LLM이 돌아온 뒤 --force로 다시
+        print(f"[reprocess] {totals['llm_fallbacks']} llm calls fell back to local results")
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="저장된 기록의 요약/용어 다시 만들기")
+    parser.add_argument("--tier", choices=["llm", "fast"], default="llm", help="요약 방식 (summarize_text tier)")
+    parser.add_argument("--local", action="store_true", help="LLM 없이 로컬 요약/사전 매칭만 (프로세스 풀)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("LLM_MAX_CONCURRENCY", "16")))
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--restart", action="store_true", help="저장된 진행 위치 무시하고 처음부터")
+    parser.add_argument("--force", action="store_true", help="바뀌지 않은 기록도 다시")
+    parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 볼 최대 기록 수")
+    args = parser.parse_args()
+
+    local = args.local or not llm_enabled()
+    if not local:
+        init_llm_client()
+
+    async def _main():
+        try:
+            return await run(
+                tier=args.tier,
+                local=local,
+                processes=args.processes,
+                concurrency=args.concurrency if not local else args.processes * 2,
+                page_size=args.page_size,
+                restart=args.restart,
+                force=args.force,
+                limit=args.limit,
+            )
+        finally:
+            await close_llm_client()
+
+    print(asyncio.run(_main()))
+
+
+if __name__ == "__main__":
+    main()
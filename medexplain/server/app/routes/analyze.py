@@ -0,0 +1,67 @@
+import asyncio
+from datetime import date
+
+from fastapi import APIRouter, HTTPException
+
+from app.models.schemas import (
+    AnalyzeRequest,
+    AnalyzeResponse,
+    QuestionAnalyzeResponse,
+    TermItem,
+    UnknownTermItem,
+)
+from app.routes.questions import insert_question
+from app.routes.records import _is_blank_text, insert_record
+from app.services.transcript_analyzer import analyze_transcript
+
+router = APIRouter()
+
+
+@router.post("/analyze", response_model=AnalyzeResponse)
+async def analyze(request: AnalyzeRequest):
+    """
+    /summary, /explain, /questions/analyze, POST /records를 요청 하나로.
+    전사문을 한 번만 보내고 LLM도 한 번만 부른다.
+    """
+    if request.save and _is_blank_text(request.text):
+        raise HTTPException(
+            status_code=400,
+            detail="저장할 수 있는 음성 인식 결과가 없습니다."
+        )
+
+    result = await analyze_transcript(request.text, request.questions_text)
+
+    record_id = None
+    question_id = None
+    if request.save:
+        record = await asyncio.to_thread(
+            insert_record,
+            request.date or str(date.today()),
+            request.department,
+            request.text,
+            result["summary"],
+            result["terms"],
+        )
+        record_id = record["record_id"]
+
+        questions = result["questions"]
+        if questions is not None:
+            question = await asyncio.to_thread(
+                insert_question,
+                request.questions_text,
+                questions["general_info"],
+                questions["ask_doctor"],
+                questions["caution"],
+                record_id,
+            )
+            question_id = question["question_id"]
+
+    questions = result["questions"]
+    return AnalyzeResponse(
+        summary=result["summary"],
+        terms=[TermItem(**term) for term in result["terms"]],
+        terms_unknown=[UnknownTermItem(**term) for term in result["terms_unknown"]],
+        questions=QuestionAnalyzeResponse(**questions) if questions is not None else None,
+        record_id=record_id,
+        question_id=question_id,
+    )
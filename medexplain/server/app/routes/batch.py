@@ -0,0 +1,64 @@
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.models.schemas import BatchTextRequest
+from app.routes.summary import SummaryTier
+from app.services.batch import run_batch
+from app.services.llm_cache import normalize_input
+from app.services.question_analyzer import analyze_questions
+from app.services.summarizer import TIER_LLM, summarize_text
+from app.services.term_extractor import extract_terms
+from app.services.unknown_terms import detect_unknown_terms
+
+router = APIRouter()
+
+
+def _ndjson_batch(texts, fn: Callable[[str], Awaitable[Dict[str, Any]]]) -> StreamingResponse:
+    """
+    항목별 결과를 끝나는 순서대로 NDJSON 한 줄씩 (index로 요청 순서와 맞춤).
+    마지막 줄: {"done": true, "count", "unique", "cached", "failed", "elapsed_ms"}
+    """
+    async def lines() -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        count = cached = failed = 0
+        async for item in run_batch(texts, fn):
+            count += 1
+            cached += 1 if item.get("cached") else 0
+            failed += 1 if "error" in item else 0
+            yield (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+        summary = {
+            "done": True,
+            "count": count,
+            "unique": len({normalize_input(t) for t in texts}),
+            "cached": cached,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        yield (json.dumps(summary) + "\n").encode("utf-8")
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/summary/batch")
+async def summarize_batch(request: BatchTextRequest, tier: SummaryTier = Query(TIER_LLM)):
+    async def summarize(text: str) -> Dict[str, Any]:
+        return {"summary": await summarize_text(text, tier=tier)}
+
+    return _ndjson_batch(request.texts, summarize)
+
+
+@router.post("/explain/batch")
+async def explain_batch(request: BatchTextRequest):
+    async def explain(text: str) -> Dict[str, Any]:
+        return {"terms": await extract_terms(text), "terms_unknown": detect_unknown_terms(text)}
+
+    return _ndjson_batch(request.texts, explain)
+
+
+@router.post("/questions/analyze/batch")
+async def analyze_questions_batch(request: BatchTextRequest):
+    return _ndjson_batch(request.texts, analyze_questions)
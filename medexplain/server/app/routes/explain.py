@@ -1,13 +1,35 @@
 from fastapi import APIRouter
 
-from app.models.schemas import TextRequest, ExplainResponse, TermItem
-from app.services.term_extractor import extract_terms
+from app.models.schemas import TextRequest, ExplainResponse, TermItem, UnknownTermItem
+from app.services.sse import sse_event, sse_response
+from app.services.term_extractor import extract_terms, stream_terms
+from app.services.unknown_terms import detect_unknown_terms
 
 router = APIRouter()
 
 
 @router.post("/explain", response_model=ExplainResponse)
-def explain_terms(request: TextRequest):
-    terms_result = extract_terms(request.text)
+async def explain_terms(request: TextRequest):
+    terms_result = await extract_terms(request.text)
     term_items = [TermItem(**term) for term in terms_result]
-    return ExplainResponse(terms=term_items)
\ No newline at end of file
+    unknown_items = [UnknownTermItem(**term) for term in detect_unknown_terms(request.text)]
+    return ExplainResponse(terms=term_items, terms_unknown=unknown_items)
+
+
+@router.post("/explain/stream")
+async def explain_terms_stream(request: TextRequest):
+    """
+    용어 카드를 만들어지는 대로 SSE로 보낸다.
+    event: terms_unknown [...] (사전 기반이라 바로) -> event: term {...} ... -> event: done {"terms": [...]}
+    """
+    async def events():
+        unknown = detect_unknown_terms(request.text)
+        yield sse_event("terms_unknown", unknown)
+
+        terms = []
+        async for term in stream_terms(request.text):
+            terms.append(term)
+            yield sse_event("term", term)
+        yield sse_event("done", {"terms": terms, "terms_unknown": unknown})
+
+    return sse_response(events())
@@ -1,9 +1,8 @@
-import json
 import uuid
 from datetime import date
-from pathlib import Path
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 
 from app.models.schemas import (
     GeneralInfoItem,
@@ -15,27 +14,19 @@ from app.models.schemas import (
     QuestionSaveRequest,
 )
 from app.services.question_analyzer import analyze_questions
+from app.services.sse import sse_event, sse_response
+from app.services.triage import triage
+from app.services.response_cache import get_response_cache, make_etag
+from app.storage.database import get_database
+from app.storage.repositories import decode_cursor, encode_cursor, get_question_repository
+from app.storage.writer import get_writer
 
 router = APIRouter()
 
-DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "questions.json"
-
-
-def _load():
-    if not DATA_FILE.exists():
-        return []
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def _save(data):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
 
 @router.post("/questions/analyze", response_model=QuestionAnalyzeResponse)
-def analyze(request: QuestionAnalyzeRequest):
-    result = analyze_questions(request.text)
+async def analyze(request: QuestionAnalyzeRequest):
+    result = await analyze_questions(request.text)
     return QuestionAnalyzeResponse(
         general_info=[GeneralInfoItem(**i) for i in result["general_info"]],
         ask_doctor=result["ask_doctor"],
@@ -43,54 +34,101 @@ def analyze(request: QuestionAnalyzeRequest):
     )
 
 
-@router.post("/questions")
-def save_question(request: QuestionSaveRequest):
-    if not request.raw_text.strip():
-        raise HTTPException(status_code=400, detail="질문 내용이 없습니다.")
+@router.post("/questions/analyze/stream")
+async def analyze_stream(request: QuestionAnalyzeRequest):
+    """
+    응급 질문을 LLM보다 먼저 SSE로 보낸다.
+    event: caution {"caution": [...], "flags": [{"question", "flags"}]} (로컬 규칙이라 바로)
+    -> event: done {"general_info", "ask_doctor", "caution"} (LLM 결과와 합친 최종 분류)
+    """
+    async def events():
+        hits = triage(request.text)
+        yield sse_event("caution", {"caution": [h["question"] for h in hits], "flags": hits})
+        yield sse_event("done", await analyze_questions(request.text))
+
+    return sse_response(events())
 
-    questions = _load()
+
+def insert_question(raw_text, general_info, ask_doctor, caution, record_id=None):
+    """질문 하나를 저장하고 저장된 dict를 돌려준다."""
     new_item = {
         "question_id": str(uuid.uuid4()),
         "created_at": str(date.today()),
-        "raw_text": request.raw_text.strip(),
-        "general_info": [i.model_dump() for i in request.general_info],
-        "ask_doctor": request.ask_doctor,
-        "caution": request.caution,
-        "record_id": request.record_id,
+        "raw_text": raw_text.strip(),
+        "general_info": [i.model_dump() if hasattr(i, "model_dump") else dict(i) for i in general_info],
+        "ask_doctor": list(ask_doctor),
+        "caution": list(caution),
+        "record_id": record_id,
     }
-    questions.append(new_item)
-    _save(questions)
+    get_writer().write(lambda: get_question_repository().insert(new_item))
+    return new_item
+
+
+@router.post("/questions")
+def save_question(request: QuestionSaveRequest):
+    if not request.raw_text.strip():
+        raise HTTPException(status_code=400, detail="질문 내용이 없습니다.")
+
+    new_item = insert_question(
+        request.raw_text,
+        request.general_info,
+        request.ask_doctor,
+        request.caution,
+        request.record_id,
+    )
     return {"question_id": new_item["question_id"], "message": "saved"}
 
 
 @router.get("/questions", response_model=QuestionListResponse)
-def list_questions():
-    questions = _load()
-    items = [
-        QuestionListItem(
+def list_questions(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    record_id: Optional[str] = None,
+):
+    try:
+        after_seq = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 cursor입니다.")
+
+    repo = get_question_repository()
+    page = dict(limit=limit, after_seq=after_seq, date_from=date_from, date_to=date_to, record_id=record_id)
+    seqs, next_seq = repo.page_seqs(**page)
+    etag = make_etag(get_database().instance_id, "questions", seqs, next_seq)
+
+    def build():
+        items, next_seq = repo.list_page(**page)
+        return QuestionListResponse(
+            questions=[QuestionListItem(**item) for item in items],
+            next_cursor=encode_cursor(next_seq),
+        )
+
+    return get_response_cache().respond(request, etag, build)
+
+
+@router.get("/questions/{question_id}", response_model=QuestionDetailResponse)
+def get_question(question_id: str, request: Request):
+    repo = get_question_repository()
+    seq = repo.get_seq(question_id)
+    if seq is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+    # 질문은 저장 후 바뀌지 않으므로 seq만으로
+    etag = make_etag(get_database().instance_id, "question", seq)
+
+    def build():
+        q = repo.get(question_id)
+        if q is None:
+            raise HTTPException(status_code=404, detail="Question not found")
+        return QuestionDetailResponse(
             question_id=q["question_id"],
             created_at=q["created_at"],
             raw_text=q["raw_text"],
-            ask_doctor_count=len(q.get("ask_doctor", [])),
+            general_info=[GeneralInfoItem(**i) for i in q.get("general_info", [])],
+            ask_doctor=q.get("ask_doctor", []),
+            caution=q.get("caution", []),
             record_id=q.get("record_id"),
         )
-        for q in questions
-    ]
-    return QuestionListResponse(questions=items)
-
 
-@router.get("/questions/{question_id}", response_model=QuestionDetailResponse)
-def get_question(question_id: str):
-    questions = _load()
-    for q in questions:
-        if q["question_id"] == question_id:
-            return QuestionDetailResponse(
-                question_id=q["question_id"],
-                created_at=q["created_at"],
-                raw_text=q["raw_text"],
-                general_info=[GeneralInfoItem(**i) for i in q.get("general_info", [])],
-                ask_doctor=q.get("ask_doctor", []),
-                caution=q.get("caution", []),
-                record_id=q.get("record_id"),
-            )
-    raise HTTPException(status_code=404, detail="Question not found")
+    return get_response_cache().respond(request, etag, build)
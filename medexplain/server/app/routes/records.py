@@ -1,80 +1,46 @@
-import json
+import asyncio
 import uuid
-from pathlib import Path
+import zlib
+from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.models.schemas import (
     RecordCreateRequest,
     RecordDetailResponse,
+    RecordImportResponse,
     RecordListItem,
     RecordListResponse,
+    RecordSearchItem,
+    RecordSearchResponse,
 )
+from app.services.record_fields import normalize_summary, normalize_terms_for_save
+from app.services.response_cache import get_response_cache, make_etag
+from app.storage.bulk import NdjsonDecoder, gzip_stream, iter_export
+from app.storage.database import get_database
+from app.storage.repositories import (
+    decode_cursor,
+    encode_cursor,
+    get_question_repository,
+    get_record_repository,
+)
+from app.storage.search import get_search_index
+from app.storage.writer import get_writer
 
 router = APIRouter()
 
-DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "records.json"
-
-
-def load_records():
-    if not DATA_FILE.exists():
-        return []
+# 가져오기: 이만큼씩 모아서 쓰기 스레드에 한 번에
+IMPORT_BATCH_SIZE = 500
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_records(records):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
+_MAX_REPORTED_INVALID_LINES = 100
 
 
 def _is_blank_text(text: str) -> bool:
     return not text or not text.strip()
 
 
-def _normalize_summary(summary):
-    if summary is None:
-        return ["요약이 생성되지 않았습니다."]
-
-    if isinstance(summary, list):
-        cleaned = [str(item).strip() for item in summary if str(item).strip()]
-        return cleaned if cleaned else ["요약이 생성되지 않았습니다."]
-
-    text = str(summary).strip()
-    return [text] if text else ["요약이 생성되지 않았습니다."]
-
-
-def _normalize_terms_for_save(terms):
-    if not terms:
-        return []
-
-    normalized = []
-    for term in terms:
-        if hasattr(term, "model_dump"):
-            item = term.model_dump()
-        else:
-            item = dict(term)
-
-        term_text = str(item.get("term", "")).strip()
-        easy_text = str(item.get("description", "") or item.get("easy", "")).strip()
-
-        if not term_text:
-            continue
-
-        normalized.append(
-            {
-                "term": term_text,
-                # 기존 저장 구조 유지
-                "easy": easy_text,
-                # 상세 조회 response_model 호환용
-                "description": easy_text,
-            }
-        )
-
-    return normalized
-
-
 def _normalize_terms_for_detail(terms):
     if not terms:
         return []
@@ -101,6 +67,21 @@ def _normalize_terms_for_detail(terms):
     return normalized
 
 
+def insert_record(date, department, clean_text, summary, terms):
+    """기록 하나를 저장하고 저장된 dict를 돌려준다 (clean_text는 비어 있지 않아야 함)."""
+    new_record = {
+        "record_id": str(uuid.uuid4()),
+        "date": date,
+        "department": department,
+        "clean_text": clean_text.strip(),
+        "summary": normalize_summary(summary),
+        "terms": normalize_terms_for_save(terms),
+    }
+
+    get_writer().write(lambda: get_record_repository().insert(new_record))
+    return new_record
+
+
 @router.post("/records")
 def create_record(request: RecordCreateRequest):
     if _is_blank_text(request.clean_text):
@@ -109,19 +90,13 @@ def create_record(request: RecordCreateRequest):
             detail="저장할 수 있는 음성 인식 결과가 없습니다."
         )
 
-    records = load_records()
-
-    new_record = {
-        "record_id": str(uuid.uuid4()),
-        "date": request.date,
-        "department": request.department,
-        "clean_text": request.clean_text.strip(),
-        "summary": _normalize_summary(request.summary),
-        "terms": _normalize_terms_for_save(request.terms),
-    }
-
-    records.append(new_record)
-    save_records(records)
+    new_record = insert_record(
+        request.date,
+        request.department,
+        request.clean_text,
+        request.summary,
+        request.terms,
+    )
 
     return {
         "record_id": new_record["record_id"],
@@ -130,39 +105,185 @@ def create_record(request: RecordCreateRequest):
 
 
 @router.get("/records", response_model=RecordListResponse)
-def get_records():
-    records = load_records()
-
-    result = []
-    for record in records:
-        summary_list = record.get("summary", [])
-        summary_preview = summary_list[0] if summary_list else ""
-
-        result.append(
-            RecordListItem(
-                record_id=record["record_id"],
-                date=record["date"],
-                department=record["department"],
-                summary_preview=summary_preview,
-            )
+def get_records(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    department: Optional[str] = None,
+):
+    try:
+        after_seq = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 cursor입니다.")
+
+    repo = get_record_repository()
+    page = dict(limit=limit, after_seq=after_seq, date_from=date_from, date_to=date_to, department=department)
+    # ETag는 페이지에 들어갈 행들의 (seq, version)만 읽어서 (본문 없이)
+    versions, next_seq = repo.page_versions(**page)
+    etag = make_etag(get_database().instance_id, "records", versions, next_seq)
+
+    def build():
+        items, next_seq = repo.list_page(**page)
+        return RecordListResponse(
+            records=[RecordListItem(**item) for item in items],
+            next_cursor=encode_cursor(next_seq),
+        )
+
+    return get_response_cache().respond(request, etag, build)
+
+
+@router.get("/records/search", response_model=RecordSearchResponse)
+def search_records(q: str = Query(..., min_length=1), limit: int = Query(20, ge=1, le=100)):
+    results = get_search_index().search(q, limit=limit)
+    return RecordSearchResponse(results=[RecordSearchItem(**item) for item in results])
+
+
+@router.get("/records/export")
+def export_records(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    department: Optional[str] = None,
+    gzip: bool = False,
+):
+    """기록 + 연결된 질문을 NDJSON으로 스트리밍 (백업/이전/분석용)."""
+    chunks = iter_export(
+        get_record_repository(),
+        get_question_repository(),
+        date_from=date_from,
+        date_to=date_to,
+        department=department,
+    )
+    if gzip:
+        return StreamingResponse(
+            gzip_stream(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="records.ndjson.gz"'},
         )
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
 
-    return RecordListResponse(records=result)
+def _import_id(*parts):
+    # id 없는 기록/질문은 내용으로 id를 정함 -> 같은 파일을 다시 올려도 중복 저장되지 않음
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, "\x1f".join(parts)))
+
+
+def _record_from_import(item):
+    clean_text = str(item.get("clean_text") or "")
+    if _is_blank_text(clean_text):
+        return None
+    clean_text = clean_text.strip()
+    raw_date = str(item.get("date") or "")
+    department = str(item.get("department") or "")
+    return {
+        "record_id": str(item.get("record_id") or _import_id("record", raw_date, department, clean_text)),
+        "date": raw_date or str(date.today()),
+        "department": department,
+        "clean_text": clean_text,
+        "summary": normalize_summary(item.get("summary")),
+        "terms": normalize_terms_for_save(item.get("terms")),
+    }
+
+
+def _questions_from_import(item, record_id):
+    questions = []
+    for q in item.get("questions") or []:
+        if not isinstance(q, dict) or not str(q.get("raw_text") or "").strip():
+            continue
+        raw_text = str(q["raw_text"]).strip()
+        created_at = str(q.get("created_at") or "")
+        questions.append({
+            "question_id": str(q.get("question_id") or _import_id(record_id, raw_text, created_at)),
+            "created_at": created_at or str(date.today()),
+            "raw_text": raw_text,
+            "general_info": list(q.get("general_info") or []),
+            "ask_doctor": list(q.get("ask_doctor") or []),
+            "caution": list(q.get("caution") or []),
+            "record_id": record_id,
+        })
+    return questions
+
+
+def _write_import_batch(records, questions):
+    # 기록과 질문을 쓰기 스레드의 transaction 하나로
+    def write():
+        saved = get_record_repository().insert_many(records)
+        return saved, get_question_repository().insert_many(questions)
+
+    return get_writer().write(write)
+
+
+@router.post("/records/import", response_model=RecordImportResponse)
+async def import_records(request: Request):
+    """
+    export와 같은 모양의 NDJSON (gzip이어도 됨)을 받아서 저장.
+    본문을 조각으로 읽으면서 IMPORT_BATCH_SIZE개씩 저장하므로 전체를 메모리에 올리지 않는다.
+    이미 있는 record_id/question_id는 건너뛴다 (같은 파일을 다시 올려도 안전).
+    """
+    decoder = NdjsonDecoder()
+    totals = {"records": 0, "questions": 0, "seen": 0}
+    invalid_lines = []
+    records, questions = [], []
+
+    async def flush():
+        if not records:
+            return
+        saved, saved_questions = await asyncio.to_thread(_write_import_batch, list(records), list(questions))
+        totals["records"] += saved
+        totals["questions"] += saved_questions
+        records.clear()
+        questions.clear()
+
+    async def consume(parsed):
+        for line_no, item in parsed:
+            record = _record_from_import(item) if item is not None else None
+            if record is None:
+                if len(invalid_lines) < _MAX_REPORTED_INVALID_LINES:
+                    invalid_lines.append(line_no)
+                continue
+            totals["seen"] += 1
+            records.append(record)
+            questions.extend(_questions_from_import(item, record["record_id"]))
+            if len(records) >= IMPORT_BATCH_SIZE:
+                await flush()
+
+    try:
+        async for chunk in request.stream():
+            await consume(decoder.feed(chunk))
+        await consume(decoder.close())
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="gzip 본문이 손상되었습니다.")
+    await flush()
+
+    print(f"[records] imported records={totals['records']} questions={totals['questions']} invalid={len(invalid_lines)}")
+    return RecordImportResponse(
+        records=totals["records"],
+        questions=totals["questions"],
+        skipped=totals["seen"] - totals["records"],
+        invalid_lines=invalid_lines,
+    )
 
 
 @router.get("/records/{record_id}", response_model=RecordDetailResponse)
-def get_record_detail(record_id: str):
-    records = load_records()
-
-    for record in records:
-        if record["record_id"] == record_id:
-            return RecordDetailResponse(
-                record_id=record["record_id"],
-                date=record["date"],
-                department=record["department"],
-                clean_text=record["clean_text"],
-                summary=record.get("summary", []),
-                terms=_normalize_terms_for_detail(record.get("terms", [])),
-            )
-
-    raise HTTPException(status_code=404, detail="Record not found")
\ No newline at end of file
+def get_record_detail(record_id: str, request: Request):
+    repo = get_record_repository()
+    version = repo.get_version(record_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Record not found")
+    etag = make_etag(get_database().instance_id, "record", *version)
+
+    def build():
+        record = repo.get(record_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Record not found")
+        return RecordDetailResponse(
+            record_id=record["record_id"],
+            date=record["date"],
+            department=record["department"],
+            clean_text=record["clean_text"],
+            summary=record.get("summary", []),
+            terms=_normalize_terms_for_detail(record.get("terms", [])),
+        )
+
+    return get_response_cache().respond(request, etag, build)
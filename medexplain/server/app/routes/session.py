@@ -0,0 +1,112 @@
+import asyncio
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+
+from app.models.schemas import SessionEndResponse, SessionOutput2, TermItem, UnknownTermItem
+from app.routes.records import _is_blank_text, insert_record
+from app.services.stt_sessions import SttSession, get_session_manager
+from app.services.transcript_analyzer import analyze_transcript
+from app.services.translation import DEFAULT_TARGETS, get_translation_service
+
+router = APIRouter()
+
+
+async def _translate_segments(segments: List[str]) -> tuple:
+    # 세션 중에 이미 번역한 세그먼트라 대부분 캐시 적중
+    service = get_translation_service()
+    results = await asyncio.gather(
+        *(service.translate(s, source_lang="ko", target_langs=DEFAULT_TARGETS) for s in segments)
+    )
+    translation = {}
+    uncertain = False
+    for target in DEFAULT_TARGETS:
+        lines = []
+        for segment, result in zip(segments, results):
+            item = result.get(target)
+            lines.append(item.text if item is not None else segment)
+            uncertain = uncertain or item is None or not item.ok
+        translation[target] = "\n".join(lines)
+    return translation, uncertain
+
+
+async def _finalize(session: SttSession, summary: Optional[List[str]]) -> dict:
+    transcript = session.transcript
+    warnings = list(session.warnings)
+
+    if _is_blank_text(transcript):
+        warnings.append("음성이 인식되지 않았습니다. 다시 녹음해주세요.")
+        return {
+            "session_id": session.session_id,
+            "output1_transcript": "",
+            "output2": {"translation": {}, "terms_found": [], "terms_unknown": [], "warnings": warnings},
+            "summary": [],
+            "record_id": None,
+        }
+
+    analysis, (translation, uncertain) = await asyncio.gather(
+        analyze_transcript(transcript),
+        _translate_segments(list(session.segments)),
+    )
+    if uncertain:
+        warnings.append("확인이 필요한 번역이 있습니다.")
+
+    # 세션 중에 보여준 진행 요약이 있으면 그걸 그대로 저장 (화면과 기록이 같도록)
+    summary = summary or analysis["summary"]
+    record = await asyncio.to_thread(
+        insert_record,
+        str(date.today()),
+        session.department,
+        transcript,
+        summary,
+        analysis["terms"],
+    )
+    print(f"[session] saved sid={session.session_id} record_id={record['record_id']} segments={len(session.segments)}")
+
+    return {
+        "session_id": session.session_id,
+        "output1_transcript": transcript,
+        "output2": {
+            "translation": translation,
+            "terms_found": analysis["terms"],
+            "terms_unknown": analysis["terms_unknown"],
+            "warnings": warnings,
+        },
+        "summary": summary,
+        "record_id": record["record_id"],
+    }
+
+
+async def end_session(session: SttSession, *, summary: Optional[List[str]] = None) -> dict:
+    """
+    세션 전사문을 분석하고 기록으로 저장한다.
+    WS session.end와 POST /session/{id}/end 중 먼저 온 쪽이 실행하고 나머지는 같은 결과를 받는다.
+    """
+    task = session.end_task
+    if task is None or (task.done() and task.exception() is not None):
+        task = session.end_task = asyncio.ensure_future(_finalize(session, summary))
+    # 요청이 끊겨도 저장은 끝까지
+    return await asyncio.shield(task)
+
+
+@router.post("/session/{session_id}/end", response_model=SessionEndResponse)
+async def end_session_route(session_id: str):
+    session = get_session_manager().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    result = await end_session(session)
+    output2 = result["output2"]
+    return SessionEndResponse(
+        session_id=result["session_id"],
+        output1_transcript=result["output1_transcript"],
+        output2=SessionOutput2(
+            translation=output2["translation"],
+            terms_found=[TermItem(**term) for term in output2["terms_found"]],
+            terms_unknown=[UnknownTermItem(**term) for term in output2["terms_unknown"]],
+            warnings=output2["warnings"],
+        ),
+        summary=result["summary"],
+        record_id=result["record_id"],
+    )
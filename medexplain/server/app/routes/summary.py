@@ -1,12 +1,34 @@
-from fastapi import APIRouter
+from typing import Literal
+
+from fastapi import APIRouter, Query
 
 from app.models.schemas import TextRequest, SummaryResponse
-from app.services.summarizer import summarize_text
+from app.services.sse import sse_event, sse_response
+from app.services.summarizer import TIER_LLM, stream_summary, summarize_text
 
 router = APIRouter()
 
+# fast: 로컬 추출 요약 (수 ms, LLM 호출 없음) / llm: LLM 요약 (실패 시 추출 요약)
+SummaryTier = Literal["fast", "llm"]
+
 
 @router.post("/summary", response_model=SummaryResponse)
-def summarize(request: TextRequest):
-    summary_result = summarize_text(request.text)
-    return SummaryResponse(summary=summary_result)
\ No newline at end of file
+async def summarize(request: TextRequest, tier: SummaryTier = Query(TIER_LLM)):
+    summary_result = await summarize_text(request.text, tier=tier)
+    return SummaryResponse(summary=summary_result)
+
+
+@router.post("/summary/stream")
+async def summarize_stream(request: TextRequest, tier: SummaryTier = Query(TIER_LLM)):
+    """
+    요약 bullet을 만들어지는 대로 SSE로 보낸다.
+    event: bullet {"index", "text"} ... event: done {"summary": [...]}
+    """
+    async def events():
+        summary = []
+        async for bullet in stream_summary(request.text, tier=tier):
+            yield sse_event("bullet", {"index": len(summary), "text": bullet})
+            summary.append(bullet)
+        yield sse_event("done", {"summary": summary})
+
+    return sse_response(events())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.services.llm_cache import CacheMiss, cache_only, normalize_input
+from app.services.llm_client import get_llm_client, llm_enabled
+from app.services.llm_resilience import llm_deadline
+
+# 캐시 확인은 LLM을 부르지 않으므로 넉넉하게
+PROBE_CONCURRENCY = 64
+
+_MISS = object()
+
+
+def _item_deadline() -> float:
+    # 항목 하나에 단건 요청과 같은 시간
+    return float(os.getenv("LLM_BATCH_ITEM_DEADLINE_SECONDS", os.getenv("LLM_REQUEST_DEADLINE_SECONDS", "10")))
+
+
+def _default_concurrency() -> int:
+    # LLM 동시 호출 한도만큼 (그 이상 띄워도 semaphore에서 기다리며 deadline만 씀)
+    return get_llm_client().max_concurrency if llm_enabled() else 16
+
+
+async def _as_completed(
+    items: Iterable[Tuple[str, str]],
+    fn: Callable[[str], Awaitable[Any]],
+    limit: int,
+) -> AsyncIterator[Tuple[str, Any, Optional[BaseException]]]:
+    """worker limit개가 items를 나눠 처리하고, 끝나는 순서대로 (key, 결과, 예외)."""
+    source = iter(items)
+    done: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        for key, text in source:
+            try:
+                await done.put((key, await fn(text), None))
+            except Exception as e:
+                await done.put((key, None, e))
+        await done.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(limit, 1))]
+    try:
+        remaining = len(workers)
+        while remaining:
+            item = await done.get()
+            if item is None:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        # 클라이언트가 끊으면 남은 작업도 멈춤
+        for task in workers:
+            task.cancel()
+
+
+async def run_batch(
+    texts: List[str],
+    fn: Callable[[str], Awaitable[Any]],
+    *,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    텍스트 여러 개에 같은 작업(fn)을 돌리고 끝나는 대로 항목별 결과를 내보낸다.
+    1) 같은 입력(공백/정규화 기준)은 한 번만 계산하고 결과를 모든 index에 돌려줌
+    2) 캐시에 있는 것부터 LLM 없이 바로 (cache_only)
+    3) 나머지는 LLM 동시 호출 한도 안에서 동시에, 항목마다 단건 요청과 같은 deadline
+    결과: {"index", "result", "cached"} 또는 {"index", "error"}
+    (cached=True는 LLM을 기다리지 않고 바로 나온 결과: 캐시 적중이나 로컬 계산)
+    """
+    groups: Dict[str, List[int]] = {}
+    for i, text in enumerate(texts):
+        groups.setdefault(normalize_input(text), []).append(i)
+    uniques = [(key, texts[indices[0]]) for key, indices in groups.items()]
+
+    def lines(key: str, **fields: Any) -> List[Dict[str, Any]]:
+        return [{"index": i, **fields} for i in groups[key]]
+
+    async def probe(text: str) -> Any:
+        with cache_only():
+            try:
+                return await fn(text)
+            except CacheMiss:
+                return _MISS
+
+    misses = []
+    async for key, result, error in _as_completed(uniques, probe, PROBE_CONCURRENCY):
+        if error is not None or result is _MISS:
+            # 캐시 확인 중 에러도 본 계산에서 다시
+            misses.append((key, texts[groups[key][0]]))
+        else:
+            for line in lines(key, result=result, cached=True):
+                yield line
+
+    deadline = _item_deadline()
+
+    async def compute(text: str) -> Any:
+        with llm_deadline(deadline, replace=True):
+            return await fn(text)
+
+    async for key, result, error in _as_completed(misses, compute, concurrency or _default_concurrency()):
+        if error is not None:
+            print(f"[batch] item failed: {error!r}")
+            for line in lines(key, error=type(error).__name__):
+                yield line
+        else:
+            for line in lines(key, result=result, cached=False):
+                yield line
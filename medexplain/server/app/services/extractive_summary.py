@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import bisect
+import math
+import re
+import zlib
+from typing import List, Optional
+
+from app.services.glossary import Glossary, get_glossary
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 TextRank 없이 TF-IDF 점수만
+    np = None
+
+# 문장 경계
+# - 구두점 뒤 공백 / 줄바꿈
+# - STT 결과에 구두점이 없을 때를 위해 한국어 종결 어미 뒤 공백
+_SENTENCE_SPLIT_RE = re.compile(
+    r"(?<=[.!?。？！])\s+"
+    r"|\n+"
+    r"|(?:(?<=니다|세요|에요|예요|어요|아요|해요|게요|네요|지요|군요)|(?<=거든요)|(?<=죠))\s+"
+)
+
+_TOKEN_RE = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9\-]*|\d+(?:[.,]\d+)?")
+
+# 너무 짧은 문장("네.", "아 그렇군요")은 요약 후보에서 뺌
+_MIN_SENTENCE_CHARS = 8
+
+# 해시 특징 차원 (어휘 사전 없이 고정 크기 벡터)
+_DIM = 4096
+
+_DAMPING = 0.85
+_ITERATIONS = 30
+
+# 사전 용어가 나온 문장 가중치 (용어 하나당, 최대 3개까지)
+_TERM_BOOST = 0.25
+
+
+def split_sentences(text: str) -> List[str]:
+    """구두점과 한국어 종결 어미를 기준으로 문장을 나눈다."""
+    sentences = []
+    for part in _SENTENCE_SPLIT_RE.split(text or ""):
+        part = " ".join(part.split())
+        if part:
+            sentences.append(part)
+    return sentences
+
+
+def _features(sentences: List[str]) -> List[List[int]]:
+    """
+    문장별 해시 특징. 한글은 어절 안의 글자 bigram (조사가 붙어도 대부분 겹침),
+    영문/숫자는 토큰 그대로 (소문자).
+    """
+    hashes = {}  # 같은 bigram이 수없이 반복되므로 해시는 한 번만
+
+    def feature(gram: str) -> int:
+        h = hashes.get(gram)
+        if h is None:
+            h = hashes[gram] = zlib.crc32(gram.encode("utf-8")) % _DIM
+        return h
+
+    result = []
+    for sentence in sentences:
+        features = []
+        for token in _TOKEN_RE.findall(sentence):
+            if "가" <= token[0] <= "힣":
+                if len(token) == 1:
+                    features.append(feature(token))
+                else:
+                    features.extend(feature(token[i:i + 2]) for i in range(len(token) - 1))
+            else:
+                features.append(feature(token.lower()))
+        result.append(features)
+    return result
+
+
+def _term_counts(sentences: List[str], glossary: Glossary) -> List[int]:
+    # 문장을 줄바꿈으로 이어 매처를 한 번만 돌리고, 위치로 문장을 찾음
+    starts = []
+    offset = 0
+    for sentence in sentences:
+        starts.append(offset)
+        offset += len(sentence) + 1
+
+    ids = [set() for _ in sentences]
+    for m in glossary.matcher.find_all("\n".join(sentences)):
+        ids[bisect.bisect_right(starts, m.start) - 1].add(m.pattern_id)
+    return [min(len(found), 3) for found in ids]
+
+
+def _scores_numpy(features: List[List[int]]) -> List[float]:
+    """
+    TF-IDF 코사인 유사도 그래프의 TextRank.
+    유사도 행렬 S = X Xᵀ를 만들지 않고 희소 X로 S·v = X(Xᵀv)를 계산하므로
+    문장 수가 수천 개여도 반복 한 번이 O(특징 수)다.
+    """
+    n = len(features)
+    rows = np.repeat(np.arange(n), [len(f) for f in features])
+    cols = np.fromiter((c for f in features for c in f), dtype=np.int64, count=len(rows))
+    if len(rows) == 0:
+        return [0.0] * n
+
+    # (문장, 특징)별 TF
+    pairs, tf = np.unique(rows * _DIM + cols, return_counts=True)
+    rows, cols = pairs // _DIM, pairs % _DIM
+
+    df = np.bincount(cols, minlength=_DIM)
+    idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+    vals = tf * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=vals * vals, minlength=n))
+    vals = vals / norms[rows]
+    self_sim = (norms > 0).astype(np.float64)  # 정규화된 문장은 자기 자신과 유사도 1
+
+    def sim_dot(v):
+        # (X Xᵀ - I) v
+        xt_v = np.bincount(cols, weights=vals * v[rows], minlength=_DIM)
+        return np.bincount(rows, weights=vals * xt_v[cols], minlength=n) - self_sim * v
+
+    degree = sim_dot(np.ones(n))
+    degree[degree <= 1e-12] = np.inf  # 다른 문장과 겹치는 게 없는 문장
+
+    rank = np.full(n, 1.0 / n)
+    teleport = (1.0 - _DAMPING) / n
+    for _ in range(_ITERATIONS):
+        new_rank = teleport + _DAMPING * sim_dot(rank / degree)
+        if np.abs(new_rank - rank).sum() < 1e-6:
+            rank = new_rank
+            break
+        rank = new_rank
+    return (rank * n).tolist()
+
+
+def _scores_python(features: List[List[int]]) -> List[float]:
+    # numpy 없을 때: 문장 안 특징들의 평균 TF-IDF (문서 전체에 흔한 말이 많을수록 낮음)
+    n = len(features)
+    df = {}
+    for feats in features:
+        for f in set(feats):
+            df[f] = df.get(f, 0) + 1
+    scores = []
+    for feats in features:
+        if not feats:
+            scores.append(0.0)
+            continue
+        total = sum(math.log((1.0 + n) / (1.0 + df[f])) + 1.0 for f in feats)
+        scores.append(total / math.sqrt(len(feats)))
+    return scores
+
+
+def _as_bullet(sentence: str) -> str:
+    return sentence if sentence[-1] in ".!?。？！" else sentence + "."
+
+
+def extractive_summary(
+    text: str,
+    *,
+    max_sentences: int = 3,
+    glossary: Optional[Glossary] = None,
+) -> List[str]:
+    """
+    LLM 없이 원문 문장을 골라 만드는 요약.
+    - 한국어 종결 어미까지 보는 문장 분리
+    - 해시 TF-IDF 벡터 + 코사인 유사도 TextRank (numpy, 없으면 TF-IDF 점수만)
+    - 사전 용어가 나온 문장에 가중치
+    고른 문장은 원문 순서대로 돌려준다. 1시간 분량 전사도 수십 ms 안에 끝난다.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+
+    # 같은 문장이 여러 번 나오면 (STT 반복, 되묻기) 처음 것만 후보로
+    candidates = list(dict.fromkeys(s for s in sentences if len(s) >= _MIN_SENTENCE_CHARS))
+    if not candidates:
+        candidates = list(dict.fromkeys(sentences))
+    if len(candidates) <= max_sentences:
+        return [_as_bullet(s) for s in candidates]
+
+    features = _features(candidates)
+    scores = _scores_numpy(features) if np is not None else _scores_python(features)
+
+    glossary = glossary or get_glossary()
+    for i, count in enumerate(_term_counts(candidates, glossary)):
+        scores[i] *= 1.0 + _TERM_BOOST * count
+
+    top = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)[:max_sentences]
+    return [_as_bullet(candidates[i]) for i in sorted(top)]
@@ -0,0 +1,385 @@
+"""
+의료 용어 사전 (glossary)
+
+원본은 app/data/glossary.json 하나뿐이다 (용어, 별칭, 진료과, 쉬운 설명, en/zh 번역어).
+서버는 이를 바이너리 인덱스(app/data/glossary.idx)로 미리 컴파일해 두고 읽는다.
+인덱스 = 컴파일된 Aho-Corasick 테이블(int32 배열) + 문자열 테이블이다.
+로딩은 헤더를 읽고 배열에 memoryview를 씌우는 것뿐이라 사전 크기와 무관하고
+(JSON 파싱, failure link 계산, 상태별 dict 생성 없음), 문자열은 쓸 때만 디코딩한다.
+
+STT phrase hint, fallback 용어 추출, 번역 gloss가 모두 여기서 나온다.
+
+수동 컴파일:
+    python -m app.services.glossary
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.services.term_matcher import PackedTermMatcher, TermMatcher, fold, unique_patterns
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+GLOSSARY_SOURCE = DATA_DIR / "glossary.json"
+GLOSSARY_INDEX = DATA_DIR / "glossary.idx"
+
+_MAGIC = b"MXGL"
+# 2: 상태별 간선을 문자 코드 순서로 (이진 탐색)
+_FORMAT = 2
+# magic, format, source sha256, n_states, n_edges, n_out, n_patterns, n_entries, n_strings, blob_len, version_sid
+_HEADER = struct.Struct("<4sI32s8I")
+# entry = term, description, gloss_en, gloss_zh, departments("|"로 연결)
+_ENTRY_FIELDS = 5
+_NO_STRING = -1
+
+# Google STT phrase hint 개수 제한 여유분
+_MAX_PHRASE_HINTS = 500
+
+
+@dataclass(frozen=True)
+class GlossaryEntry:
+    term: str
+    description: str
+    departments: Tuple[str, ...]
+    gloss: Dict[str, str]
+
+
+def _int_array(values) -> array:
+    return array("i", values)
+
+
+def compile_glossary(raw: bytes) -> bytes:
+    """glossary.json bytes -> 인덱스 bytes"""
+    data = json.loads(raw.decode("utf-8"))
+    version = str(data.get("version", "0"))
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def sid(value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    patterns: List[str] = []
+    pattern_entry: List[int] = []
+    seen = set()
+    entries: List[int] = []
+
+    for item in data.get("terms", []):
+        term = str(item.get("term", "")).strip()
+        if not term:
+            continue
+
+        entry_id = len(entries) // _ENTRY_FIELDS
+        gloss = item.get("gloss") or {}
+        departments = [str(d).strip() for d in item.get("departments", []) if str(d).strip()]
+        entries.extend([
+            sid(term),
+            sid(str(item.get("description", "")).strip()),
+            sid(gloss.get("en")),
+            sid(gloss.get("zh")),
+            sid("|".join(departments)),
+        ])
+
+        for surface in [term] + [str(a).strip() for a in item.get("aliases", [])]:
+            key = fold(surface)
+            if not surface or key in seen:
+                continue
+            seen.add(key)
+            patterns.append(surface)
+            pattern_entry.append(entry_id)
+
+    matcher = TermMatcher(patterns)
+    edge_start, edge_char, edge_target, fail, out_start, out_ids = matcher.pack()
+
+    pattern_sids = [sid(p) for p in patterns]
+    version_sid = sid(version)
+
+    blob = bytearray()
+    str_off = [0]
+    for s in strings:
+        blob += s.encode("utf-8")
+        str_off.append(len(blob))
+
+    ints = _int_array(edge_start)
+    for part in (
+        edge_char, edge_target, fail, out_start, out_ids,
+        pattern_sids, pattern_entry, entries, str_off,
+    ):
+        ints.extend(_int_array(part))
+    if sys.byteorder != "little":
+        ints.byteswap()
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _FORMAT,
+        hashlib.sha256(raw).digest(),
+        len(edge_start) - 1,
+        len(edge_char),
+        len(out_ids),
+        len(patterns),
+        len(entries) // _ENTRY_FIELDS,
+        len(strings),
+        len(blob),
+        version_sid,
+    )
+    return header + ints.tobytes() + bytes(blob)
+
+
+class _LazyStrings(Sequence):
+    """문자열 id 목록을 문자열처럼 (처음 꺼낼 때 디코딩해서 캐시)."""
+
+    def __init__(self, decode: Callable[[int], Optional[str]], string_ids):
+        self._decode = decode
+        self._ids = string_ids
+        self._cache: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = self._cache.get(index)
+        if value is None:
+            value = self._decode(self._ids[index]) or ""
+            self._cache[index] = value
+        return value
+
+
+class Glossary:
+    """
+    컴파일된 인덱스 위에서 동작하는 읽기 전용 사전.
+    설명/번역어 문자열은 필요할 때만 문자열 테이블에서 꺼낸다.
+    """
+
+    def __init__(self, index: bytes):
+        (
+            magic, fmt, source_hash, n_states, n_edges, n_out,
+            n_patterns, n_entries, n_strings, blob_len, version_sid,
+        ) = _HEADER.unpack_from(index, 0)
+        if magic != _MAGIC or fmt != _FORMAT:
+            raise ValueError("not a glossary index (or unsupported format)")
+
+        n_ints = (
+            (n_states + 1) + n_edges * 2 + n_states + (n_states + 1) + n_out
+            + n_patterns * 2 + n_entries * _ENTRY_FIELDS + (n_strings + 1)
+        )
+        start = _HEADER.size
+        raw_ints = memoryview(index)[start:start + n_ints * 4]
+        if sys.byteorder == "little":
+            ints = raw_ints.cast("i")
+        else:
+            ints = array("i", raw_ints.tobytes())
+            ints.byteswap()
+        self._blob = memoryview(index)[start + n_ints * 4:start + n_ints * 4 + blob_len]
+
+        pos = 0
+
+        def take(n: int):
+            nonlocal pos
+            part = ints[pos:pos + n]
+            pos += n
+            return part
+
+        edge_start = take(n_states + 1)
+        edge_char = take(n_edges)
+        edge_target = take(n_edges)
+        fail = take(n_states)
+        out_start = take(n_states + 1)
+        out_ids = take(n_out)
+        pattern_sids = take(n_patterns)
+        self._pattern_entry = take(n_patterns)
+        self._entries = take(n_entries * _ENTRY_FIELDS)
+        self._str_off = take(n_strings + 1)
+
+        self.matcher = PackedTermMatcher(
+            _LazyStrings(self._string, pattern_sids),
+            edge_start, edge_char, edge_target, fail, out_start, out_ids,
+        )
+        self.version = self._string(version_sid)
+        self.source_hash = source_hash
+        self._entry_cache: Dict[int, GlossaryEntry] = {}
+        self._folded: Optional[frozenset] = None
+
+    def __len__(self) -> int:
+        return len(self._entries) // _ENTRY_FIELDS
+
+    def _string(self, string_id: int) -> Optional[str]:
+        if string_id == _NO_STRING:
+            return None
+        a, b = self._str_off[string_id], self._str_off[string_id + 1]
+        return bytes(self._blob[a:b]).decode("utf-8")
+
+    def entry(self, entry_id: int) -> GlossaryEntry:
+        cached = self._entry_cache.get(entry_id)
+        if cached is not None:
+            return cached
+
+        base = entry_id * _ENTRY_FIELDS
+        term, description, en, zh, departments = (
+            self._string(self._entries[base + i]) for i in range(_ENTRY_FIELDS)
+        )
+        gloss = {}
+        if en:
+            gloss["en"] = en
+        if zh:
+            gloss["zh"] = zh
+        entry = GlossaryEntry(
+            term=term or "",
+            description=description or "",
+            departments=tuple(d for d in (departments or "").split("|") if d),
+            gloss=gloss,
+        )
+        self._entry_cache[entry_id] = entry
+        return entry
+
+    def find_entries(self, text: str) -> List[GlossaryEntry]:
+        """텍스트에 나온 용어 (별칭은 대표 용어로), 등장 순서, 중복 없음."""
+        entry_ids = []
+        seen = set()
+        for pattern_id in unique_patterns(self.matcher.find_longest(text)):
+            entry_id = self._pattern_entry[pattern_id]
+            if entry_id not in seen:
+                seen.add(entry_id)
+                entry_ids.append(entry_id)
+        return [self.entry(i) for i in entry_ids]
+
+    def phrase_hints(self) -> List[str]:
+        """STT phrase hint: 대표 용어 + 별칭"""
+        return self.matcher.patterns[:_MAX_PHRASE_HINTS]
+
+    def apply_gloss(self, text: str, target_lang: str) -> str:
+        """사전에 있는 용어를 target 언어 번역어로 바꾼다 (없으면 원문 유지)."""
+        parts = []
+        last = 0
+        for m in self.matcher.find_longest(text):
+            gloss = self.entry(self._pattern_entry[m.pattern_id]).gloss.get(target_lang)
+            if not gloss:
+                continue
+            parts.append(text[last:m.start])
+            parts.append(gloss)
+            last = m.end
+        parts.append(text[last:])
+        return "".join(parts)
+
+    def contains(self, surface: str) -> bool:
+        """용어/별칭과 정확히 같은지 (ASCII 대소문자 무시)"""
+        if self._folded is None:
+            self._folded = frozenset(fold(p) for p in self.matcher.patterns)
+        return fold(surface) in self._folded
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class GlossaryStore:
+    """
+    현재 사전을 들고 있다가, 원본이 바뀌면 새로 컴파일/로딩해서 통째로 교체한다.
+    - 교체는 참조 하나를 바꾸는 것이라 읽는 쪽은 잠그지 않는다
+    - 요청 처리 중에는 처음 잡은 Glossary 객체를 끝까지 쓴다
+    - 새 원본이 깨져 있으면 기존 사전을 유지한다
+    """
+
+    def __init__(self, source_path: Path = GLOSSARY_SOURCE, index_path: Path = GLOSSARY_INDEX):
+        self.source_path = source_path
+        self.index_path = index_path
+        self._current: Optional[Glossary] = None
+        self._source_mtime_ns: Optional[int] = None
+        self._reload_lock = threading.Lock()
+
+    @property
+    def current(self) -> Glossary:
+        glossary = self._current
+        if glossary is None:
+            self.reload()
+            glossary = self._current
+        return glossary
+
+    def reload(self, *, force: bool = False) -> bool:
+        """원본이 바뀌었으면 다시 로딩하고 True. 요청 스레드가 아닌 곳에서 부르는 것을 권장."""
+        with self._reload_lock:
+            mtime_ns = self.source_path.stat().st_mtime_ns
+            if not force and self._current is not None and mtime_ns == self._source_mtime_ns:
+                return False
+
+            raw = self.source_path.read_bytes()
+            digest = hashlib.sha256(raw).digest()
+            if not force and self._current is not None and self._current.source_hash == digest:
+                self._source_mtime_ns = mtime_ns
+                return False
+
+            try:
+                glossary = self._load_or_compile(raw, digest, reuse_index=not force)
+            except Exception as e:
+                if self._current is None:
+                    raise
+                print(f"[glossary] reload failed, keeping version={self._current.version}: {e}")
+                return False
+
+            self._current = glossary
+            self._source_mtime_ns = mtime_ns
+            print(f"[glossary] loaded version={glossary.version} entries={len(glossary)}")
+            return True
+
+    def _load_or_compile(self, raw: bytes, digest: bytes, *, reuse_index: bool = True) -> Glossary:
+        if reuse_index and self.index_path.exists():
+            try:
+                glossary = Glossary(self.index_path.read_bytes())
+                if glossary.source_hash == digest:
+                    return glossary
+            except Exception as e:
+                print(f"[glossary] index unreadable, recompiling: {e}")
+
+        index = compile_glossary(raw)
+        try:
+            _write_atomic(self.index_path, index)
+        except OSError as e:
+            print(f"[glossary] could not write index, using in-memory copy: {e}")
+        return Glossary(index)
+
+
+_store = GlossaryStore()
+
+
+def get_glossary_store() -> GlossaryStore:
+    return _store
+
+
+def get_glossary() -> Glossary:
+    return _store.current
+
+
+async def glossary_reload_loop(*, interval_seconds: int = 30) -> None:
+    """원본 변경을 주기적으로 확인한다. 컴파일/로딩은 스레드에서 돌려 event loop를 막지 않는다."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(_store.reload)
+        except Exception as e:
+            print(f"[glossary] reload loop error: {e}")
+
+
+if __name__ == "__main__":
+    _store.reload(force=True)
+    print(f"[glossary] compiled {GLOSSARY_SOURCE.name} -> {GLOSSARY_INDEX.name}")
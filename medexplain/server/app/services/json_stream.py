@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List
+
+
+class JsonArrayStream:
+    """
+    스트리밍으로 들어오는 LLM JSON 응답에서 특정 배열의 원소를 완성되는 대로 꺼내는 파서.
+
+        parser = JsonArrayStream("summary")
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+
+    - ```json 같은 앞뒤 잡음은 무시 ("key": [ 를 찾을 때까지 버퍼링)
+    - 원소 하나(문자열 또는 객체)가 닫히면 그 조각만 json.loads
+    - 깨진 원소는 건너뛰고 다음 원소부터 계속
+    배열이 닫히면 done=True, 이후 입력은 무시한다.
+    """
+
+    def __init__(self, key: str):
+        self._start_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buf = ""
+        self._pos = 0
+        self._in_array = False
+        self.done = False
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        if self.done or not chunk:
+            return []
+        self._buf += chunk
+
+        if not self._in_array:
+            m = self._start_re.search(self._buf)
+            if m is None:
+                return []
+            self._in_array = True
+            self._buf = self._buf[m.end():]
+            self._pos = 0
+
+        items: List[Any] = []
+        while True:
+            start = self._skip_separators(self._pos)
+            if start >= len(self._buf):
+                break
+            if self._buf[start] == "]":
+                self.done = True
+                break
+
+            end = self._element_end(start)
+            if end is None:
+                # 아직 원소가 덜 옴
+                break
+
+            try:
+                items.append(json.loads(self._buf[start:end]))
+            except ValueError:
+                self.skipped += 1
+            self._pos = end
+
+        # 처리한 부분은 버림 (긴 응답에서 버퍼가 계속 커지지 않게)
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        return items
+
+    def _skip_separators(self, i: int) -> int:
+        buf = self._buf
+        while i < len(buf) and (buf[i].isspace() or buf[i] == ","):
+            i += 1
+        return i
+
+    def _element_end(self, start: int):
+        """start에서 시작하는 원소의 끝 위치 (아직 안 닫혔으면 None)."""
+        buf = self._buf
+        first = buf[start]
+
+        if first == '"':
+            i = start + 1
+            while i < len(buf):
+                c = buf[i]
+                if c == "\\":
+                    i += 2
+                    continue
+                if c == '"':
+                    return i + 1
+                i += 1
+            return None
+
+        if first in "{[":
+            depth = 0
+            in_string = False
+            i = start
+            while i < len(buf):
+                c = buf[i]
+                if in_string:
+                    if c == "\\":
+                        i += 2
+                        continue
+                    if c == '"':
+                        in_string = False
+                elif c == '"':
+                    in_string = True
+                elif c in "{[":
+                    depth += 1
+                elif c in "}]":
+                    depth -= 1
+                    if depth == 0:
+                        return i + 1
+                i += 1
+            return None
+
+        # 숫자/true/null 같은 원시값: 다음 구분자까지
+        i = start
+        while i < len(buf) and buf[i] not in ",]":
+            i += 1
+        return i if i < len(buf) else None
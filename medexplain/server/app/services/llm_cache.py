@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import inspect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from app.services.llm_client import get_llm_client, llm_enabled
+from app.services.llm_resilience import remaining_time
+from app.services.lru import LRUCache
+from app.services.single_flight import SingleFlight
+
+T = TypeVar("T")
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_CACHE_PATH = DATA_DIR / "llm_cache.sqlite3"
+
+# LLM 결과는 오래, fallback 결과는 LLM이 돌아오면 바로 갱신되도록 짧게
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+FALLBACK_TTL_SECONDS = 5 * 60
+
+# 디스크 캐시 정리는 set 몇 번마다 한 번씩
+_EVICT_EVERY = 64
+
+
+class CacheMiss(Exception):
+    """cache_only() 안에서 캐시에 없는 LLM 작업을 만남."""
+
+
+_cache_only: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_only", default=False)
+
+
+@contextmanager
+def cache_only() -> Iterator[None]:
+    """
+    이 안의 cached_llm_call은 캐시에 있으면 돌려주고, 없으면 LLM/fallback 대신 CacheMiss.
+    배치에서 캐시에 있는 항목부터 바로 내보낼 때 쓴다.
+    """
+    token = _cache_only.set(True)
+    try:
+        yield
+    finally:
+        _cache_only.reset(token)
+
+
+def prompt_version(build_prompt: Callable[[str], str]) -> str:
+    """
+    프롬프트 템플릿 버전. 빈 입력으로 만든 프롬프트의 해시라서
+    _build_prompt 내용이 바뀌면 자동으로 달라지고, 예전 캐시는 더 이상 맞지 않는다.
+    """
+    return hashlib.sha256(build_prompt("").encode("utf-8")).hexdigest()[:12]
+
+
+def normalize_input(text: str) -> str:
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_key(task: str, text: str, version: str, model: str) -> str:
+    payload = json.dumps([task, normalize_input(text), version, model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """
+    LLM 결과 캐시 (content-addressed).
+    키 = hash(task, 정규화 입력, 프롬프트 버전, 모델)
+
+    - 1단계: 메모리 LRU
+    - 2단계: SQLite 파일 (재시작해도 유지), 전체 크기 제한을 넘으면 오래된 것부터 삭제
+    - 항목마다 만료 시각 (fallback 결과는 짧게)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_CACHE_PATH,
+        *,
+        memory_size: int = 1024,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        fallback_ttl_seconds: float = FALLBACK_TTL_SECONDS,
+        max_disk_bytes: int = 64 * 1024 * 1024,
+    ):
+        self._memory: LRUCache[Tuple[float, Any]] = LRUCache(memory_size)
+        self.ttl_seconds = ttl_seconds
+        self.fallback_ttl_seconds = fallback_ttl_seconds
+        self.max_disk_bytes = max_disk_bytes
+
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._sets_since_evict = 0
+
+        self.expired = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.fallback_sets = 0
+
+        if path is not None:
+            try:
+                self._db = self._open(path)
+            except sqlite3.Error as e:
+                print(f"[llm-cache] disk tier disabled: {e}")
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                is_fallback INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at)")
+        return db
+
+    async def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        cached = self._memory.get(key)
+        if cached is not None:
+            expires_at, value = cached
+            if expires_at > now:
+                return value
+            self._memory.pop(key)
+            self.expired += 1
+
+        if self._db is None:
+            return None
+
+        row = await asyncio.to_thread(self._disk_get, key, now)
+        if row is None:
+            self.disk_misses += 1
+            return None
+
+        self.disk_hits += 1
+        expires_at, value = row
+        self._memory.set(key, (expires_at, value))
+        return value
+
+    async def set(self, key: str, value: Any, *, fallback: bool = False) -> None:
+        ttl = self.fallback_ttl_seconds if fallback else self.ttl_seconds
+        expires_at = time.time() + ttl
+        self._memory.set(key, (expires_at, value))
+        if fallback:
+            self.fallback_sets += 1
+
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_set, key, value, expires_at, fallback)
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.expired += 1
+                return None
+        return row[1], json.loads(row[0])
+
+    def _disk_set(self, key: str, value: Any, expires_at: float, fallback: bool) -> None:
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache "
+                    "(key, value, size, created_at, expires_at, is_fallback) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, encoded, len(encoded.encode("utf-8")), time.time(), expires_at, int(fallback)),
+                )
+                self._sets_since_evict += 1
+                if self._sets_since_evict >= _EVICT_EVERY:
+                    self._sets_since_evict = 0
+                    self._evict_locked()
+            except sqlite3.Error as e:
+                print(f"[llm-cache] disk write failed: {e}")
+
+    def _evict_locked(self) -> None:
+        self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        # 오래된 것부터 지워서 크기 제한의 90%까지 줄임
+        excess = total - int(self.max_disk_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM llm_cache ORDER BY created_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        disk: Dict[str, Any] = {"enabled": self._db is not None}
+        if self._db is not None:
+            with self._db_lock:
+                entries, size = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+                ).fetchone()
+            lookups = self.disk_hits + self.disk_misses
+            disk.update({
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_disk_bytes,
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "hit_rate": round(self.disk_hits / lookups, 4) if lookups else 0.0,
+            })
+        return {
+            "memory": self._memory.stats(),
+            "disk": disk,
+            "expired": self.expired,
+            "fallback_sets": self.fallback_sets,
+        }
+
+
+_cache: Optional[LLMResultCache] = None
+
+
+def get_llm_cache() -> LLMResultCache:
+    global _cache
+    if _cache is None:
+        path_env = os.getenv("LLM_CACHE_PATH")
+        disk = os.getenv("LLM_CACHE_DISK", "1") != "0"
+        path = Path(path_env) if path_env else DEFAULT_CACHE_PATH
+        _cache = LLMResultCache(path if disk else None)
+    return _cache
+
+
+# 같은 키로 동시에 들어온 LLM 호출을 하나로 합침
+_inflight = SingleFlight()
+
+# cached_llm_call 결과 출처 (벤치마크/모니터링용 fallback 비율)
+_call_stats = {"calls": 0, "cache_hits": 0, "fallbacks": 0, "deadline_fallbacks": 0}
+
+
+def llm_call_stats() -> Dict[str, Any]:
+    stats = dict(_call_stats)
+    calls = stats["calls"]
+    fallbacks = stats["fallbacks"] + stats["deadline_fallbacks"]
+    stats["fallback_rate"] = round(fallbacks / calls, 4) if calls else 0.0
+    return stats
+
+
+def get_llm_inflight() -> SingleFlight:
+    return _inflight
+
+
+def current_model() -> str:
+    return get_llm_client().model if llm_enabled() else "none"
+
+
+async def cached_llm_call(
+    task: str,
+    text: str,
+    *,
+    version: str,
+    compute: Callable[[], Awaitable[T]],
+    fallback: Callable[[], Union[T, Awaitable[T]]],
+) -> T:
+    """
+    LLM 서비스 공통 경로: 캐시 확인 -> (동일 요청 합치기) -> LLM -> 실패 시 fallback.
+    LLM 결과와 fallback 결과 모두 캐시한다 (fallback은 짧은 TTL).
+    fallback은 값이나 awaitable을 돌려줄 수 있다 (무거운 로컬 계산은 스레드로).
+    요청 deadline(llm_deadline)이 지나면 기다리지 않고 fallback을 돌려준다.
+    """
+    cache = get_llm_cache()
+    key = make_key(task, text, version, current_model())
+    _call_stats["calls"] += 1
+
+    cached = await cache.get(key)
+    if cached is not None:
+        _call_stats["cache_hits"] += 1
+        return cached
+    if _cache_only.get():
+        _call_stats["calls"] -= 1  # 나중에 실제로 부를 때 센다
+        raise CacheMiss(task)
+
+    async def run_fallback() -> T:
+        value = fallback()
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+
+    async def run() -> T:
+        is_fallback = False
+        try:
+            value = await compute()
+        except Exception as e:
+            print(f"[{task}] llm failed, fallback: {e!r}")
+            _call_stats["fallbacks"] += 1
+            value = await run_fallback()
+            is_fallback = True
+
+        await cache.set(key, value, fallback=is_fallback)
+        return value
+
+    remaining = remaining_time()
+    if remaining is None:
+        return await _inflight.do(key, run)
+
+    try:
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        return await asyncio.wait_for(_inflight.do(key, run), timeout=remaining)
+    except asyncio.TimeoutError:
+        # 이 요청의 시간이 다 됨: 캐시하지 않고 이번만 fallback
+        print(f"[{task}] request deadline exceeded, fallback")
+        _call_stats["deadline_fallbacks"] += 1
+        return await run_fallback()
+
+
+async def cached_llm_stream(
+    task: str,
+    text: str,
+    *,
+    version: str,
+    stream: Callable[[], AsyncIterator[T]],
+    fallback: Callable[[], List[T]],
+) -> AsyncIterator[T]:
+    """
+    cached_llm_call의 스트리밍 버전. 결과가 리스트인 작업(요약 bullet, 용어 카드)에 쓴다.
+    - 캐시에 있으면 그대로 하나씩
+    - 없으면 LLM 스트림에서 원소가 완성되는 대로 내보내고, 끝나면 전체를 같은 키로 캐시
+    - 원소를 하나도 못 받고 실패하면 fallback (짧은 TTL로 캐시)
+    같은 키를 쓰므로 스트리밍/일반 엔드포인트가 캐시를 공유한다.
+    스트림은 합치기(single-flight) 대상이 아니다.
+    """
+    cache = get_llm_cache()
+    key = make_key(task, text, version, current_model())
+    _call_stats["calls"] += 1
+
+    cached = await cache.get(key)
+    if cached is not None:
+        _call_stats["cache_hits"] += 1
+        for item in cached:
+            yield item
+        return
+
+    items: List[T] = []
+    try:
+        if not llm_enabled():
+            raise RuntimeError("GEMINI_API_KEY is not set")
+        source = stream()
+        try:
+            async for item in source:
+                items.append(item)
+                yield item
+        finally:
+            await source.aclose()
+        if not items:
+            raise RuntimeError("LLM returned empty or invalid stream")
+    except Exception as e:
+        if items:
+            # 이미 일부를 보냈으면 그대로 끝냄 (불완전한 결과는 캐시하지 않음)
+            print(f"[{task}] llm stream broke after {len(items)} items: {e}")
+            return
+        print(f"[{task}] llm stream failed, fallback: {e}")
+        _call_stats["fallbacks"] += 1
+        items = fallback()
+        for item in items:
+            yield item
+        await cache.set(key, items, fallback=True)
+        return
+
+    await cache.set(key, items)
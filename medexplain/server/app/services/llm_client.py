@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Protocol, Tuple
+
+from app.services.llm_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    remaining_time,
+)
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+
+class LLMBackend(Protocol):
+    """실제로 모델을 부르는 부분. LLMClient가 동시성/timeout/hedge/차단기를 씌운다."""
+
+    name: str
+
+    async def generate(self, model: str, prompt: str) -> str:
+        ...
+
+    def generate_stream(self, model: str, prompt: str) -> AsyncIterator[str]:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class GeminiBackend:
+    """google-genai 비동기 클라이언트 (연결 keep-alive 재사용)."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str):
+        from google import genai
+
+        self._client = genai.Client(api_key=api_key)
+
+    async def generate(self, model: str, prompt: str) -> str:
+        response = await self._client.aio.models.generate_content(
+            model=model,
+            contents=prompt,
+        )
+        return (response.text or "").strip()
+
+    async def generate_stream(self, model: str, prompt: str) -> AsyncIterator[str]:
+        stream = await self._client.aio.models.generate_content_stream(
+            model=model,
+            contents=prompt,
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+    async def aclose(self) -> None:
+        aio = getattr(self._client, "aio", None)
+        close = getattr(aio, "aclose", None)
+        if close is not None:
+            await close()
+
+
+class LLMClient:
+    """
+    프로세스 전체에서 하나만 쓰는 비동기 LLM 클라이언트 (backend: Gemini 또는 로컬 fake).
+    - backend를 한 번만 만들어 연결(keep-alive)을 재사용
+    - 동시에 나가는 요청 수를 semaphore로 제한
+    - 호출마다 timeout (요청 deadline이 더 빠르면 그걸 따름)
+    - 느린 꼬리: 최근 지연의 p{hedge_percentile}을 넘기면 같은 요청을 한 번 더 보내고 먼저 온 답을 씀
+    - 실패율이 높으면 차단기가 열려 한동안 호출하지 않음 (바로 CircuitOpenError)
+    event loop를 막지 않으므로 스레드 몇 개로 수백 개의 LLM 요청을 동시에 처리할 수 있다.
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        *,
+        model: str = DEFAULT_MODEL,
+        max_concurrency: int = 16,
+        timeout_seconds: float = 30.0,
+        hedge: bool = True,
+        hedge_percentile: float = 95.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.backend = backend
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyTracker()
+        self.breaker = breaker or CircuitBreaker()
+
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def _timeout(self, timeout: Optional[float]) -> Tuple[float, bool]:
+        """(이번 호출에 쓸 timeout, 요청 deadline 때문에 줄어들었는지)"""
+        timeout = self.timeout_seconds if timeout is None else timeout
+        remaining = remaining_time()
+        if remaining is not None and remaining < timeout:
+            return remaining, True
+        return timeout, False
+
+    def _start(self, timeout: Optional[float]) -> Tuple[int, float, bool]:
+        timeout, by_deadline = self._timeout(timeout)
+        if timeout <= 0:
+            # 요청 deadline이 이미 지남: upstream을 부르지 않으므로 차단기와 무관
+            raise asyncio.TimeoutError("request deadline exceeded before llm call")
+        token = self.breaker.allow()
+        if token is None:
+            raise CircuitOpenError("llm circuit breaker is open")
+        return token, timeout, by_deadline
+
+    def _timed_out(self, token: int, by_deadline: bool) -> None:
+        self.timeouts += 1
+        if by_deadline:
+            # 요청 deadline이 먼저 옴 (upstream이 느리다는 근거가 아님)
+            self.breaker.abandon(token)
+        else:
+            self.breaker.record(token, False)
+
+    async def _attempt(self, prompt: str, token: int, reached: Optional[asyncio.Event] = None) -> str:
+        try:
+            await self._semaphore.acquire()
+        except asyncio.CancelledError:
+            # 자리를 기다리다 취소됨: upstream은 부르지도 않았으므로 성공/실패 아님
+            self.breaker.abandon(token)
+            raise
+        try:
+            if reached is not None:
+                reached.set()
+            self.calls += 1
+            self.in_flight += 1
+            started = time.monotonic()
+            try:
+                text = await self.backend.generate(self.model, prompt)
+            except asyncio.CancelledError:
+                self.breaker.abandon(token)
+                raise
+            except Exception:
+                self.failures += 1
+                self.breaker.record(token, False)
+                raise
+            finally:
+                self.in_flight -= 1
+        finally:
+            self._semaphore.release()
+
+        self.latency.record(time.monotonic() - started)
+        self.breaker.record(token, True)
+        return text
+
+    def _hedge_delay(self) -> Optional[float]:
+        # 이미 동시 요청이 꽉 찼으면 hedge가 대기열만 늘리므로 안 보냄
+        if not self.hedge or self.in_flight >= self.max_concurrency:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    async def generate(self, prompt: str, *, timeout: Optional[float] = None) -> str:
+        token, timeout, by_deadline = self._start(timeout)
+        deadline = time.monotonic() + timeout
+
+        reached = asyncio.Event()
+        first = asyncio.ensure_future(self._attempt(prompt, token, reached))
+        tasks = {first}
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                hedge_token = self.breaker.allow() if not done else None
+                if hedge_token is not None:
+                    tasks.add(asyncio.ensure_future(self._attempt(prompt, hedge_token)))
+                    self.hedged += 1
+
+            last_error: Optional[BaseException] = None
+            while tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, tasks = await asyncio.wait(
+                    tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+
+            if last_error is not None and not tasks:
+                raise last_error
+            # 로컬 자리도 못 얻고 끝났으면 upstream이 느리다는 근거가 아님
+            self._timed_out(token, by_deadline or not reached.is_set())
+            raise asyncio.TimeoutError(f"llm call exceeded {timeout:.1f}s")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        응답 텍스트를 받는 대로 조각씩 돌려준다.
+        timeout은 전체 응답 기준이고, 스트림이 끝날 때까지 semaphore 한 자리를 쓴다.
+        받는 쪽이 한 조각 이상 받고 먼저 닫으면 (원소 3개를 다 받음 등) 성공으로 센다.
+        """
+        token, timeout, by_deadline = self._start(timeout)
+        deadline = time.monotonic() + timeout
+
+        def remaining() -> float:
+            return max(deadline - time.monotonic(), 0.0)
+
+        async with self._semaphore:
+            self.calls += 1
+            self.in_flight += 1
+            stream = self.backend.generate_stream(self.model, prompt)
+            received = 0
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout=remaining())
+                    except StopAsyncIteration:
+                        break
+                    received += 1
+                    yield chunk
+            except asyncio.TimeoutError:
+                self._timed_out(token, by_deadline)
+                raise
+            except Exception:
+                self.failures += 1
+                self.breaker.record(token, False)
+                raise
+            except BaseException:
+                # 받는 쪽이 끊음 (필요한 만큼 받았거나 취소됨).
+                # 한 조각이라도 왔으면 upstream은 정상, 아무것도 못 받았으면 성공/실패 아님
+                if received:
+                    self.breaker.record(token, True)
+                else:
+                    self.breaker.abandon(token)
+                raise
+            finally:
+                self.in_flight -= 1
+                await stream.aclose()
+        self.breaker.record(token, True)
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_after_seconds": self.latency.percentile(self.hedge_percentile),
+            "breaker": self.breaker.stats(),
+        }
+
+
+_client: Optional[LLMClient] = None
+
+
+def _backend_name() -> Optional[str]:
+    # LLM_BACKEND=fake면 키 없이 로컬 fake, 아니면 키가 있을 때만 Gemini
+    name = os.getenv("LLM_BACKEND")
+    if name:
+        return name
+    return "gemini" if os.getenv("GEMINI_API_KEY") else None
+
+
+def llm_enabled() -> bool:
+    return _client is not None or _backend_name() is not None
+
+
+def init_llm_client() -> Optional[LLMClient]:
+    """서버 시작 시 한 번 호출. backend가 없으면 None (모든 LLM 경로는 fallback)."""
+    global _client
+    if _client is not None:
+        return _client
+
+    name = _backend_name()
+    if name == "fake":
+        from app.services.llm_fake import FakeLLMBackend
+
+        backend: LLMBackend = FakeLLMBackend.from_env()
+        model = "fake"
+    elif name == "gemini":
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            print("[llm] GEMINI_API_KEY is not set, llm calls will fall back")
+            return None
+        backend = GeminiBackend(api_key)
+        model = os.getenv("LLM_MODEL", DEFAULT_MODEL)
+    else:
+        if name is not None:
+            print(f"[llm] unknown LLM_BACKEND={name!r}, llm calls will fall back")
+        else:
+            print("[llm] GEMINI_API_KEY is not set, llm calls will fall back")
+        return None
+
+    _client = LLMClient(
+        backend,
+        model=model,
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "16")),
+        timeout_seconds=float(os.getenv("LLM_TIMEOUT_SECONDS", "30")),
+        hedge=os.getenv("LLM_HEDGE", "1") != "0",
+        hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+    )
+    print(f"[llm] backend={backend.name} model={model}")
+    return _client
+
+
+def get_llm_client() -> LLMClient:
+    client = _client
+    if client is None and _backend_name() is not None:
+        client = init_llm_client()
+    if client is None:
+        raise RuntimeError("GEMINI_API_KEY is not set")
+    return client
+
+
+async def close_llm_client() -> None:
+    global _client
+    if _client is not None:
+        try:
+            await _client.aclose()
+        except Exception as e:
+            print(f"[llm] close failed: {e}")
+        _client = None
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import random
+import re
+from typing import AsyncIterator, List, Optional
+
+from app.services.extractive_summary import extractive_summary, split_sentences
+from app.services.glossary import get_glossary
+
+
+class FakeLLMError(RuntimeError):
+    """fake backend가 일부러 낸 upstream 에러 (503 흉내)."""
+
+
+# 프롬프트 안의 """...""" 블록 (입력 텍스트)
+_QUOTED_RE = re.compile(r'"""(.*?)"""', re.DOTALL)
+
+
+class FakeLLMBackend:
+    """
+    네트워크 없이 LLM 경로를 돌려보기 위한 로컬 backend (LLM_BACKEND=fake).
+    - 지연: 로그정규 분포 (중앙값 latency_ms, 퍼짐 sigma) -> 긴 꼬리가 있는 실제 API와 비슷
+    - error_rate 확률로 FakeLLMError
+    - malformed_rate 확률로 깨진 JSON
+    프롬프트의 출력 형식을 보고 그 모양의 JSON을 만든다 (요약/용어/질문/한 번에 분석/예전 /summarize).
+    내용은 입력에서 뽑은 문장과 용어 사전이라 품질 측정용이 아니라 지연/처리량 측정용이다.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 800.0,
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_env(cls) -> "FakeLLMBackend":
+        seed = os.getenv("LLM_FAKE_SEED")
+        return cls(
+            latency_ms=float(os.getenv("LLM_FAKE_LATENCY_MS", "800")),
+            sigma=float(os.getenv("LLM_FAKE_LATENCY_SIGMA", "0.5")),
+            error_rate=float(os.getenv("LLM_FAKE_ERROR_RATE", "0")),
+            malformed_rate=float(os.getenv("LLM_FAKE_MALFORMED_RATE", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+    def _latency(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        return self.latency_ms / 1000.0 * math.exp(self._rng.gauss(0.0, self.sigma))
+
+    def _response(self, prompt: str) -> str:
+        if self._rng.random() < self.error_rate:
+            raise FakeLLMError("fake upstream error (503)")
+
+        text = _make_response(prompt)
+        if self._rng.random() < self.malformed_rate:
+            # 중간에 잘린 JSON
+            return text[: max(len(text) // 2, 1)]
+        return text
+
+    async def generate(self, model: str, prompt: str) -> str:
+        await asyncio.sleep(self._latency())
+        return self._response(prompt)
+
+    async def generate_stream(self, model: str, prompt: str) -> AsyncIterator[str]:
+        total = self._latency()
+        # 첫 토큰까지 전체의 30%, 나머지는 조각마다 나눠서
+        await asyncio.sleep(total * 0.3)
+        text = self._response(prompt)
+        pieces = [text[i:i + 16] for i in range(0, len(text), 16)] or [""]
+        step = total * 0.7 / len(pieces)
+        for piece in pieces:
+            yield piece
+            await asyncio.sleep(step)
+
+    async def aclose(self) -> None:
+        return None
+
+
+def _sentences(text: str, limit: int) -> List[str]:
+    picked = extractive_summary(text, max_sentences=limit)
+    return picked or split_sentences(text)[:limit]
+
+
+def _terms(text: str, limit: int = 6) -> List[dict]:
+    return [
+        {"term": entry.term, "description": entry.description}
+        for entry in get_glossary().find_entries(text)[:limit]
+        if entry.description
+    ]
+
+
+def _questions(text: str) -> dict:
+    asks = [q.strip() for q in re.split(r"[?\n]", text) if q.strip()]
+    return {"general_info": [], "ask_doctor": [q + "?" for q in asks], "caution": []}
+
+
+def _make_response(prompt: str) -> str:
+    blocks = _QUOTED_RE.findall(prompt)
+    text = blocks[0] if blocks else ""
+
+    if '"summary_3sent"' in prompt:
+        sentences = _sentences(text, 3)
+        data = {
+            "summary_3sent": " ".join(sentences),
+            "easy_terms": [{"term": t["term"], "easy": t["description"]} for t in _terms(text, 5)],
+            "next_actions": [{"title": "의료진 안내 확인", "detail": "이해 안 되는 부분은 의료진에게 질문하세요."}],
+            "warnings": [],
+        }
+    elif "[summary]" in prompt:
+        data = {"summary": _sentences(text, 3), "terms": _terms(text)}
+        if "환자 질문:" in prompt and len(blocks) > 1:
+            data["questions"] = _questions(blocks[1])
+    elif '"general_info"' in prompt:
+        data = _questions(text)
+    elif '"terms"' in prompt:
+        data = {"terms": _terms(text)}
+    else:
+        data = {"summary": _sentences(text, 3)}
+
+    return "```json\n" + json.dumps(data, ensure_ascii=False) + "\n```"
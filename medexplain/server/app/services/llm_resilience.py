@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """차단기가 열려 있어 LLM을 부르지 않음 (호출 쪽은 바로 fallback)."""
+
+
+# ── 요청 단위 deadline ──────────────────────────────────
+
+# 이 요청이 LLM을 기다릴 수 있는 마지막 시각 (time.monotonic 기준)
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def llm_deadline(seconds: float, *, replace: bool = False) -> Iterator[None]:
+    """
+    이 안에서 나가는 모든 LLM 호출이 함께 쓰는 deadline.
+    이미 더 이른 deadline이 있으면 그걸 유지한다.
+    replace=True면 바깥 deadline을 무시 (배치의 항목별 deadline처럼 요청 하나에 여러 작업이 있을 때).
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if not replace and current is not None and current < deadline:
+        deadline = current
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """deadline까지 남은 초 (deadline이 없으면 None)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+# ── 지연 분포 ───────────────────────────────────────────
+
+class LatencyTracker:
+    """최근 성공한 호출 지연 시간(초)의 percentile. hedging 기준으로 쓴다."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(int(len(ordered) * p / 100.0), len(ordered) - 1)
+        return ordered[index]
+
+
+# ── 차단기 ──────────────────────────────────────────────
+
+class CircuitBreaker:
+    """
+    최근 window개 호출 중 실패 비율이 failure_ratio 이상이면 open_seconds 동안 열림.
+    - closed: 평소대로 호출
+    - open: 호출하지 않고 CircuitOpenError (요청이 장애 중인 upstream에 쌓이지 않음)
+    - half_open: open_seconds가 지나면 시험 호출 하나만 통과, 성공하면 닫힘
+
+    allow()가 돌려준 토큰을 그 호출의 record()/abandon()에 그대로 넘긴다.
+    열려 있는 동안에는 시험 호출 토큰의 결과만 반영하고, 열리기 전에 시작한 호출의
+    늦은 결과는 세기만 한다 (late_results).
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        open_seconds: float = 30.0,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.open_seconds = open_seconds
+
+        self._results: Deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._opened_at: Optional[float] = None
+        self._next_token = 0
+        self._probe: Optional[int] = None
+
+        self.opened = 0
+        self.rejected = 0
+        self.late_results = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked(time.monotonic())
+
+    def _state_locked(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at < self.open_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> Optional[int]:
+        """호출해도 되면 이 호출의 토큰, 아니면 None."""
+        with self._lock:
+            state = self._state_locked(time.monotonic())
+            if state == "closed" or (state == "half_open" and self._probe is None):
+                self._next_token += 1
+                if state == "half_open":
+                    self._probe = self._next_token
+                return self._next_token
+            self.rejected += 1
+            return None
+
+    def record(self, token: int, success: bool) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                if token != self._probe:
+                    # 열리기 전에 시작한 호출의 늦은 결과
+                    self.late_results += 1
+                    return
+                self._probe = None
+                if success:
+                    self._opened_at = None
+                    self._results.clear()
+                else:
+                    self._opened_at = time.monotonic()
+                return
+
+            self._results.append(success)
+            failures = self._results.count(False)
+            if (
+                len(self._results) >= self.min_calls
+                and failures / len(self._results) >= self.failure_ratio
+            ):
+                self._opened_at = time.monotonic()
+                self.opened += 1
+
+    def abandon(self, token: int) -> None:
+        """결과 없이 끝난 호출 (hedge에서 진 쪽, 요청 deadline 초과 등). 시험 호출이었다면 자리만 돌려준다."""
+        with self._lock:
+            if token == self._probe:
+                self._probe = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            results = list(self._results)
+            state = self._state_locked(time.monotonic())
+        return {
+            "state": state,
+            "recent_calls": len(results),
+            "recent_failures": results.count(False),
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "late_results": self.late_results,
+        }
+
+
+# ── 재시도 ──────────────────────────────────────────────
+
+async def retry_with_backoff(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    attempts: int = 3,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+    deadline_seconds: float = 5.0,
+) -> T:
+    """
+    지수 backoff(+jitter)로 재시도. deadline(요청 deadline이 더 빠르면 그것)을 넘길 것 같으면
+    더 기다리지 않고 마지막 에러를 올린다.
+    """
+    deadline = time.monotonic() + deadline_seconds
+    remaining = remaining_time()
+    if remaining is not None:
+        deadline = min(deadline, time.monotonic() + remaining)
+
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+            delay = min(base_delay * (2 ** attempt), max_delay)
+            delay = random.uniform(delay / 2, delay)
+            if time.monotonic() + delay >= deadline:
+                raise
+            await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
-import os
 import re
 from typing import List
 
+from app.services.llm_cache import cached_llm_call, prompt_version
+from app.services.llm_client import get_llm_client
+from app.services.triage import get_triage_matcher, merge_caution, triage
+
 
 def _build_prompt(text: str) -> str:
     return f"""
@@ -40,6 +43,9 @@ def _build_prompt(text: str) -> str:
 """.strip()
 
 
+_PROMPT_VERSION = prompt_version(_build_prompt)
+
+
 def _parse_response(raw: str) -> dict:
     raw = raw.strip()
     raw = re.sub(r"^```json\s*", "", raw)
@@ -62,38 +68,48 @@ def _parse_response(raw: str) -> dict:
     return {"general_info": general_info, "ask_doctor": ask_doctor, "caution": caution}
 
 
-def _fallback(text: str) -> dict:
-    """LLM 실패 시 전체를 ask_doctor로 분류"""
-    lines = []
+def analyze_questions_local(text: str) -> dict:
+    """LLM 없이 분류: 응급 표현이 있는 질문은 caution, 나머지는 전부 ask_doctor (LLM 실패 시 fallback)"""
+    matcher = get_triage_matcher()
+    ask_doctor, caution = [], []
     for part in re.split(r"[?\n]", text):
         part = part.strip()
-        if part:
-            lines.append(part + "?" if not part.endswith("?") else part)
+        if not part:
+            continue
+        if matcher.flags(part):
+            caution.append(part)
+        else:
+            ask_doctor.append(part + "?" if not part.endswith("?") else part)
+    if not ask_doctor and not caution:
+        ask_doctor = [text.strip()]
     return {
         "general_info": [],
-        "ask_doctor": lines if lines else [text.strip()],
-        "caution": [],
+        "ask_doctor": ask_doctor,
+        "caution": caution,
     }
 
 
-def analyze_questions(text: str) -> dict:
+async def analyze_questions_llm(text: str) -> dict:
+    prompt = _build_prompt(text)
+    raw = await get_llm_client().generate(prompt)
+    return _parse_response(raw)
+
+
+async def analyze_questions(text: str) -> dict:
+    """
+    질문 분류. 응급 표현은 LLM 전에 로컬에서 먼저 찾아 두고 (triage),
+    LLM(또는 fallback) 결과가 놓친 것은 caution에 더한다.
+    """
     text = text.strip()
     if not text:
         return {"general_info": [], "ask_doctor": [], "caution": []}
 
-    api_key = os.getenv("GEMINI_API_KEY")
-    if api_key:
-        try:
-            from google import genai
-            client = genai.Client(api_key=api_key)
-            prompt = _build_prompt(text)
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt,
-            )
-            raw = (response.text or "").strip()
-            return _parse_response(raw)
-        except Exception as e:
-            print(f"[questions] llm failed, fallback: {e}")
-
-    return _fallback(text)
+    hits = triage(text)
+    result = await cached_llm_call(
+        "questions",
+        text,
+        version=_PROMPT_VERSION,
+        compute=lambda: analyze_questions_llm(text),
+        fallback=lambda: analyze_questions_local(text),
+    )
+    return merge_caution(result, hits)
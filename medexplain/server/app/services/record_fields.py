@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+EMPTY_SUMMARY = "요약이 생성되지 않았습니다."
+
+
+def normalize_summary(summary: Any) -> List[str]:
+    """저장용 요약: 빈 줄을 빼고 문자열 목록으로 (비면 안내 문구 한 줄)."""
+    if summary is None:
+        return [EMPTY_SUMMARY]
+
+    if isinstance(summary, list):
+        cleaned = [str(item).strip() for item in summary if str(item).strip()]
+        return cleaned if cleaned else [EMPTY_SUMMARY]
+
+    text = str(summary).strip()
+    return [text] if text else [EMPTY_SUMMARY]
+
+
+def normalize_terms_for_save(terms: Any) -> List[Dict[str, str]]:
+    """저장용 용어: pydantic 모델이나 dict를 {"term", "easy", "description"}로 (term 없는 건 뺌)."""
+    if not terms:
+        return []
+
+    normalized = []
+    for term in terms:
+        if hasattr(term, "model_dump"):
+            item = term.model_dump()
+        else:
+            item = dict(term)
+
+        term_text = str(item.get("term", "")).strip()
+        easy_text = str(item.get("description", "") or item.get("easy", "")).strip()
+
+        if not term_text:
+            continue
+
+        normalized.append(
+            {
+                "term": term_text,
+                # 기존 저장 구조 유지
+                "easy": easy_text,
+                # 상세 조회 response_model 호환용
+                "description": easy_text,
+            }
+        )
+
+    return normalized
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.services.lru import LRUCache
+
+# 응답 모양(스키마/정규화)을 바꾸면 올림 -> 예전 ETag와 캐시가 모두 맞지 않게
+RESPONSE_VERSION = 1
+
+# 의료 기록이라 공유 캐시에는 두지 않고, 클라이언트는 매번 If-None-Match로 확인
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """강한 ETag. parts에는 DB instance id, 행 seq/version 등 내용이 바뀌면 달라지는 값."""
+    payload = ":".join(str(p) for p in (RESPONSE_VERSION, *parts))
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match는 약한 비교 (W/ 무시), 여러 개는 쉼표로
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+class ResponseCache:
+    """
+    GET 응답의 직렬화된 JSON bytes 캐시. key에 ETag가 들어가므로
+    쓰기(다른 프로세스의 재처리 포함)로 ETag가 바뀌면 옛 항목은 다시 맞지 않고 LRU에서 밀려난다.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self._cache: LRUCache[bytes] = LRUCache(maxsize)
+        self.not_modified = 0
+
+    def respond(self, request: Request, etag: str, build: Callable[[], BaseModel]) -> Response:
+        """
+        If-None-Match가 맞으면 본문 없이 304, 아니면 캐시된 bytes (없으면 build()로 만들어 저장).
+        build는 캐시에 없을 때만 불리므로 조회/모델 검증 비용은 처음 한 번만.
+        """
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        key = (request.url.path, request.url.query, etag)
+        body = self._cache.get(key)
+        if body is None:
+            body = build().model_dump_json().encode("utf-8")
+            self._cache.set(key, body)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "not_modified": self.not_modified}
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "2048")))
+    return _cache
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, List, Optional
+
+from app.services.llm_cache import cached_llm_call, prompt_version
+from app.services.llm_client import get_llm_client
+from app.services.summarizer import (
+    SINGLE_PASS_CHARS,
+    _normalize_text,
+    _parse_llm_summary,
+    summarize_text,
+    summarize_text_rule_based,
+)
+
+# 요약이 갱신될 때마다 (summary, 반영된 세그먼트 수)로 호출
+UpdateFn = Callable[[List[str], int], None]
+
+
+def _build_prompt(text: str, previous: Optional[List[str]] = None) -> str:
+    previous_block = "\n".join(f"- {line}" for line in previous or []) or "(없음)"
+    return f"""
+너는 환자 이해 보조 시스템의 요약기다.
+
+진료가 진행되는 동안 요약을 조금씩 갱신하고 있다.
+[지금까지의 요약]에 [새로 전사된 내용]을 반영해서 전체 진료의 요약을 다시 써라.
+
+반드시 지킬 규칙:
+1. 진단을 추론하지 말 것
+2. 치료를 추천하지 말 것
+3. 두 입력에 없는 내용을 추가하지 말 것
+4. 새 내용이 더 중요하면 예전 요약 문장을 빼도 됨
+5. 최대 3개의 bullet만 만들 것
+6. 각 bullet은 짧고 쉬운 한국어 문장으로 작성할 것
+7. 출력은 JSON만 할 것
+
+{{
+  "summary": ["문장1", "문장2", "문장3"]
+}}
+
+[지금까지의 요약]
+{previous_block}
+
+[새로 전사된 내용]
+\"\"\"{text}\"\"\"
+""".strip()
+
+
+_PROMPT_VERSION = prompt_version(_build_prompt)
+
+
+async def _update_summary_llm(previous: List[str], new_text: str) -> List[str]:
+    raw_text = await get_llm_client().generate(_build_prompt(new_text, previous))
+    result = _parse_llm_summary(raw_text)
+    if not result:
+        raise RuntimeError("LLM returned empty or invalid summary")
+    return result
+
+
+async def update_summary(previous: List[str], new_text: str, full_text: str) -> List[str]:
+    """
+    이전 요약 + 새 세그먼트만으로 요약을 갱신 (전체 전사문을 다시 보내지 않음).
+    LLM이 실패하면 지금까지의 전체 전사문으로 규칙 기반 요약.
+    """
+    new_text = _normalize_text(new_text)
+    if not new_text:
+        return previous
+
+    # 한 번에 너무 많이 들어온 경우 (녹음 후 전송) 새 부분부터 map-reduce로 줄임
+    if len(new_text) > SINGLE_PASS_CHARS:
+        new_text = " ".join(await summarize_text(new_text))
+
+    key_text = "\n".join(previous) + "\x00" + new_text
+    return await cached_llm_call(
+        "summary_rolling",
+        key_text,
+        version=_PROMPT_VERSION,
+        compute=lambda: _update_summary_llm(previous, new_text),
+        fallback=lambda: summarize_text_rule_based(full_text),
+    )
+
+
+class RollingSummarizer:
+    """
+    실시간 세션의 진행 중 요약.
+    - final 세그먼트가 every_segments개 쌓이거나 every_seconds가 지나면 갱신
+    - 갱신은 이전 요약 + 아직 반영 안 된 세그먼트만 보냄 (한 번에 하나씩, 순서대로)
+    - finish()는 남은 세그먼트만 반영하고 바로 최종 요약을 돌려준다
+    모든 메서드는 event loop 스레드에서 호출해야 한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        on_update: Optional[UpdateFn] = None,
+        every_segments: int = 5,
+        every_seconds: float = 60.0,
+    ):
+        self.on_update = on_update
+        self.every_segments = every_segments
+        self.every_seconds = every_seconds
+
+        self.segments: List[str] = []
+        self.summary: List[str] = []
+        self._summarized = 0  # summary에 반영된 세그먼트 수
+
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = asyncio.ensure_future(self._run())
+        self.updates = 0
+
+    @property
+    def transcript(self) -> str:
+        return "\n".join(self.segments)
+
+    def add_segment(self, text: str) -> None:
+        text = (text or "").strip()
+        if not text:
+            return
+        self.segments.append(text)
+        if len(self.segments) - self._summarized >= self.every_segments:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.every_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # 세션이 끝나 타이머가 취소돼도 진행 중인 갱신은 끝까지 (finish가 이어서 씀)
+                await asyncio.shield(self._flush())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[rolling-summary] update failed: {e}")
+
+    async def _flush(self, *, notify: bool = True) -> List[str]:
+        async with self._lock:
+            end = len(self.segments)
+            if end == self._summarized:
+                return self.summary
+
+            new_text = "\n".join(self.segments[self._summarized:end])
+            full_text = "\n".join(self.segments[:end])
+            self.summary = await update_summary(self.summary, new_text, full_text)
+            self._summarized = end
+            self.updates += 1
+
+        if notify and self.on_update is not None:
+            self.on_update(self.summary, end)
+        return self.summary
+
+    async def finish(self) -> List[str]:
+        """타이머를 멈추고 남은 세그먼트만 반영한 최종 요약."""
+        self.close()
+        return await self._flush(notify=False)
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청을 upstream 호출 하나로 합친다.
+    - 먼저 온 요청이 호출을 시작하고, 뒤에 온 요청은 같은 결과를 기다린다
+    - 기다리던 쪽이 하나 취소돼도 호출은 계속된다 (asyncio.shield)
+    - 기다리는 쪽이 모두 사라졌을 때만 upstream 호출을 취소한다
+    호출이 끝나면 키는 바로 비워진다 (결과 보관은 캐시의 몫).
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call[Any]] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda t, k=key, c=call: self._forget(k, c, t))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self.cancelled += 1
+
+    def _forget(self, key: str, call: _Call[Any], task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # 기다리던 쪽이 모두 떠난 뒤 실패한 경우 "never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+        }
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.services.translation import TranslationResult
+
+# 한 번의 호출로 여러 target 언어 번역 결과를 돌려주는 함수
+Translations = Dict[str, TranslationResult]
+TranslateFn = Callable[[str], Awaitable[Translations]]
+PreviewFn = Callable[[str, Translations], None]
+
+# 자동 구두점이 붙인 문장 끝 (뒤에 공백이나 끝이 와야 함)
+_SENTENCE_END_RE = re.compile(r"[.!?。？！](?=\s|$)")
+
+
+def _ends_sentence(text: str) -> bool:
+    return bool(text) and bool(_SENTENCE_END_RE.search(text[-1]))
+
+
+def stable_prefix(hypotheses: List[str]) -> str:
+    """
+    연속된 interim 결과들이 공통으로 유지하고 있는 prefix를 돌려준다.
+    - 모든 가설이 완전히 같으면 (말이 멈춤) 전체 텍스트
+    - 아니면 모든 가설에서 문장 경계로 끝나는 가장 긴 공통 prefix
+    """
+    if not hypotheses:
+        return ""
+
+    prefix = os.path.commonprefix(hypotheses)
+    if all(h == prefix for h in hypotheses):
+        return prefix.strip()
+
+    end = 0
+    for m in _SENTENCE_END_RE.finditer(prefix):
+        cut = m.end()
+        if all(len(h) == cut or h[cut].isspace() for h in hypotheses):
+            end = cut
+    return prefix[:end].strip()
+
+
+class SpeculativeTranslator:
+    """
+    final 전에 안정된 interim prefix를 미리 번역해 두는 도우미.
+    - 최근 window개의 interim이 공유하는 prefix가 min_chars 이상이면 번역 시작
+    - 가설이 바뀌어 prefix가 더 이상 맞지 않으면 진행 중인 번역을 취소
+    - final이 그 prefix로 시작하면 캐시된 번역을 재사용하고 나머지만 번역
+    추측 번역은 on_preview로만 알리며, final 번역으로 보내지 않는다.
+    모든 메서드는 event loop 스레드에서 호출해야 한다.
+    """
+
+    def __init__(
+        self,
+        translate: TranslateFn,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        on_preview: Optional[PreviewFn] = None,
+        window: int = 3,
+        min_chars: int = 6,
+    ):
+        self._translate = translate
+        self.loop = loop
+        self.on_preview = on_preview
+        self._window = window
+        self._min_chars = min_chars
+
+        self._hypotheses: Deque[str] = deque(maxlen=window)
+        self._pending: Dict[str, "asyncio.Task[Translations]"] = {}
+        self.stats = {"speculated": 0, "cancelled": 0, "reused": 0, "missed": 0}
+
+    def on_interim(self, text: str) -> None:
+        text = (text or "").strip()
+        if not text:
+            return
+
+        self._hypotheses.append(text)
+        self._cancel_stale(text)
+
+        if len(self._hypotheses) < self._window:
+            return
+
+        prefix = stable_prefix(list(self._hypotheses))
+        if len(prefix) < self._min_chars or prefix in self._pending:
+            return
+
+        task = self.loop.create_task(self._translate(prefix))
+        task.add_done_callback(lambda t, p=prefix: self._notify_preview(p, t))
+        self._pending[prefix] = task
+        self.stats["speculated"] += 1
+
+    def finalize(self, text: str) -> Awaitable[Translations]:
+        """
+        final 결과 번역.
+        추측 상태 정리는 호출 즉시 끝나므로 다음 발화의 interim과 섞이지 않는다.
+        실제 번역은 반환된 awaitable에서 진행된다.
+        """
+        text = (text or "").strip()
+        prefix, task = self._claim(text)
+        return self._translate_final(text, prefix, task)
+
+    def close(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+            self.stats["cancelled"] += 1
+        self._pending.clear()
+        self._hypotheses.clear()
+
+    def _cancel_stale(self, text: str) -> None:
+        for prefix in [p for p in self._pending if not text.startswith(p)]:
+            self._pending.pop(prefix).cancel()
+            self.stats["cancelled"] += 1
+
+    def _claim(self, text: str) -> Tuple[str, Optional["asyncio.Task[Translations]"]]:
+        best = ""
+        for prefix in self._pending:
+            if len(prefix) <= len(best) or not text.startswith(prefix):
+                continue
+            # 전체 일치하거나, 문장 경계에서 끝난 prefix만 이어 붙일 수 있음
+            if prefix == text or (_ends_sentence(prefix) and text[len(prefix)].isspace()):
+                best = prefix
+
+        task = self._pending.pop(best, None) if best else None
+        self.close()
+        return best, task
+
+    async def _translate_final(
+        self,
+        text: str,
+        prefix: str,
+        task: Optional["asyncio.Task[Translations]"],
+    ) -> Translations:
+        if task is None:
+            self.stats["missed"] += 1
+            return await self._translate(text)
+
+        rest = text[len(prefix):].strip()
+        tail_task = self.loop.create_task(self._translate(rest)) if rest else None
+
+        try:
+            head = await task
+        except Exception as e:
+            print(f"[spec] speculative translation failed, retranslating: {e}")
+            if tail_task is not None:
+                tail_task.cancel()
+            self.stats["missed"] += 1
+            return await self._translate(text)
+
+        self.stats["reused"] += 1
+        if tail_task is None:
+            return head
+
+        tail = await tail_task
+        joined: Translations = {}
+        for target, first in head.items():
+            second = tail.get(target) or TranslationResult(ok=False, text=rest, reason="translation_failed")
+            joined[target] = TranslationResult(
+                ok=first.ok and second.ok,
+                text=f"{first.text} {second.text}".strip(),
+                reason=first.reason or second.reason,
+            )
+        return joined
+
+    def _notify_preview(self, prefix: str, task: "asyncio.Task[Translations]") -> None:
+        # final이 이미 가져갔거나 취소된 추측은 미리보기로 보내지 않음
+        if self.on_preview is None or self._pending.get(prefix) is not task:
+            return
+        if task.cancelled() or task.exception() is not None:
+            return
+        try:
+            self.on_preview(prefix, task.result())
+        except Exception as e:
+            print(f"[spec] preview failed: {e}")
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data: Any) -> str:
+    """server-sent event 한 개 (data는 JSON 한 줄)."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # nginx 같은 프록시가 모아서 보내지 않도록
+            "X-Accel-Buffering": "no",
+        },
+    )
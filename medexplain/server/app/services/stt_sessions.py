@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class SttSession:
+    """
+    STT 세션 하나. final 세그먼트를 서버 쪽에 모아 두었다가
+    세션이 끝날 때 전사문으로 분석/저장한다 (클라이언트가 전사문을 다시 올릴 필요 없음).
+    """
+
+    session_id: str
+    department: str = ""
+    started_at: float = field(default_factory=time.time)
+    last_activity: float = field(default_factory=time.monotonic)
+    segments: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    # 끝내기 작업 (WS session.end와 POST /session/{id}/end가 같은 결과를 받도록 한 번만)
+    end_task: Optional[asyncio.Task] = None
+
+    @property
+    def transcript(self) -> str:
+        return "\n".join(self.segments)
+
+
+class SttSessionManager:
+    """
+    진행 중인 STT 세션 목록. final 결과는 STT 스레드에서 들어오므로 잠금으로 보호.
+    끝난 세션도 TTL 동안 남겨 두어서 end를 다시 불러도 같은 결과를 돌려준다.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, SttSession] = {}
+        self._lock = threading.Lock()
+
+    def start(self, session_id: str, *, department: str = "") -> SttSession:
+        # 같은 id로 다시 시작하면 새 세션
+        session = SttSession(session_id=session_id, department=department)
+        with self._lock:
+            self._sessions[session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[SttSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def touch(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_activity = time.monotonic()
+
+    def add_final(self, session_id: str, text: str) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.segments.append(text.strip())
+            session.last_activity = time.monotonic()
+
+    def add_warning(self, session_id: str, message: str) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            if message not in session.warnings:
+                session.warnings.append(message)
+            session.last_activity = time.monotonic()
+
+    def expire_inactive_sessions(self, ttl_minutes: int = 20) -> List[str]:
+        cutoff = time.monotonic() - ttl_minutes * 60
+        with self._lock:
+            expired = [sid for sid, s in self._sessions.items() if s.last_activity < cutoff]
+            for sid in expired:
+                del self._sessions[sid]
+        return expired
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "segments": sum(len(s.segments) for s in self._sessions.values()),
+            }
+
+
+_manager: Optional[SttSessionManager] = None
+
+
+def get_session_manager() -> SttSessionManager:
+    global _manager
+    if _manager is None:
+        _manager = SttSessionManager()
+    return _manager
@@ -1,9 +1,26 @@
+import asyncio
 import json
-import os
 import re
-from typing import List
+from typing import AsyncIterator, List
 
-from google import genai
+from app.services.extractive_summary import extractive_summary
+from app.services.json_stream import JsonArrayStream
+from app.services.llm_cache import cached_llm_call, cached_llm_stream, prompt_version
+from app.services.llm_client import get_llm_client
+
+# 이보다 긴 입력은 조각으로 나눠 요약한 뒤 합친다 (map-reduce)
+SINGLE_PASS_CHARS = 6000
+CHUNK_CHARS = 4000
+
+# 조각 하나에서 뽑는 bullet 수
+_CHUNK_BULLETS = 4
+
+# LLM 요약 / 로컬 추출 요약 중 고르는 응답 속도 등급
+TIER_LLM = "llm"
+TIER_FAST = "fast"
+
+# 문장 경계: 마침표/물음표/느낌표 뒤 공백
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。])\s+")
 
 
 def _normalize_text(text: str) -> str:
@@ -15,37 +32,17 @@ def _normalize_text(text: str) -> str:
     # 줄바꿈/공백 정리
     text = re.sub(r"\s+", " ", text)
 
-    # 너무 긴 입력 방지: 데모용으로 일단 적당히 제한
-    # 필요하면 더 늘려도 됨
-    if len(text) > 6000:
-        text = text[:6000]
-
     return text
 
 
 def summarize_text_rule_based(text: str) -> List[str]:
-    text = _normalize_text(text)
+    # LLM 없이 바로 답하는 경로 (fallback, tier=fast): 중요도 순 추출 요약
+    text = (text or "").strip()
 
     if not text:
         return []
 
-    sentences = []
-    for part in text.replace("!", ".").replace("?", ".").split("."):
-        part = part.strip()
-        if part:
-            sentences.append(part)
-
-    if not sentences:
-        return [text]
-
-    result = []
-    for sentence in sentences[:3]:
-        if sentence.endswith("."):
-            result.append(sentence)
-        else:
-            result.append(sentence + ".")
-
-    return result
+    return extractive_summary(text)
 
 
 def _build_prompt(text: str) -> str:
@@ -79,7 +76,62 @@ def _build_prompt(text: str) -> str:
 """.strip()
 
 
-def _parse_llm_summary(raw_text: str) -> List[str]:
+_PROMPT_VERSION = prompt_version(_build_prompt)
+
+
+def _build_chunk_prompt(text: str) -> str:
+    return f"""
+너는 환자 이해 보조 시스템의 요약기다.
+
+아래는 긴 병원 진료 설명을 STT로 전사한 한국어 텍스트의 일부분이다.
+이 부분에 나온 사실만 바탕으로 핵심을 짧게 정리하라.
+
+반드시 지킬 규칙:
+1. 진단을 추론하지 말 것
+2. 치료를 추천하지 말 것
+3. 원문에 없는 내용을 추가하지 말 것
+4. 검사 결과, 수치, 일정, 약 이름처럼 나중에 필요한 구체적인 내용은 남길 것
+5. 최대 {_CHUNK_BULLETS}개의 bullet, 각 bullet은 짧은 한국어 문장
+6. 출력은 JSON만 할 것
+
+{{
+  "summary": ["문장1", "문장2"]
+}}
+
+입력 텍스트:
+\"\"\"{text}\"\"\"
+""".strip()
+
+
+def _build_reduce_prompt(text: str) -> str:
+    return f"""
+너는 환자 이해 보조 시스템의 요약기다.
+
+아래는 하나의 긴 진료 설명을 앞에서부터 부분별로 요약한 문장들이다 (시간 순서).
+전체 진료에서 환자가 꼭 알아야 할 핵심만 다시 요약하라.
+
+반드시 지킬 규칙:
+1. 진단을 추론하지 말 것
+2. 치료를 추천하지 말 것
+3. 아래 문장에 없는 내용을 추가하지 말 것
+4. 최대 3개의 bullet만 만들 것
+5. 각 bullet은 짧고 쉬운 한국어 문장으로 작성할 것
+6. 출력은 JSON만 할 것
+
+{{
+  "summary": ["문장1", "문장2", "문장3"]
+}}
+
+부분 요약:
+\"\"\"{text}\"\"\"
+""".strip()
+
+
+_CHUNK_PROMPT_VERSION = prompt_version(_build_chunk_prompt)
+_REDUCE_PROMPT_VERSION = prompt_version(_build_reduce_prompt)
+
+
+def _parse_llm_summary(raw_text: str, limit: int = 3) -> List[str]:
     raw_text = raw_text.strip()
 
     if not raw_text:
@@ -105,25 +157,16 @@ def _parse_llm_summary(raw_text: str) -> List[str]:
             continue
         cleaned.append(s)
 
-    # 최대 3개만
-    return cleaned[:3]
-
+    # 최대 limit개만
+    return cleaned[:limit]
 
-def summarize_text_llm(text: str) -> List[str]:
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise RuntimeError("GEMINI_API_KEY is not set")
 
-    client = genai.Client(api_key=api_key)
+async def summarize_text_llm(text: str) -> List[str]:
+    client = get_llm_client()
 
     prompt = _build_prompt(text)
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
-    )
-
-    raw_text = (response.text or "").strip()
+    raw_text = await client.generate(prompt)
     result = _parse_llm_summary(raw_text)
 
     if not result:
@@ -132,17 +175,164 @@ def summarize_text_llm(text: str) -> List[str]:
     return result
 
 
-def summarize_text(text: str) -> List[str]:
-    text = _normalize_text(text)
+def split_into_chunks(text: str, max_chars: int = CHUNK_CHARS) -> List[str]:
+    """
+    줄(세그먼트) -> 문장 경계로 나눈 뒤 앞에서부터 max_chars까지 채워 조각을 만든다.
+    앞에서부터 채우므로 뒤에 세그먼트가 붙어도 앞쪽 조각은 그대로다 (조각 캐시가 계속 맞음).
+    """
+    units: List[str] = []
+    for line in text.splitlines():
+        for sentence in _SENTENCE_END_RE.split(line):
+            sentence = _normalize_text(sentence)
+            # 문장 하나가 조각보다 길면 글자 수로 자름
+            while len(sentence) > max_chars:
+                units.append(sentence[:max_chars])
+                sentence = sentence[max_chars:].lstrip()
+            if sentence:
+                units.append(sentence)
+
+    chunks: List[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + 1 + len(unit) > max_chars:
+            chunks.append(current)
+            current = unit
+        else:
+            current = f"{current} {unit}" if current else unit
+    if current:
+        chunks.append(current)
+    return chunks
 
-    if not text:
+
+async def _summarize_chunk_llm(chunk: str) -> List[str]:
+    raw_text = await get_llm_client().generate(_build_chunk_prompt(chunk))
+    result = _parse_llm_summary(raw_text, limit=_CHUNK_BULLETS)
+    if not result:
+        raise RuntimeError("LLM returned empty or invalid chunk summary")
+    return result
+
+
+async def _summarize_chunk(chunk: str) -> List[str]:
+    return await cached_llm_call(
+        "summary_chunk",
+        chunk,
+        version=_CHUNK_PROMPT_VERSION,
+        compute=lambda: _summarize_chunk_llm(chunk),
+        fallback=lambda: asyncio.to_thread(summarize_text_rule_based, chunk),
+    )
+
+
+async def _reduce_summaries_llm(joined: str) -> List[str]:
+    raw_text = await get_llm_client().generate(_build_reduce_prompt(joined))
+    result = _parse_llm_summary(raw_text)
+    if not result:
+        raise RuntimeError("LLM returned empty or invalid summary")
+    return result
+
+
+def _reduce_rule_based(partials: List[List[str]]) -> List[str]:
+    """조각 요약 문장들 중에서 다시 추출 요약"""
+    return summarize_text_rule_based("\n".join(line for partial in partials for line in partial))
+
+
+async def summarize_long_text(text: str) -> List[str]:
+    """
+    긴 진료 전사문 요약 (map-reduce).
+    map: 조각별 요약을 동시에 요청 (동시 요청 수는 LLM 클라이언트가 제한), 조각마다 캐시
+    reduce: 조각 요약을 시간 순으로 이어 붙여 최종 3문장으로
+    세그먼트가 하나 늘면 마지막 조각 요약과 reduce만 다시 한다.
+    """
+    chunks = split_into_chunks(text)
+    if len(chunks) <= 1:
+        return await summarize_text(" ".join(chunks))
+
+    partials = await asyncio.gather(*(_summarize_chunk(chunk) for chunk in chunks))
+    joined = "\n".join(f"- {line}" for partial in partials for line in partial)
+
+    return await cached_llm_call(
+        "summary_reduce",
+        joined,
+        version=_REDUCE_PROMPT_VERSION,
+        compute=lambda: _reduce_summaries_llm(joined),
+        fallback=lambda: _reduce_rule_based(partials),
+    )
+
+
+def summary_version(tier: str = TIER_LLM) -> str:
+    """요약 결과를 바꿀 수 있는 것들의 버전 (재처리에서 바뀐 기록만 다시 돌릴 때)."""
+    if tier == TIER_FAST:
+        return "fast"
+    return f"{_PROMPT_VERSION}:{_CHUNK_PROMPT_VERSION}:{_REDUCE_PROMPT_VERSION}"
+
+
+async def summarize_text(text: str, tier: str = TIER_LLM) -> List[str]:
+    normalized = _normalize_text(text)
+
+    if not normalized:
         return []
 
-    try:
-        result = summarize_text_llm(text)
-        if result:
-            return result
-    except Exception as e:
-        print(f"[summary] llm failed, fallback to rule-based: {e}")
+    if tier == TIER_FAST:
+        return await asyncio.to_thread(summarize_text_rule_based, text)
+
+    if len(normalized) > SINGLE_PASS_CHARS:
+        # 조각을 줄/문장 경계로 나눠야 하므로 정리 전 원문을 넘김
+        return await summarize_long_text(text)
 
-    return summarize_text_rule_based(text)
\ No newline at end of file
+    text = normalized
+
+    return await cached_llm_call(
+        "summary",
+        text,
+        version=_PROMPT_VERSION,
+        compute=lambda: summarize_text_llm(text),
+        fallback=lambda: summarize_text_rule_based(text),
+    )
+
+
+async def _stream_summary_llm(text: str) -> AsyncIterator[str]:
+    parser = JsonArrayStream("summary")
+    count = 0
+    # 중간에 끝내도 스트림(과 semaphore 자리)을 바로 돌려주도록 직접 닫음
+    chunks = get_llm_client().generate_stream(_build_prompt(text))
+    try:
+        async for chunk in chunks:
+            for item in parser.feed(chunk):
+                if not isinstance(item, str) or not item.strip():
+                    continue
+                yield item.strip()
+                count += 1
+                if count >= 3:
+                    return
+            if parser.done:
+                return
+    finally:
+        await chunks.aclose()
+
+
+async def stream_summary(text: str, tier: str = TIER_LLM) -> AsyncIterator[str]:
+    """
+    요약 bullet을 완성되는 대로 하나씩 (SSE용).
+    summarize_text와 같은 캐시 키를 쓴다. 긴 입력은 map-reduce가 끝난 뒤 한 번에.
+    """
+    normalized = _normalize_text(text)
+    if not normalized:
+        return
+
+    if tier == TIER_FAST:
+        for item in await asyncio.to_thread(summarize_text_rule_based, text):
+            yield item
+        return
+
+    if len(normalized) > SINGLE_PASS_CHARS:
+        for item in await summarize_long_text(text):
+            yield item
+        return
+
+    async for item in cached_llm_stream(
+        "summary",
+        normalized,
+        version=_PROMPT_VERSION,
+        stream=lambda: _stream_summary_llm(normalized),
+        fallback=lambda: summarize_text_rule_based(normalized),
+    ):
+        yield item
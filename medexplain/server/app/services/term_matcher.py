@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# ASCII만 소문자로 바꾼다. 길이가 그대로라 원문 위치를 그대로 쓸 수 있음
+_ASCII_FOLD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# 용어 바로 뒤에 붙어도 되는 조사/어미 (긴 것부터)
+_PARTICLES = sorted(
+    [
+        "은", "는", "이", "가", "을", "를", "에", "의", "도", "와", "과", "만", "로", "으로",
+        "에서", "에게", "까지", "부터", "하고", "이랑", "랑", "처럼", "보다", "이나", "나",
+        "상", "이라", "라", "이고", "이며", "이다", "입니다", "이에요", "예요", "이요", "요",
+        "인", "이라고", "라고", "이라는", "라는",
+    ],
+    key=len,
+    reverse=True,
+)
+_PARTICLES_RE = re.compile("(?:" + "|".join(_PARTICLES) + ")*")
+
+# 명사 용어 뒤에 바로 붙는 하다/되다 활용 ("검사해서", "치료하면", "진단된") -> 뒤는 더 보지 않음
+_VERB_SUFFIX_START = frozenset("하해했할한함합되돼됐된될됨됩")
+
+# 뒤에 붙은 한글 덩어리는 이 길이까지만 본다
+_MAX_TAIL = 8
+
+
+def fold(text: str) -> str:
+    return text.translate(_ASCII_FOLD)
+
+
+def _is_latin(ch: str) -> bool:
+    return ch.isascii() and (ch.isalnum() or ch == "-")
+
+
+def _is_latin_word(ch: str) -> bool:
+    # 오른쪽 경계용: 하이픈 뒤는 새 단어 ("CT-guided"의 CT)
+    return ch.isascii() and ch.isalnum()
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+@dataclass(frozen=True)
+class TermMatch:
+    start: int
+    end: int
+    pattern_id: int
+
+
+class TermMatcher:
+    """
+    Aho-Corasick 기반 다중 패턴 매처.
+    사전 전체를 오토마톤 하나로 컴파일해 두고, 텍스트를 한 번만 훑어서
+    모든 매치를 위치와 함께 돌려준다.
+
+    경계 규칙:
+    - 라틴 문자/숫자로 시작하거나 끝나는 패턴은 앞뒤가 라틴 토큰에 붙어 있으면 버림
+      ("PET-CT" 안의 "CT", "CTA" 안의 "CT" 등). 단 뒤쪽 하이픈은 경계로 본다 ("CT-guided" O)
+    - 한글로 끝나는 패턴은 뒤에 조사나 하다/되다 활용만 붙어 있을 때 인정
+      ("림프절에서는", "검사해서", "치료하면" O, "염증성" X)
+    - ASCII 대소문자는 구분하지 않음 ("crp" -> "CRP")
+
+    stem_match=True면 한글 패턴을 어간으로 보고 뒤에 어미가 붙어도 인정 ("아프" -> "아프고", "아프다가" O).
+    """
+
+    def __init__(self, patterns: Sequence[str], *, stem_match: bool = False):
+        self.patterns: List[str] = list(patterns)
+        self.stem_match = stem_match
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if pattern:
+                self._add(fold(pattern), pattern_id)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def pack(self) -> Tuple[List[int], List[int], List[int], List[int], List[int], List[int]]:
+        """
+        오토마톤을 int 배열로: (edge_start, edge_char, edge_target, fail, out_start, out_ids).
+        상태마다 간선은 문자 코드 순서라서 PackedTermMatcher가 이진 탐색으로 전이한다.
+        """
+        edge_start = [0]
+        edge_char: List[int] = []
+        edge_target: List[int] = []
+        out_start = [0]
+        out_ids: List[int] = []
+        for edges, outputs in zip(self._goto, self._out):
+            for ch, target in sorted(edges.items(), key=lambda e: ord(e[0])):
+                edge_char.append(ord(ch))
+                edge_target.append(target)
+            edge_start.append(len(edge_char))
+            out_ids.extend(outputs)
+            out_start.append(len(out_ids))
+        return edge_start, edge_char, edge_target, list(self._fail), out_start, out_ids
+
+    def _add(self, pattern: str, pattern_id: int) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(pattern_id)
+
+    def _build_links(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+    def _accept(self, text: str, start: int, end: int, pattern: str) -> bool:
+        if _is_latin(pattern[0]) and start > 0 and _is_latin(text[start - 1]):
+            return False
+
+        if end >= len(text):
+            return True
+
+        last = pattern[-1]
+        nxt = text[end]
+        if _is_latin(last):
+            return not _is_latin_word(nxt)
+        if _is_hangul(last) and _is_hangul(nxt):
+            if self.stem_match or nxt in _VERB_SUFFIX_START:
+                return True
+            stop = end
+            while stop < len(text) and stop - end < _MAX_TAIL and _is_hangul(text[stop]):
+                stop += 1
+            tail = text[end:stop]
+            return _PARTICLES_RE.fullmatch(tail) is not None
+        return True
+
+    def find_all(self, text: str) -> List[TermMatch]:
+        """경계 규칙을 통과한 모든 매치 (겹치는 매치 포함), 끝 위치 순서."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        matches: List[TermMatch] = []
+        state = 0
+        for i, ch in enumerate(fold(text)):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                pattern = patterns[pattern_id]
+                start = i + 1 - len(pattern)
+                if self._accept(text, start, i + 1, pattern):
+                    matches.append(TermMatch(start, i + 1, pattern_id))
+        return matches
+
+    def find_longest(self, text: str) -> List[TermMatch]:
+        """겹치면 더 왼쪽, 같은 위치면 더 긴 매치만 남긴다 ("gastric adenocarcinoma" > "adenocarcinoma")."""
+        chosen: List[TermMatch] = []
+        last_end = 0
+        for m in sorted(self.find_all(text), key=lambda m: (m.start, -m.end)):
+            if m.start >= last_end:
+                chosen.append(m)
+                last_end = m.end
+        return chosen
+
+
+class PackedTermMatcher(TermMatcher):
+    """
+    pack()한 int 배열 위에서 바로 도는 매처 (사전 인덱스 로딩용, memoryview 그대로 받아도 됨).
+    상태별 dict를 만들지 않고 상태의 간선 구간을 이진 탐색하므로 로딩 비용이 사전 크기와 무관하다.
+    patterns는 인덱스로 꺼낼 수만 있으면 된다 (쓸 때 디코딩하는 문자열 테이블).
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[str],
+        edge_start: Sequence[int],
+        edge_char: Sequence[int],
+        edge_target: Sequence[int],
+        fail: Sequence[int],
+        out_start: Sequence[int],
+        out_ids: Sequence[int],
+    ):
+        self.patterns = patterns
+        self.stem_match = False
+        self._edge_start = edge_start
+        self._edge_char = edge_char
+        self._edge_target = edge_target
+        self._fail = fail
+        self._out_start = out_start
+        self._out_ids = out_ids
+
+    @property
+    def state_count(self) -> int:
+        return len(self._edge_start) - 1
+
+    def find_all(self, text: str) -> List[TermMatch]:
+        edge_start, edge_char, edge_target = self._edge_start, self._edge_char, self._edge_target
+        fail, out_start, out_ids, patterns = self._fail, self._out_start, self._out_ids, self.patterns
+        matches: List[TermMatch] = []
+        state = 0
+        for i, ch in enumerate(fold(text)):
+            code = ord(ch)
+            while True:
+                lo, hi = edge_start[state], edge_start[state + 1]
+                k = bisect_left(edge_char, code, lo, hi)
+                if k < hi and edge_char[k] == code:
+                    state = edge_target[k]
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            for k in range(out_start[state], out_start[state + 1]):
+                pattern_id = out_ids[k]
+                pattern = patterns[pattern_id]
+                start = i + 1 - len(pattern)
+                if self._accept(text, start, i + 1, pattern):
+                    matches.append(TermMatch(start, i + 1, pattern_id))
+        return matches
+
+
+def unique_patterns(matches: Iterable[TermMatch]) -> List[int]:
+    """등장 순서를 유지하면서 pattern_id 중복 제거."""
+    seen = set()
+    result = []
+    for m in matches:
+        if m.pattern_id not in seen:
+            seen.add(m.pattern_id)
+            result.append(m.pattern_id)
+    return result
@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+from app.services.batch import run_batch
+from app.services.llm_cache import cached_llm_call
+
+
+def _collect(texts, fn, **options):
+    async def run():
+        return [item async for item in run_batch(texts, fn, **options)]
+
+    return sorted(asyncio.run(run()), key=lambda item: item["index"])
+
+
+class _Task:
+    """cached_llm_call을 거치는 작업. compute 호출 수와 동시 실행 수를 센다."""
+
+    def __init__(self, delay=0.0, fail_on=()):
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.computed = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, text):
+        async def compute():
+            self.computed.append(text)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await asyncio.sleep(self.delay)
+            finally:
+                self.active -= 1
+            if text in self.fail_on:
+                raise ValueError(text)
+            return f"llm:{text}"
+
+        return await cached_llm_call("test", text, version="1", compute=compute, fallback=lambda: f"local:{text}")
+
+
+def test_identical_inputs_are_computed_once(memory_llm_cache):
+    task = _Task()
+    items = _collect(["가 나", "가  나", " 가 나\n", "다"], task)
+
+    assert sorted(task.computed) == ["가 나", "다"]
+    assert [item["index"] for item in items] == [0, 1, 2, 3]
+    assert [item["result"] for item in items] == ["llm:가 나"] * 3 + ["llm:다"]
+    assert not any(item["cached"] for item in items)
+
+
+def test_cached_items_come_back_without_calling_llm(memory_llm_cache):
+    task = _Task()
+    _collect(["가", "나"], task)
+    task.computed.clear()
+
+    items = _collect(["가", "나", "다"], task)
+    assert task.computed == ["다"]
+    assert [item["cached"] for item in items] == [True, True, False]
+
+
+def test_cached_items_are_yielded_before_slow_ones(memory_llm_cache):
+    _collect(["캐시됨"], _Task())
+
+    async def run():
+        return [item["index"] async for item in run_batch(["느림", "캐시됨"], _Task(delay=0.05))]
+
+    assert asyncio.run(run()) == [1, 0]
+
+
+def test_failed_item_does_not_stop_the_batch():
+    async def fn(text):
+        if text == "bad":
+            raise ValueError("boom")
+        return text.upper()
+
+    items = _collect(["ok", "bad", "bad", "fine"], fn, concurrency=2)
+    assert items == [
+        {"index": 0, "result": "OK", "cached": True},
+        {"index": 1, "error": "ValueError"},
+        {"index": 2, "error": "ValueError"},
+        {"index": 3, "result": "FINE", "cached": True},
+    ]
+
+
+def test_llm_work_is_capped_by_concurrency(memory_llm_cache):
+    task = _Task(delay=0.01)
+    items = _collect([str(i) for i in range(12)], task, concurrency=3)
+    assert len(items) == 12 and len(task.computed) == 12
+    assert task.peak == 3
+
+
+def test_each_item_gets_its_own_deadline(memory_llm_cache, monkeypatch):
+    monkeypatch.setenv("LLM_BATCH_ITEM_DEADLINE_SECONDS", "0.05")
+    task = _Task(delay=1.0)
+    items = _collect(["a", "b", "c"], task, concurrency=1)
+    # 한 항목이 늦어도 다음 항목은 새 deadline으로 시작 -> 전부 fallback
+    assert [item["result"] for item in items] == ["local:a", "local:b", "local:c"]
+
+
+def test_explain_batch_streams_ndjson(client):
+    texts = ["CRP 수치가 높습니다.", "CRP  수치가 높습니다.", "혈압약은 그대로 드세요."]
+    response = client.post("/explain/batch", json={"texts": texts})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    done = lines.pop()
+    assert done["done"] and done["count"] == 3 and done["unique"] == 2 and done["failed"] == 0
+    by_index = {line["index"]: line for line in lines}
+    assert sorted(by_index) == [0, 1, 2]
+    assert by_index[0]["result"] == by_index[1]["result"]
+    assert "CRP" in [t["term"] for t in by_index[0]["result"]["terms"]]
+
+
+def test_batch_rejects_empty_list(client):
+    assert client.post("/summary/batch", json={"texts": []}).status_code == 422
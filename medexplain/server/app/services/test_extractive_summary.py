@@ -0,0 +1,51 @@
+import pytest
+
+from app.services import extractive_summary as module
+from app.services.extractive_summary import extractive_summary, split_sentences
+
+TRANSCRIPT = "\n".join([
+    "네.",
+    "오늘 위내시경 조직 검사 결과가 나왔습니다.",
+    "날씨가 많이 추워졌네요 오시는 길은 괜찮으셨어요",
+    "조직 검사에서 위선암이 확인되었고 림프절 전이는 없었습니다.",
+    "다음 주에 CT 검사를 하고 수술 일정을 잡겠습니다.",
+    "주차는 지하 2층에 하시면 돼요",
+    "오늘 위내시경 조직 검사 결과가 나왔습니다.",
+])
+
+
+def test_split_on_punctuation_newlines_and_korean_endings():
+    assert split_sentences("혈압이 높습니다 약을 드세요 알겠죠 네") == ["혈압이 높습니다", "약을 드세요", "알겠죠", "네"]
+    assert split_sentences("체온 38.5도예요. 괜찮아요?\n\n다음에 봬요") == ["체온 38.5도예요.", "괜찮아요?", "다음에 봬요"]
+    assert split_sentences("") == []
+
+
+def test_picks_medical_sentences_in_original_order():
+    summary = extractive_summary(TRANSCRIPT)
+    assert len(summary) == 3
+    assert summary == [
+        "오늘 위내시경 조직 검사 결과가 나왔습니다.",
+        "조직 검사에서 위선암이 확인되었고 림프절 전이는 없었습니다.",
+        "다음 주에 CT 검사를 하고 수술 일정을 잡겠습니다.",
+    ]
+
+
+def test_short_input_returned_as_bullets_without_duplicates():
+    assert extractive_summary("약은 하루 두 번 드세요\n약은 하루 두 번 드세요") == ["약은 하루 두 번 드세요."]
+    # 후보가 모두 짧으면 짧은 문장이라도 씀
+    assert extractive_summary("네. 아니요.") == ["네.", "아니요."]
+    assert extractive_summary("   ") == []
+
+
+def test_python_scoring_without_numpy(monkeypatch):
+    monkeypatch.setattr(module, "np", None)
+    summary = extractive_summary(TRANSCRIPT, max_sentences=2)
+    assert len(summary) == 2
+    assert all(s in TRANSCRIPT for s in summary)
+
+
+@pytest.mark.skipif(module.np is None, reason="numpy not installed")
+def test_isolated_sentence_does_not_break_textrank():
+    text = "\n".join(["abc xyz 123입니다."] + [f"혈압 약 복용 안내 {i}번째 문장입니다." for i in range(6)])
+    summary = extractive_summary(text)
+    assert len(summary) == 3
@@ -0,0 +1,104 @@
+import json
+import struct
+
+import pytest
+
+from app.services.glossary import (
+    GLOSSARY_SOURCE,
+    Glossary,
+    GlossaryStore,
+    compile_glossary,
+)
+from app.services.term_matcher import PackedTermMatcher, TermMatcher
+
+_SOURCE = {
+    "version": "t1",
+    "terms": [
+        {
+            "term": "CRP",
+            "aliases": ["C-reactive protein", "씨알피"],
+            "departments": ["내과"],
+            "description": "염증 수치",
+            "gloss": {"en": "C-reactive protein (CRP)", "zh": "C反应蛋白"},
+        },
+        {"term": "CT", "aliases": ["씨티", "crp"], "description": "단층 촬영", "gloss": {"en": "CT scan"}},
+        {"term": "림프절", "aliases": [], "description": "면역 기관", "gloss": {"en": "lymph node"}},
+        {"term": "  ", "description": "빈 용어는 버림"},
+    ],
+}
+
+
+def _raw(source=_SOURCE) -> bytes:
+    return json.dumps(source, ensure_ascii=False).encode("utf-8")
+
+
+@pytest.fixture
+def glossary():
+    return Glossary(compile_glossary(_raw()))
+
+
+def test_round_trip_entries(glossary):
+    assert len(glossary) == 3
+    assert glossary.version == "t1"
+    crp = glossary.entry(0)
+    assert crp.term == "CRP"
+    assert crp.departments == ("내과",)
+    assert crp.gloss == {"en": "C-reactive protein (CRP)", "zh": "C反应蛋白"}
+    assert glossary.entry(1).departments == ()
+
+
+def test_loaded_matcher_reads_packed_arrays_without_dicts(glossary):
+    matcher = glossary.matcher
+    assert isinstance(matcher, PackedTermMatcher)
+    assert isinstance(matcher._edge_char, memoryview)
+    assert not hasattr(matcher, "_goto")
+    # 패턴 문자열은 쓸 때만 디코딩
+    assert matcher.patterns._cache == {}
+
+
+def test_loaded_matcher_agrees_with_source_automaton(glossary):
+    reference = TermMatcher(["CRP", "C-reactive protein", "씨알피", "CT", "씨티", "림프절"])
+    for text in ["CRP랑 씨티 찍고 림프절 봤어요", "c-reactive protein", "CTA 말고 CT-guided", "림프절에서는"]:
+        assert glossary.matcher.find_all(text) == reference.find_all(text)
+
+
+def test_alias_maps_to_entry_and_duplicate_fold_is_dropped(glossary):
+    # "crp" 별칭은 "CRP"와 fold 결과가 같아서 CT 항목에 붙지 않음
+    assert [e.term for e in glossary.find_entries("씨알피, crp, 씨티")] == ["CRP", "CT"]
+
+
+def test_apply_gloss(glossary):
+    assert glossary.apply_gloss("CRP랑 림프절", "en") == "C-reactive protein (CRP)랑 lymph node"
+    # 번역어가 없으면 원문 유지
+    assert glossary.apply_gloss("CT 결과", "zh") == "CT 결과"
+
+
+def test_contains_and_phrase_hints(glossary):
+    assert glossary.contains("c-reactive PROTEIN")
+    assert not glossary.contains("C-reactive")
+    assert glossary.phrase_hints() == ["CRP", "C-reactive protein", "씨알피", "CT", "씨티", "림프절"]
+
+
+def test_rejects_bad_magic_and_old_format():
+    index = bytearray(compile_glossary(_raw()))
+    with pytest.raises(ValueError):
+        Glossary(b"XXXX" + bytes(index[4:]))
+    struct.pack_into("<I", index, 4, 1)
+    with pytest.raises(ValueError):
+        Glossary(bytes(index))
+
+
+def test_store_recompiles_stale_index(tmp_path):
+    source = tmp_path / "glossary.json"
+    index = tmp_path / "glossary.idx"
+    source.write_bytes(_raw())
+    index.write_bytes(b"garbage")
+    store = GlossaryStore(source, index)
+    assert store.current.version == "t1"
+    assert Glossary(index.read_bytes()).version == "t1"
+
+
+def test_shipped_glossary_compiles():
+    glossary = Glossary(compile_glossary(GLOSSARY_SOURCE.read_bytes()))
+    assert len(glossary) > 0
+    assert glossary.find_entries("CRP 수치")[0].term == "CRP"
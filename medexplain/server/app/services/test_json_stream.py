@@ -0,0 +1,64 @@
+import json
+
+from app.services.json_stream import JsonArrayStream
+
+
+def _feed_all(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+
+def _split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_items_come_out_as_soon_as_they_close():
+    parser = JsonArrayStream("summary")
+    assert parser.feed('```json\n{"summary": ["첫 ') == []
+    assert parser.feed('문장", "둘') == ["첫 문장"]
+    assert parser.feed('째"') == ["둘째"]
+    assert not parser.done
+    assert parser.feed("]}\n```") == []
+    assert parser.done
+
+
+def test_every_chunk_size_gives_the_same_items():
+    payload = json.dumps({
+        "summary": ['따옴표 \\" 와 ] 괄호', "쉼표, 포함", "유니코드 é"],
+        "terms": [{"term": "CRP", "description": "{중괄호} [대괄호]"}],
+    }, ensure_ascii=False)
+    expected = json.loads(payload)
+    for size in (1, 2, 3, 7, len(payload)):
+        assert _feed_all(JsonArrayStream("summary"), _split(payload, size)) == expected["summary"]
+        assert _feed_all(JsonArrayStream("terms"), _split(payload, size)) == expected["terms"]
+
+
+def test_key_inside_another_array_is_not_confused():
+    payload = '{"terms": [{"term": "a", "description": "b"}], "summary": ["x"]}'
+    assert _feed_all(JsonArrayStream("summary"), _split(payload, 4)) == ["x"]
+
+
+def test_escaped_backslash_before_quote_closes_string():
+    parser = JsonArrayStream("summary")
+    assert _feed_all(parser, ['{"summary": ["a\\\\', '", "b"]}']) == ["a\\", "b"]
+
+
+def test_broken_element_is_skipped():
+    parser = JsonArrayStream("summary")
+    items = _feed_all(parser, ['{"summary": [{"a": 1,}, "ok", 3, true, null]}'])
+    assert items == ["ok", 3, True, None]
+    assert parser.skipped == 1
+
+
+def test_input_after_array_end_is_ignored():
+    parser = JsonArrayStream("summary")
+    assert _feed_all(parser, ['{"summary": []}', '{"summary": ["late"]}']) == []
+    assert parser.done
+
+
+def test_missing_key_yields_nothing():
+    parser = JsonArrayStream("summary")
+    assert _feed_all(parser, ['{"other": ["x"]}']) == []
+    assert not parser.done
@@ -0,0 +1,110 @@
+import asyncio
+import unicodedata
+
+import pytest
+
+from app.services import llm_cache
+from app.services.llm_cache import (
+    CacheMiss,
+    LLMResultCache,
+    cache_only,
+    cached_llm_call,
+    make_key,
+    prompt_version,
+)
+
+
+def test_key_ignores_whitespace_and_unicode_form():
+    assert make_key("summary", "혈압이  높아요\n", "v1", "m") == make_key("summary", "혈압이 높아요", "v1", "m")
+    nfd = unicodedata.normalize("NFD", "위내시경")
+    assert nfd != "위내시경"
+    assert make_key("summary", nfd, "v1", "m") == make_key("summary", "위내시경", "v1", "m")
+    assert make_key("summary", "a", "v1", "m") != make_key("terms", "a", "v1", "m")
+    assert make_key("summary", "a", "v1", "m") != make_key("summary", "a", "v2", "m")
+    assert make_key("summary", "a", "v1", "m") != make_key("summary", "a", "v1", "other")
+
+
+def test_prompt_version_follows_template():
+    assert prompt_version(lambda t: f"A{t}") == prompt_version(lambda t: f"A{t}")
+    assert prompt_version(lambda t: f"A{t}") != prompt_version(lambda t: f"B{t}")
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    asyncio.run(LLMResultCache(path).set("k", {"summary": ["a"]}))
+
+    reopened = LLMResultCache(path)
+    assert asyncio.run(reopened.get("k")) == {"summary": ["a"]}
+    assert reopened.disk_hits == 1
+    # 두 번째는 메모리에서
+    asyncio.run(reopened.get("k"))
+    assert reopened.disk_hits == 1
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = LLMResultCache(tmp_path / "c.sqlite3", ttl_seconds=-1)
+    asyncio.run(cache.set("k", [1]))
+    assert asyncio.run(cache.get("k")) is None
+    assert cache.expired == 2  # 메모리 + 디스크
+
+
+def test_fallback_results_use_short_ttl():
+    cache = LLMResultCache(None, ttl_seconds=60, fallback_ttl_seconds=-1)
+    asyncio.run(cache.set("llm", [1]))
+    asyncio.run(cache.set("fb", [2], fallback=True))
+    assert asyncio.run(cache.get("llm")) == [1]
+    assert asyncio.run(cache.get("fb")) is None
+    assert cache.fallback_sets == 1
+
+
+def test_disk_is_trimmed_oldest_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_EVICT_EVERY", 1)
+    cache = LLMResultCache(tmp_path / "c.sqlite3", memory_size=1, max_disk_bytes=100)
+
+    async def fill():
+        for i in range(10):
+            await cache.set(f"k{i}", "x" * 20)
+
+    asyncio.run(fill())
+    stats = cache.stats()["disk"]
+    assert stats["bytes"] <= 100
+    assert asyncio.run(cache.get("k0")) is None
+    assert asyncio.run(cache.get("k9")) == "x" * 20
+
+
+def test_llm_result_is_cached(scripted_llm):
+    backend = scripted_llm(lambda p: "llm")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return await llm_cache.get_llm_client().generate("p")
+
+    async def run():
+        first = await cached_llm_call("t", "text", version="v", compute=compute, fallback=lambda: "fb")
+        second = await cached_llm_call("t", " text ", version="v", compute=compute, fallback=lambda: "fb")
+        return first, second
+
+    assert asyncio.run(run()) == ("llm", "llm")
+    assert len(calls) == 1 and len(backend.prompts) == 1
+
+
+def test_failure_falls_back_and_fallback_can_be_async(no_llm):
+    async def compute():
+        raise RuntimeError("down")
+
+    async def fallback():
+        return ["local"]
+
+    result = asyncio.run(cached_llm_call("t", "x", version="v", compute=compute, fallback=fallback))
+    assert result == ["local"]
+    assert llm_cache.get_llm_cache().fallback_sets == 1
+
+
+def test_cache_only_raises_on_miss(no_llm):
+    async def run():
+        with cache_only():
+            await cached_llm_call("t", "x", version="v", compute=None, fallback=None)
+
+    with pytest.raises(CacheMiss):
+        asyncio.run(run())
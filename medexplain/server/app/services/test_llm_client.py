@@ -0,0 +1,236 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.services import llm_client
+from app.services.llm_client import LLMClient, get_llm_client, init_llm_client, llm_enabled
+from app.services.llm_resilience import CircuitBreaker, CircuitOpenError, llm_deadline
+from app.services.summarizer import _stream_summary_llm
+from conftest import ScriptedBackend
+
+
+class _Gate(ScriptedBackend):
+    """동시에 몇 개가 backend 안에 있었는지 센다."""
+
+    def __init__(self):
+        super().__init__(lambda prompt: f"ok:{prompt}", delay=0.01)
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, model, prompt):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            return await super().generate(model, prompt)
+        finally:
+            self.active -= 1
+
+
+def test_concurrency_is_capped_by_semaphore():
+    backend = _Gate()
+    client = LLMClient(backend, max_concurrency=3, hedge=False)
+
+    async def run():
+        return await asyncio.gather(*(client.generate(str(i)) for i in range(10)))
+
+    results = asyncio.run(run())
+    assert results == [f"ok:{i}" for i in range(10)]
+    assert backend.peak == 3
+    assert client.calls == 10 and client.in_flight == 0
+
+
+def test_backend_error_is_raised_and_counted():
+    client = LLMClient(ScriptedBackend(lambda p: ValueError("boom")), hedge=False)
+    with pytest.raises(ValueError):
+        asyncio.run(client.generate("x"))
+    assert client.failures == 1 and client.in_flight == 0
+
+
+def test_timeout_raises_and_frees_the_slot():
+    client = LLMClient(ScriptedBackend(lambda p: "late", delay=1.0), timeout_seconds=0.02, hedge=False)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(client.generate("x"))
+    assert client.timeouts == 1 and client.in_flight == 0
+
+
+def test_without_backend_everything_falls_back(no_llm):
+    assert not llm_enabled()
+    assert init_llm_client() is None
+    with pytest.raises(RuntimeError):
+        get_llm_client()
+
+
+def test_client_is_shared_once_initialized(monkeypatch):
+    monkeypatch.setattr(llm_client, "_client", None)
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    first = init_llm_client()
+    assert first is not None and first.backend.name == "fake"
+    assert init_llm_client() is first
+    assert get_llm_client() is first
+    asyncio.run(llm_client.close_llm_client())
+    assert llm_client._client is None
+
+
+def _half_open_breaker():
+    breaker = CircuitBreaker(window=1, min_calls=1, open_seconds=0.01)
+    breaker.record(breaker.allow(), False)
+    time.sleep(0.02)
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def test_stream_probe_closed_early_by_consumer_closes_breaker():
+    breaker = _half_open_breaker()
+    client = LLMClient(ScriptedBackend(lambda p: "x" * 40, chunk_size=4), breaker=breaker, hedge=False)
+
+    async def run():
+        stream = client.generate_stream("p")
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(run()) == "xxxx"
+    assert breaker.state == "closed"
+    assert client.in_flight == 0
+
+
+def test_stream_summary_stopping_after_three_bullets_counts_as_success(scripted_llm):
+    reply = json.dumps({"summary": ["하나", "둘", "셋", "넷"]}, ensure_ascii=False)
+    scripted_llm(lambda p: reply)
+    client = llm_client.get_llm_client()
+    client.breaker = _half_open_breaker()
+
+    async def run():
+        return [item async for item in _stream_summary_llm("텍스트")]
+
+    assert asyncio.run(run()) == ["하나", "둘", "셋"]
+    assert client.breaker.state == "closed"
+
+
+def test_stream_cancelled_before_any_data_only_releases_probe():
+    breaker = _half_open_breaker()
+    client = LLMClient(ScriptedBackend(lambda p: "late", delay=1.0), breaker=breaker, hedge=False)
+
+    async def run():
+        async def consume():
+            async for _ in client.generate_stream("p"):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert breaker.state == "half_open"
+    # 시험 호출 자리는 돌려받음
+    assert breaker.allow()
+
+
+def test_stream_error_reopens_half_open_breaker():
+    breaker = _half_open_breaker()
+    client = LLMClient(ScriptedBackend(lambda p: RuntimeError("503")), breaker=breaker, hedge=False)
+
+    async def run():
+        async for _ in client.generate_stream("p"):
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert breaker.state == "open"
+    assert client.failures == 1
+
+
+def test_exhausted_request_deadline_does_not_touch_breaker():
+    backend = ScriptedBackend(lambda p: "ok")
+    client = LLMClient(backend, hedge=False)
+
+    async def run():
+        with llm_deadline(0):
+            await client.generate("p")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+    assert backend.prompts == []
+    assert client.breaker.stats()["recent_calls"] == 0
+
+
+def test_request_deadline_shorter_than_client_timeout_is_not_a_failure():
+    breaker = _half_open_breaker()
+    client = LLMClient(ScriptedBackend(lambda p: "late", delay=1.0), timeout_seconds=30, breaker=breaker, hedge=False)
+
+    async def run():
+        with llm_deadline(0.02):
+            await client.generate("p")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+    # 시험 호출 자리만 돌려받고 다시 열리지 않음
+    assert breaker.state == "half_open"
+    assert client.timeouts == 1
+
+
+def test_client_timeout_is_recorded_as_failure():
+    client = LLMClient(
+        ScriptedBackend(lambda p: "late", delay=1.0),
+        timeout_seconds=0.02,
+        breaker=CircuitBreaker(window=1, min_calls=1),
+        hedge=False,
+    )
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(client.generate("p"))
+    assert client.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.generate("p"))
+
+
+def test_timeout_while_waiting_for_a_local_slot_is_not_a_failure():
+    client = LLMClient(
+        ScriptedBackend(lambda p: "ok", delay=0.2),
+        max_concurrency=1,
+        breaker=CircuitBreaker(window=1, min_calls=1),
+        hedge=False,
+    )
+
+    async def run():
+        first = asyncio.ensure_future(client.generate("slow", timeout=5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await client.generate("queued", timeout=0.05)
+        return await first
+
+    assert asyncio.run(run()) == "ok"
+    # 자리만 기다리다 끝난 호출은 backend에 닿지 않았으므로 차단기를 열지 않음
+    assert client.timeouts == 1 and client.calls == 1
+    assert client.breaker.state == "closed"
+    assert client.breaker.stats()["recent_failures"] == 0
+
+
+def test_slow_call_is_hedged_and_faster_copy_wins():
+    delays = iter([1.0, 0.0])
+
+    class Slow(ScriptedBackend):
+        async def generate(self, model, prompt):
+            self.prompts.append(prompt)
+            await asyncio.sleep(next(delays))
+            return f"answer {len(self.prompts)}"
+
+    client = LLMClient(Slow(None), hedge=True, timeout_seconds=5)
+    for _ in range(20):
+        client.latency.record(0.01)
+
+    assert asyncio.run(client.generate("p")) == "answer 2"
+    assert client.hedged == 1 and client.hedge_wins == 1
+
+
+def test_no_hedge_while_half_open_probe_is_running():
+    breaker = _half_open_breaker()
+    client = LLMClient(ScriptedBackend(lambda p: "ok", delay=0.05), breaker=breaker, hedge=True)
+    for _ in range(20):
+        client.latency.record(0.001)
+
+    assert asyncio.run(client.generate("p")) == "ok"
+    assert client.hedged == 0
+    assert breaker.state == "closed"
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.services import question_analyzer, summarizer, term_extractor, transcript_analyzer
+from app.services.llm_fake import FakeLLMBackend, FakeLLMError
+
+TEXT = "오늘 CRP 수치가 조금 높게 나왔습니다. 다음 주에 위내시경을 하겠습니다. 약은 그대로 드세요."
+
+
+def _fake(**options):
+    options.setdefault("latency_ms", 0)
+    return FakeLLMBackend(seed=1, **options)
+
+
+def _generate(backend, prompt):
+    return asyncio.run(backend.generate("fake", prompt))
+
+
+def test_replies_match_each_service_prompt():
+    backend = _fake()
+    summary = summarizer._parse_llm_summary(_generate(backend, summarizer._build_prompt(TEXT)))
+    assert 1 <= len(summary) <= 3 and all(s in TEXT for s in summary)
+
+    terms = term_extractor._parse_response(_generate(backend, term_extractor._build_prompt(TEXT)))
+    assert "CRP" in [t["term"] for t in terms]
+
+    questions = question_analyzer._parse_response(
+        _generate(backend, question_analyzer._build_prompt("약을 바꿔야 하나요?\n언제 다시 와요"))
+    )
+    assert questions["ask_doctor"] == ["약을 바꿔야 하나요?", "언제 다시 와요?"]
+
+    analysis = transcript_analyzer._parse_response(
+        _generate(backend, transcript_analyzer._build_prompt(TEXT, "약을 바꿔야 하나요?")),
+        with_questions=True,
+    )
+    assert analysis["summary"] and analysis["terms"]
+    assert analysis["questions"]["ask_doctor"] == ["약을 바꿔야 하나요?"]
+
+
+def test_stream_pieces_join_to_the_full_reply():
+    prompt = summarizer._build_prompt(TEXT)
+
+    async def collect():
+        return "".join([piece async for piece in _fake().generate_stream("fake", prompt)])
+
+    assert asyncio.run(collect()) == _generate(_fake(), prompt)
+
+
+def test_error_and_malformed_rates():
+    with pytest.raises(FakeLLMError):
+        _generate(_fake(error_rate=1.0), summarizer._build_prompt(TEXT))
+    broken = _generate(_fake(malformed_rate=1.0), summarizer._build_prompt(TEXT))
+    with pytest.raises(ValueError):
+        summarizer._parse_llm_summary(broken)
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_FAKE_LATENCY_MS", "5")
+    monkeypatch.setenv("LLM_FAKE_ERROR_RATE", "0.25")
+    monkeypatch.setenv("LLM_FAKE_SEED", "7")
+    backend = FakeLLMBackend.from_env()
+    assert backend.latency_ms == 5 and backend.error_rate == 0.25
+    assert backend.name == "fake"
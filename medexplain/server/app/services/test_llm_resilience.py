@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.llm_resilience import (
+    CircuitBreaker,
+    LatencyTracker,
+    llm_deadline,
+    remaining_time,
+    retry_with_backoff,
+)
+
+
+def _open(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record(breaker.allow(), False)
+    assert breaker.state == "open"
+
+
+def test_opens_on_failure_ratio_and_rejects():
+    breaker = CircuitBreaker(window=4, min_calls=4, failure_ratio=0.5, open_seconds=60)
+    for ok in (True, True, False):
+        breaker.record(breaker.allow(), ok)
+    assert breaker.state == "closed"
+    breaker.record(breaker.allow(), False)
+    assert breaker.state == "open"
+    assert breaker.allow() is None
+    assert breaker.stats()["rejected"] == 1 and breaker.opened == 1
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(min_calls=1, window=1, open_seconds=0.01)
+    _open(breaker)
+    time.sleep(0.02)
+    probe = breaker.allow()
+    assert probe is not None
+    assert breaker.allow() is None
+    breaker.record(probe, True)
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(min_calls=1, window=1, open_seconds=0.01)
+    _open(breaker)
+    time.sleep(0.02)
+    breaker.record(breaker.allow(), False)
+    assert breaker.state == "open"
+    assert breaker.opened == 1
+
+
+def test_late_results_from_before_opening_are_only_counted():
+    breaker = CircuitBreaker(min_calls=2, window=2, open_seconds=0.01)
+    slow_ok = breaker.allow()
+    slow_fail = breaker.allow()
+    _open(breaker)
+    time.sleep(0.02)
+    probe = breaker.allow()
+
+    # 열리기 전에 시작한 호출의 결과: 닫지도, 다시 열지도, 시험 호출 자리를 풀지도 않음
+    breaker.record(slow_ok, True)
+    assert breaker.state == "half_open"
+    breaker.record(slow_fail, False)
+    assert breaker.state == "half_open"
+    assert breaker.allow() is None
+    assert breaker.stats()["late_results"] == 2
+
+    breaker.record(probe, True)
+    assert breaker.state == "closed"
+
+
+def test_abandon_only_releases_matching_probe():
+    breaker = CircuitBreaker(min_calls=1, window=1, open_seconds=0.01)
+    old = breaker.allow()
+    _open(breaker)
+    time.sleep(0.02)
+    probe = breaker.allow()
+    breaker.abandon(old)
+    assert breaker.allow() is None
+    breaker.abandon(probe)
+    assert breaker.allow() is not None
+
+
+def test_deadline_keeps_earlier_outer_unless_replaced():
+    assert remaining_time() is None
+    with llm_deadline(0.05):
+        with llm_deadline(10):
+            assert remaining_time() <= 0.05
+        with llm_deadline(10, replace=True):
+            assert remaining_time() > 1
+    assert remaining_time() is None
+
+
+def test_latency_percentile_needs_min_samples():
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record(0.1)
+    tracker.record(0.2)
+    assert tracker.percentile(95) is None
+    tracker.record(0.3)
+    assert tracker.percentile(95) == 0.3
+    assert tracker.percentile(0) == 0.1
+
+
+def test_retry_succeeds_after_failures():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("503")
+        return "ok"
+
+    assert asyncio.run(retry_with_backoff(flaky, base_delay=0.001)) == "ok"
+    assert len(attempts) == 3
+
+
+def test_retry_gives_up_when_backoff_would_pass_deadline():
+    attempts = []
+
+    async def down():
+        attempts.append(1)
+        raise RuntimeError("503")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(retry_with_backoff(down, base_delay=1.0, deadline_seconds=0.1))
+    assert len(attempts) == 1
@@ -0,0 +1,124 @@
+import pytest
+
+from app.services import response_cache
+from app.services.response_cache import ResponseCache, etag_matches, make_etag
+from app.storage.database import Database
+from app.storage.repositories import QuestionRepository, RecordRepository
+
+
+def _record(i):
+    return {
+        "record_id": f"r{i}",
+        "date": f"2026-01-{i:02d}",
+        "department": "내과",
+        "clean_text": f"{i}번째 진료",
+        "summary": [f"요약 {i}"],
+        "terms": [],
+    }
+
+
+def _question(i):
+    return {
+        "question_id": f"q{i}",
+        "created_at": f"2026-01-{i:02d}T09:00:00",
+        "raw_text": f"질문 {i}",
+        "general_info": [],
+        "ask_doctor": [f"질문 {i}?"],
+        "caution": [],
+        "record_id": None,
+    }
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    instance = ResponseCache(maxsize=16)
+    monkeypatch.setattr(response_cache, "_cache", instance)
+    return instance
+
+
+def test_etag_comparison():
+    etag = make_etag("db", "record", 1, 1)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != make_etag("db", "record", 1, 2)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_response_version_changes_every_etag(monkeypatch):
+    before = make_etag("db", 1)
+    monkeypatch.setattr(response_cache, "RESPONSE_VERSION", response_cache.RESPONSE_VERSION + 1)
+    assert make_etag("db", 1) != before
+
+
+def test_record_detail_revalidates_with_304(client, db, cache):
+    RecordRepository(db).insert(_record(1))
+    first = client.get("/records/r1")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    etag = first.headers["etag"]
+
+    again = client.get("/records/r1", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    assert cache.stats()["not_modified"] == 1
+
+
+def test_updating_a_record_changes_its_etag(client, db, cache):
+    repo = RecordRepository(db)
+    repo.insert(_record(1))
+    etag = client.get("/records/r1").headers["etag"]
+
+    repo.update_analysis("r1", ["새 요약"], [])
+    response = client.get("/records/r1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["summary"] == ["새 요약"]
+
+
+def test_cached_body_is_built_once_per_etag(client, db, cache, monkeypatch):
+    RecordRepository(db).insert(_record(1))
+    calls = []
+    original = RecordRepository.get
+
+    def counted(self, record_id):
+        calls.append(record_id)
+        return original(self, record_id)
+
+    monkeypatch.setattr(RecordRepository, "get", counted)
+    bodies = [client.get("/records/r1").content for _ in range(3)]
+    assert len(set(bodies)) == 1
+    assert calls == ["r1"]
+
+
+def test_list_etag_follows_page_contents(client, db, cache):
+    repo = RecordRepository(db)
+    repo.insert_many([_record(i) for i in range(1, 4)])
+    etag = client.get("/records", params={"limit": 2}).headers["etag"]
+    assert client.get("/records", params={"limit": 2}, headers={"If-None-Match": etag}).status_code == 304
+
+    # 페이지 밖 기록이 바뀌어도 그대로
+    repo.update_analysis("r3", ["첫 페이지 밖"], [])
+    assert client.get("/records", params={"limit": 2}, headers={"If-None-Match": etag}).status_code == 304
+
+    repo.update_analysis("r1", ["첫 페이지 안"], [])
+    assert client.get("/records", params={"limit": 2}, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_question_detail_and_missing_rows(client, db, cache):
+    QuestionRepository(db).insert(_question(1))
+    etag = client.get("/questions/q1").headers["etag"]
+    assert client.get("/questions/q1", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/questions/missing").status_code == 404
+    assert client.get("/records/missing").status_code == 404
+
+
+def test_new_database_file_gets_new_etags(tmp_path, db):
+    RecordRepository(db).insert(_record(1))
+    other = Database(tmp_path / "other.sqlite3")
+    RecordRepository(other).insert(_record(1))
+    version = RecordRepository(db).get_version("r1")
+    assert version == RecordRepository(other).get_version("r1")
+    assert make_etag(db.instance_id, "record", *version) != make_etag(other.instance_id, "record", *version)
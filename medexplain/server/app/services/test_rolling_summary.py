@@ -0,0 +1,86 @@
+import asyncio
+import json
+import re
+
+from app.services.rolling_summary import RollingSummarizer, update_summary
+
+
+def _reply(prompt):
+    # 새로 들어온 내용을 그대로 bullet로 (지금까지 요약 뒤에 붙임)
+    previous = re.findall(r"^- (.+)$", prompt, re.MULTILINE)
+    new = re.search(r'"""(.*)"""', prompt, re.DOTALL).group(1)
+    return json.dumps({"summary": (previous + [new])[-3:]}, ensure_ascii=False)
+
+
+def test_update_sends_previous_summary_and_new_text_only(scripted_llm):
+    backend = scripted_llm(_reply)
+    result = asyncio.run(update_summary(["혈압이 높아요."], "약을 바꿉니다.", "옛 전사문\n약을 바꿉니다."))
+    assert result == ["혈압이 높아요.", "약을 바꿉니다."]
+    assert "- 혈압이 높아요." in backend.prompts[0]
+    assert "옛 전사문" not in backend.prompts[0]
+
+
+def test_blank_update_keeps_previous(scripted_llm):
+    backend = scripted_llm(_reply)
+    assert asyncio.run(update_summary(["그대로"], "  \n", "전체")) == ["그대로"]
+    assert backend.prompts == []
+
+
+def test_failed_update_summarizes_full_transcript_locally(scripted_llm):
+    scripted_llm(lambda p: RuntimeError("down"))
+    result = asyncio.run(update_summary([], "약은 하루 두 번 드세요.", "혈압이 높습니다. 약은 하루 두 번 드세요."))
+    assert result and "혈압" in " ".join(result)
+
+
+def test_updates_after_every_n_segments_and_notifies(scripted_llm):
+    backend = scripted_llm(_reply)
+    updates = []
+
+    async def run():
+        rolling = RollingSummarizer(on_update=lambda s, n: updates.append((list(s), n)), every_segments=2, every_seconds=60)
+        rolling.add_segment("첫 번째.")
+        rolling.add_segment("  ")
+        await asyncio.sleep(0.01)
+        assert updates == []
+        rolling.add_segment("두 번째.")
+        await asyncio.sleep(0.01)
+        rolling.close()
+
+    asyncio.run(run())
+    assert updates == [(["첫 번째. 두 번째."], 2)]
+    assert len(backend.prompts) == 1
+
+
+def test_timer_flushes_pending_segments(scripted_llm):
+    scripted_llm(_reply)
+    updates = []
+
+    async def run():
+        rolling = RollingSummarizer(on_update=lambda s, n: updates.append(n), every_segments=100, every_seconds=0.01)
+        rolling.add_segment("하나.")
+        await asyncio.sleep(0.05)
+        rolling.close()
+
+    asyncio.run(run())
+    assert updates == [1]
+
+
+def test_finish_only_sends_unsummarized_segments(scripted_llm):
+    backend = scripted_llm(_reply)
+
+    async def run():
+        rolling = RollingSummarizer(every_segments=2, every_seconds=60)
+        rolling.add_segment("하나.")
+        rolling.add_segment("둘.")
+        await asyncio.sleep(0.01)
+        rolling.add_segment("셋.")
+        final = await rolling.finish()
+        again = await rolling.finish()
+        return final, again, rolling.transcript
+
+    final, again, transcript = asyncio.run(run())
+    assert final == ["하나. 둘.", "셋."]
+    assert again == final
+    assert transcript == "하나.\n둘.\n셋."
+    assert len(backend.prompts) == 2
+    assert re.search(r'"""(.*)"""', backend.prompts[1], re.DOTALL).group(1) == "셋."
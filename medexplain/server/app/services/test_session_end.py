@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.routes import session as session_route
+from app.services import stt_sessions
+from app.services.stt_sessions import SttSessionManager
+from app.storage.repositories import RecordRepository
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    instance = SttSessionManager()
+    monkeypatch.setattr(stt_sessions, "_manager", instance)
+    return instance
+
+
+def _spoken(manager, session_id, *segments, department="내과"):
+    manager.start(session_id, department=department)
+    for text in segments:
+        manager.add_final(session_id, text)
+    return manager.get(session_id)
+
+
+def test_end_saves_the_server_side_transcript(client, manager, db):
+    _spoken(manager, "s1", "CRP 수치가 조금 높습니다.", "다음 주에 위내시경을 하겠습니다.")
+
+    response = client.post("/session/s1/end")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["output1_transcript"] == "CRP 수치가 조금 높습니다.\n다음 주에 위내시경을 하겠습니다."
+    assert body["record_id"] and body["summary"]
+    assert "CRP" in [t["term"] for t in body["output2"]["terms_found"]]
+
+    saved = client.get(f"/records/{body['record_id']}").json()
+    assert saved["clean_text"] == body["output1_transcript"]
+    assert saved["department"] == "내과"
+    assert saved["summary"] == body["summary"]
+
+
+def test_ending_twice_returns_the_same_record(client, manager, db):
+    _spoken(manager, "s1", "혈압약은 그대로 드세요.")
+
+    first = client.post("/session/s1/end").json()
+    second = client.post("/session/s1/end").json()
+    assert first == second
+    assert RecordRepository(db).count() == 1
+
+
+def test_concurrent_ends_run_the_pipeline_once(client, manager, db, monkeypatch):
+    session = _spoken(manager, "s1", "혈압약은 그대로 드세요.")
+    calls = []
+    original = session_route.analyze_transcript
+
+    async def counted(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return await original(text)
+
+    monkeypatch.setattr(session_route, "analyze_transcript", counted)
+
+    async def run():
+        return await asyncio.gather(*(session_route.end_session(session) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert len({r["record_id"] for r in results}) == 1
+    assert len(calls) == 1
+
+
+def test_failed_end_can_be_retried(client, manager, db, monkeypatch):
+    session = _spoken(manager, "s1", "혈압약은 그대로 드세요.")
+    original = session_route.analyze_transcript
+
+    async def broken(text):
+        raise RuntimeError("analysis down")
+
+    monkeypatch.setattr(session_route, "analyze_transcript", broken)
+    with pytest.raises(RuntimeError):
+        asyncio.run(session_route.end_session(session))
+
+    monkeypatch.setattr(session_route, "analyze_transcript", original)
+    result = asyncio.run(session_route.end_session(session))
+    assert result["record_id"]
+
+
+def test_progress_summary_from_the_session_is_saved(client, manager, db):
+    session = _spoken(manager, "s1", "혈압약은 그대로 드세요.")
+    result = asyncio.run(session_route.end_session(session, summary=["화면에 보인 요약"]))
+    assert result["summary"] == ["화면에 보인 요약"]
+    assert client.get(f"/records/{result['record_id']}").json()["summary"] == ["화면에 보인 요약"]
+
+
+def test_blank_transcript_is_not_saved(client, manager, db):
+    _spoken(manager, "s1", "   ")
+
+    body = client.post("/session/s1/end").json()
+    assert body["record_id"] is None
+    assert body["output1_transcript"] == ""
+    assert body["output2"]["warnings"] == ["음성이 인식되지 않았습니다. 다시 녹음해주세요."]
+    assert RecordRepository(db).count() == 0
+
+
+def test_unknown_session_is_404(client, manager):
+    assert client.post("/session/nope/end").status_code == 404
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_cache import cached_llm_call, get_llm_inflight
+from app.services.llm_client import get_llm_client
+from app.services.single_flight import SingleFlight
+
+
+class _Upstream:
+    def __init__(self, result="ok", error=None, delay=0.02):
+        self.calls = 0
+        self.cancelled = False
+        self.result = result
+        self.error = error
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    upstream = _Upstream()
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", upstream) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["ok"] * 5
+    assert upstream.calls == 1
+    assert flight.stats() == {"in_flight": 0, "started": 1, "coalesced": 4, "cancelled": 0}
+
+
+def test_different_keys_are_not_merged():
+    flight = SingleFlight()
+    upstream = _Upstream()
+
+    async def run():
+        return await asyncio.gather(flight.do("a", upstream), flight.do("b", upstream))
+
+    asyncio.run(run())
+    assert upstream.calls == 2
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    upstream = _Upstream()
+
+    async def run():
+        await flight.do("k", upstream)
+        await flight.do("k", upstream)
+
+    asyncio.run(run())
+    assert upstream.calls == 2
+
+
+def test_error_reaches_every_waiter_and_key_is_released():
+    flight = SingleFlight()
+    upstream = _Upstream(error=ValueError("down"))
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("k", upstream) for _ in range(3)), return_exceptions=True)
+        return results, flight.stats()["in_flight"]
+
+    results, in_flight = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert upstream.calls == 1 and in_flight == 0
+
+
+def test_one_waiter_cancelled_keeps_the_call_running():
+    flight = SingleFlight()
+    upstream = _Upstream()
+
+    async def run():
+        leaver = asyncio.ensure_future(flight.do("k", upstream))
+        stayer = asyncio.ensure_future(flight.do("k", upstream))
+        await asyncio.sleep(0)
+        leaver.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaver
+        return await stayer
+
+    assert asyncio.run(run()) == "ok"
+    assert not upstream.cancelled
+
+
+def test_upstream_cancelled_when_all_waiters_leave():
+    flight = SingleFlight()
+    upstream = _Upstream(delay=1.0)
+
+    async def run():
+        waiters = [asyncio.ensure_future(flight.do("k", upstream)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for w in waiters:
+            w.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flight.stats()
+
+    stats = asyncio.run(run())
+    assert upstream.cancelled
+    assert stats["cancelled"] == 1 and stats["in_flight"] == 0
+
+
+def test_identical_cached_llm_calls_hit_the_backend_once(scripted_llm):
+    backend = scripted_llm(lambda p: "llm", delay=0.02)
+
+    async def call():
+        return await cached_llm_call(
+            "t", "같은 입력", version="v",
+            compute=lambda: get_llm_client().generate("p"),
+            fallback=lambda: "fb",
+        )
+
+    async def run():
+        return await asyncio.gather(*(call() for _ in range(4)))
+
+    assert asyncio.run(run()) == ["llm"] * 4
+    assert len(backend.prompts) == 1
+    assert get_llm_inflight().stats()["coalesced"] == 3
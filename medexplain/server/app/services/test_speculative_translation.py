@@ -0,0 +1,87 @@
+import asyncio
+
+from app.services.speculative_translation import SpeculativeTranslator, stable_prefix
+from app.services.translation import TranslationResult
+
+
+def test_stable_prefix_identical_hypotheses_returns_whole_text():
+    assert stable_prefix(["검사 결과 나왔어요", "검사 결과 나왔어요"]) == "검사 결과 나왔어요"
+
+
+def test_stable_prefix_cuts_at_last_shared_sentence_end():
+    hypotheses = [
+        "혈압이 높아요. 약은 하루 두 번",
+        "혈압이 높아요. 약은 하루 세 번",
+        "혈압이 높아요. 약은",
+    ]
+    assert stable_prefix(hypotheses) == "혈압이 높아요."
+
+
+def test_stable_prefix_without_sentence_end_is_empty():
+    assert stable_prefix(["혈압이 높", "혈압이 높아"]) == ""
+    assert stable_prefix([]) == ""
+
+
+def test_stable_prefix_ignores_dot_inside_number():
+    # "38.5"의 점은 문장 끝이 아님
+    assert stable_prefix(["체온이 38.5도", "체온이 38.5도예요"]) == ""
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, text):
+        self.calls.append(text)
+        await asyncio.sleep(0)
+        return {"en": TranslationResult(ok=True, text=f"<{text}>")}
+
+
+def _interims(spec, texts):
+    for text in texts:
+        spec.on_interim(text)
+
+
+def test_final_reuses_speculative_prefix_and_translates_only_the_rest():
+    async def run():
+        translate = _Recorder()
+        spec = SpeculativeTranslator(translate, loop=asyncio.get_running_loop(), window=2, min_chars=4)
+        _interims(spec, ["혈압이 높아요. 약은", "혈압이 높아요. 약을"])
+        await asyncio.sleep(0.01)
+        result = await spec.finalize("혈압이 높아요. 약은 하루 두 번")
+        return translate.calls, result, spec.stats
+
+    calls, result, stats = asyncio.run(run())
+    assert calls == ["혈압이 높아요.", "약은 하루 두 번"]
+    assert result["en"].text == "<혈압이 높아요.> <약은 하루 두 번>"
+    assert result["en"].ok
+    assert stats["reused"] == 1 and stats["missed"] == 0
+
+
+def test_changed_hypothesis_cancels_stale_speculation():
+    async def run():
+        translate = _Recorder()
+        spec = SpeculativeTranslator(translate, loop=asyncio.get_running_loop(), window=2, min_chars=4)
+        _interims(spec, ["혈압이 높아요. 약은", "혈압이 높아요. 약을"])
+        spec.on_interim("혈당이 높아요")
+        result = await spec.finalize("혈당이 높아요")
+        return result, spec.stats
+
+    result, stats = asyncio.run(run())
+    assert result["en"].text == "<혈당이 높아요>"
+    assert stats["cancelled"] >= 1
+    assert stats["missed"] == 1
+
+
+def test_final_not_starting_at_sentence_boundary_is_translated_whole():
+    async def run():
+        translate = _Recorder()
+        spec = SpeculativeTranslator(translate, loop=asyncio.get_running_loop(), window=2, min_chars=2)
+        _interims(spec, ["약은 하루", "약은 하루"])
+        await asyncio.sleep(0.01)
+        # "약은 하루" 뒤에 바로 붙는 final -> 이어 붙이면 어절이 깨지므로 전체를 다시
+        return await spec.finalize("약은 하루두 번"), translate.calls
+
+    result, calls = asyncio.run(run())
+    assert calls[-1] == "약은 하루두 번"
+    assert result["en"].text == "<약은 하루두 번>"
@@ -0,0 +1,46 @@
+import time
+
+from app.services.stt_sessions import SttSessionManager
+
+
+def test_final_segments_build_the_transcript():
+    manager = SttSessionManager()
+    manager.start("s1", department="내과")
+    manager.add_final("s1", "  첫 문장입니다. ")
+    manager.add_final("s1", "둘째 문장입니다.")
+    manager.add_final("missing", "무시됨")
+
+    session = manager.get("s1")
+    assert session.department == "내과"
+    assert session.transcript == "첫 문장입니다.\n둘째 문장입니다."
+    assert manager.get("missing") is None
+    assert manager.stats() == {"sessions": 1, "segments": 2}
+
+
+def test_warnings_are_deduplicated():
+    manager = SttSessionManager()
+    manager.start("s1")
+    manager.add_warning("s1", "음성이 인식되지 않은 구간이 있습니다.")
+    manager.add_warning("s1", "음성이 인식되지 않은 구간이 있습니다.")
+    assert manager.get("s1").warnings == ["음성이 인식되지 않은 구간이 있습니다."]
+
+
+def test_restarting_an_id_starts_a_fresh_session():
+    manager = SttSessionManager()
+    manager.start("s1")
+    manager.add_final("s1", "이전 세션")
+    manager.start("s1")
+    assert manager.get("s1").segments == []
+
+
+def test_only_inactive_sessions_expire():
+    manager = SttSessionManager()
+    manager.start("old")
+    manager.start("active")
+    manager.get("old").last_activity = time.monotonic() - 30 * 60
+    manager.get("active").last_activity = time.monotonic() - 30 * 60
+    manager.add_final("active", "방금 들어온 말")
+
+    assert manager.expire_inactive_sessions(ttl_minutes=20) == ["old"]
+    assert manager.get("old") is None
+    assert manager.get("active") is not None
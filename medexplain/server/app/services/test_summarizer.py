@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from app.services.summarizer import (
+    SINGLE_PASS_CHARS,
+    TIER_FAST,
+    split_into_chunks,
+    summarize_long_text,
+    summarize_text,
+)
+
+
+def _reply(prompt):
+    if "부분 요약:" in prompt:
+        return json.dumps({"summary": ["최종 요약"]}, ensure_ascii=False)
+    if "일부분" in prompt:
+        return json.dumps({"summary": [f"조각 {len(prompt)}"]}, ensure_ascii=False)
+    return json.dumps({"summary": ["한 번에 요약"]}, ensure_ascii=False)
+
+
+def _long_text(sentences: int, width: int = 60) -> str:
+    return "\n".join(f"{i}번째 문장 " + "가" * width + "." for i in range(sentences))
+
+
+def test_chunks_respect_size_and_sentence_boundaries():
+    text = _long_text(40)
+    chunks = split_into_chunks(text, max_chars=500)
+    assert len(chunks) > 1
+    assert all(len(c) <= 500 for c in chunks)
+    # 문장 중간에서 자르지 않음
+    assert all(c.startswith(tuple(f"{i}번째" for i in range(40))) for c in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_appending_text_keeps_earlier_chunks():
+    before = split_into_chunks(_long_text(30), max_chars=500)
+    after = split_into_chunks(_long_text(30) + "\n새 세그먼트입니다.", max_chars=500)
+    assert after[:-1] == before[:-1]
+
+
+def test_sentence_longer_than_chunk_is_cut():
+    chunks = split_into_chunks("가" * 1200, max_chars=500)
+    assert [len(c) for c in chunks] == [500, 500, 200]
+
+
+def test_short_text_uses_single_pass(scripted_llm):
+    backend = scripted_llm(_reply)
+    assert asyncio.run(summarize_text("짧은 설명입니다.")) == ["한 번에 요약"]
+    assert len(backend.prompts) == 1
+
+
+def test_long_text_is_mapped_then_reduced(scripted_llm):
+    backend = scripted_llm(_reply)
+    text = _long_text(200)
+    assert len(text) > SINGLE_PASS_CHARS
+
+    assert asyncio.run(summarize_text(text)) == ["최종 요약"]
+    map_prompts = [p for p in backend.prompts if "일부분" in p]
+    reduce_prompts = [p for p in backend.prompts if "부분 요약:" in p]
+    assert len(map_prompts) == len(split_into_chunks(text)) > 1
+    assert len(reduce_prompts) == 1
+    # 조각 요약이 시간 순서대로 reduce에 들어감
+    assert reduce_prompts[0].index("- 조각") > 0
+
+
+def test_appended_segment_only_redoes_last_chunk_and_reduce(scripted_llm):
+    backend = scripted_llm(_reply)
+    text = _long_text(200)
+
+    async def run():
+        await summarize_long_text(text)
+        first = len(backend.prompts)
+        await summarize_long_text(text + "\n새 세그먼트입니다.")
+        return first, len(backend.prompts) - first
+
+    first, second = asyncio.run(run())
+    assert first > 3
+    assert second == 2  # 마지막 조각 + reduce
+
+
+def test_failed_chunks_fall_back_to_extractive(scripted_llm):
+    scripted_llm(lambda p: RuntimeError("down"))
+    result = asyncio.run(summarize_long_text(_long_text(200)))
+    assert result and all(isinstance(line, str) and line for line in result)
+
+
+def test_fast_tier_never_calls_llm(scripted_llm):
+    backend = scripted_llm(_reply)
+    assert asyncio.run(summarize_text("혈압이 높습니다. 약을 드세요.", tier=TIER_FAST))
+    assert backend.prompts == []
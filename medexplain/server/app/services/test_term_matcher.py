@@ -0,0 +1,94 @@
+from app.services.term_matcher import PackedTermMatcher, TermMatcher, fold, unique_patterns
+
+
+def _found(matcher, text, longest=True):
+    matches = matcher.find_longest(text) if longest else matcher.find_all(text)
+    return [text[m.start:m.end] for m in matches]
+
+
+def test_overlapping_patterns_share_suffix_links():
+    matcher = TermMatcher(["위내시경", "내시경", "시경", "내과"])
+    assert sorted(_found(matcher, "위내시경", longest=False)) == ["내시경", "시경", "위내시경"]
+    assert _found(matcher, "위내시경") == ["위내시경"]
+
+
+def test_ascii_case_is_folded_but_positions_kept():
+    matcher = TermMatcher(["CRP"])
+    text = "오늘 crp 수치가"
+    assert _found(matcher, text) == ["crp"]
+    assert fold("HbA1c 씨티") == "hba1c 씨티"
+
+
+def test_latin_left_boundary():
+    matcher = TermMatcher(["CT"])
+    assert _found(matcher, "CTA 검사") == []
+    assert _found(matcher, "PET-CT 검사") == []
+    assert _found(matcher, "ACT") == []
+    assert _found(matcher, "CT 검사") == ["CT"]
+
+
+def test_hyphen_is_a_right_hand_boundary():
+    matcher = TermMatcher(["CT"])
+    assert _found(matcher, "CT-guided biopsy") == ["CT"]
+    assert _found(matcher, "CTguided") == []
+
+
+def test_longest_match_wins_on_overlap():
+    matcher = TermMatcher(["CT", "PET-CT", "adenocarcinoma", "gastric adenocarcinoma"])
+    assert _found(matcher, "PET-CT 결과 gastric adenocarcinoma") == ["PET-CT", "gastric adenocarcinoma"]
+
+
+def test_hangul_term_followed_by_particles():
+    matcher = TermMatcher(["림프절", "염증"])
+    assert _found(matcher, "림프절에서는 이상 없어요") == ["림프절"]
+    assert _found(matcher, "염증이 있어요") == ["염증"]
+    assert _found(matcher, "염증") == ["염증"]
+
+
+def test_hangul_term_rejects_longer_word():
+    matcher = TermMatcher(["염증", "위암"])
+    assert _found(matcher, "염증성 장질환") == []
+    assert _found(matcher, "위암세포") == []
+
+
+def test_hangul_term_followed_by_hada_doeda_endings():
+    matcher = TermMatcher(["조직 검사", "방사선 치료", "전이"])
+    assert _found(matcher, "조직 검사해서 확인할게요") == ["조직 검사"]
+    assert _found(matcher, "방사선 치료하면 좋아집니다") == ["방사선 치료"]
+    assert _found(matcher, "간으로 전이된 것 같아요") == ["전이"]
+    assert _found(matcher, "전이됐나요") == ["전이"]
+
+
+def test_stem_match_accepts_any_ending():
+    strict = TermMatcher(["아프"])
+    stem = TermMatcher(["아프"], stem_match=True)
+    assert _found(strict, "아프고 쑤셔요") == []
+    assert _found(stem, "아프고 쑤셔요") == ["아프"]
+
+
+def test_empty_pattern_is_ignored():
+    matcher = TermMatcher(["", "CT"])
+    assert len(matcher) == 2
+    assert [m.pattern_id for m in matcher.find_all("CT")] == [1]
+
+
+def test_packed_matcher_matches_dict_matcher():
+    patterns = ["위내시경", "내시경", "CT", "PET-CT", "림프절", "전이", "CRP"]
+    original = TermMatcher(patterns)
+    packed = PackedTermMatcher(original.patterns, *original.pack())
+    for text in ["위내시경 하고 PET-CT 찍었어요", "crp 높고 림프절로 전이됐대요", "CTA", "", "내시경내시경"]:
+        assert packed.find_all(text) == original.find_all(text)
+        assert packed.find_longest(text) == original.find_longest(text)
+
+
+def test_pack_sorts_edges_per_state():
+    edge_start, edge_char, *_ = TermMatcher(["나", "가", "다", "가나"]).pack()
+    for state in range(len(edge_start) - 1):
+        chars = edge_char[edge_start[state]:edge_start[state + 1]]
+        assert chars == sorted(chars)
+
+
+def test_unique_patterns_keeps_first_occurrence_order():
+    matcher = TermMatcher(["CT", "MRI"])
+    matches = matcher.find_all("MRI, CT, MRI")
+    assert unique_patterns(matches) == [1, 0]
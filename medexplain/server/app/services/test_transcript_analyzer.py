@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from app.services import transcript_analyzer
+from app.services.transcript_analyzer import _parse_response, analyze_transcript
+
+TEXT = "CRP 수치가 조금 높게 나왔습니다. eGFR도 다음에 다시 보겠습니다."
+
+LLM_REPLY = json.dumps({
+    "summary": ["CRP가 조금 높아요.", " ", "다음에 다시 봐요."],
+    "terms": [
+        {"term": "CRP", "description": "염증 수치예요."},
+        {"term": "빈 설명", "description": ""},
+        "문자열은 버림",
+    ],
+    "questions": {
+        "general_info": [{"question": "CRP가 뭐예요?", "answer": "염증 수치예요."}],
+        "ask_doctor": ["약을 바꿔야 하나요?"],
+        "caution": [],
+    },
+}, ensure_ascii=False)
+
+
+def test_parse_response_strips_fences_and_bad_items():
+    result = _parse_response(f"```json\n{LLM_REPLY}\n```", with_questions=True)
+    assert result["summary"] == ["CRP가 조금 높아요.", "다음에 다시 봐요."]
+    assert result["terms"] == [{"term": "CRP", "description": "염증 수치예요."}]
+    assert result["questions"]["ask_doctor"] == ["약을 바꿔야 하나요?"]
+    assert _parse_response(LLM_REPLY, with_questions=False)["questions"] is None
+
+
+def test_one_llm_call_for_summary_terms_and_questions(scripted_llm):
+    backend = scripted_llm(lambda p: LLM_REPLY)
+    result = asyncio.run(analyze_transcript(TEXT, "CRP가 뭐예요? 약을 바꿔야 하나요?"))
+
+    assert len(backend.prompts) == 1
+    assert "환자 질문" in backend.prompts[0]
+    assert result["summary"] == ["CRP가 조금 높아요.", "다음에 다시 봐요."]
+    assert result["terms"] == [{"term": "CRP", "description": "염증 수치예요."}]
+    assert result["questions"]["general_info"][0]["question"] == "CRP가 뭐예요?"
+    # 사전 밖 용어는 항상 로컬에서
+    assert {"term": "eGFR", "label": "확인 필요"} in result["terms_unknown"]
+
+
+def test_same_input_is_served_from_cache(scripted_llm):
+    backend = scripted_llm(lambda p: LLM_REPLY)
+
+    async def run():
+        await analyze_transcript(TEXT)
+        await analyze_transcript(f"  {TEXT}\n")
+
+    asyncio.run(run())
+    assert len(backend.prompts) == 1
+
+
+def test_empty_llm_sections_are_filled_locally(scripted_llm):
+    scripted_llm(lambda p: json.dumps({"summary": ["요약 하나"], "terms": []}))
+    result = asyncio.run(analyze_transcript(TEXT, "약을 바꿔야 하나요?"))
+    assert result["summary"] == ["요약 하나"]
+    assert [t["term"] for t in result["terms"]] == ["CRP"]
+    assert result["questions"]["ask_doctor"] == ["약을 바꿔야 하나요?"]
+
+
+def test_llm_failure_uses_local_analysis(scripted_llm):
+    scripted_llm(lambda p: "not json")
+    result = asyncio.run(analyze_transcript(TEXT, "약을 바꿔야 하나요"))
+    assert result["summary"]
+    assert [t["term"] for t in result["terms"]] == ["CRP"]
+    assert result["questions"] == {"general_info": [], "ask_doctor": ["약을 바꿔야 하나요?"], "caution": []}
+
+
+def test_without_questions_and_empty_input(no_llm):
+    assert asyncio.run(analyze_transcript(TEXT))["questions"] is None
+    assert asyncio.run(analyze_transcript("   ", "  ")) == {
+        "summary": [], "terms": [], "terms_unknown": [], "questions": None,
+    }
+
+
+def test_local_red_flags_are_added_to_llm_questions(scripted_llm):
+    scripted_llm(lambda p: LLM_REPLY)
+    result = asyncio.run(analyze_transcript(TEXT, "약을 바꿔야 하나요? 어제부터 가슴이 아파요"))
+    assert result["questions"]["caution"] == ["어제부터 가슴이 아파요"]
+    assert result["questions"]["ask_doctor"] == ["약을 바꿔야 하나요?"]
+
+
+def test_red_flags_survive_llm_failure(scripted_llm):
+    scripted_llm(lambda p: "not json")
+    result = asyncio.run(analyze_transcript(TEXT, "I don't have chest pain? I can't breathe"))
+    assert result["questions"]["caution"] == ["I can't breathe"]
+    assert result["questions"]["ask_doctor"] == ["I don't have chest pain?"]
+
+
+def test_llm_failure_computes_local_analysis_once(scripted_llm, monkeypatch):
+    scripted_llm(lambda p: "not json")
+    calls = []
+    original = transcript_analyzer._local_analysis
+
+    def counting(text, questions_text):
+        calls.append(text)
+        return original(text, questions_text)
+
+    monkeypatch.setattr(transcript_analyzer, "_local_analysis", counting)
+    result = asyncio.run(analyze_transcript(TEXT, "약을 바꿔야 하나요"))
+    assert result["questions"]["ask_doctor"] == ["약을 바꿔야 하나요?"]
+    assert len(calls) == 1
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.services.lru import LRUCache
+from app.services.translation import (
+    LocalTranslationBackend,
+    TranslationBackend,
+    TranslationResult,
+    TranslationService,
+)
+from translate.translator import translate_text
+
+
+class _CountingBackend:
+    name = "counting"
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    async def translate_batch(self, text, source_lang, target_langs):
+        self.calls.append((text, tuple(target_langs)))
+        return {
+            t: TranslationResult(ok=t not in self.fail, text=f"{t}:{text}", reason="x" if t in self.fail else None)
+            for t in target_langs
+        }
+
+
+def _service(backend):
+    return TranslationService(backend, cache_size=16, glossary_version="test")
+
+
+def test_backends_satisfy_protocol():
+    backend: TranslationBackend = LocalTranslationBackend()
+    assert backend.name == "local"
+
+
+def test_one_backend_call_for_all_targets_then_cached():
+    backend = _CountingBackend()
+    service = _service(backend)
+
+    first = asyncio.run(service.translate("혈압이  높아요", target_langs=("en", "zh")))
+    second = asyncio.run(service.translate(" 혈압이 높아요 ", target_langs=("en", "zh")))
+
+    # 공백만 다른 입력은 같은 캐시 키
+    assert backend.calls == [("혈압이 높아요", ("en", "zh"))]
+    assert first == second
+    assert second["zh"].text == "zh:혈압이 높아요"
+
+
+def test_only_missing_targets_go_to_backend():
+    backend = _CountingBackend()
+    service = _service(backend)
+    asyncio.run(service.translate("약", target_langs=("en",)))
+    asyncio.run(service.translate("약", target_langs=("en", "zh")))
+    assert backend.calls == [("약", ("en",)), ("약", ("zh",))]
+
+
+def test_failed_results_are_not_cached():
+    backend = _CountingBackend(fail={"zh"})
+    service = _service(backend)
+    asyncio.run(service.translate("약", target_langs=("zh",)))
+    result = asyncio.run(service.translate("약", target_langs=("zh",)))
+    assert len(backend.calls) == 2
+    assert not result["zh"].ok
+
+
+def test_missing_target_in_backend_result_is_reported_as_failed():
+    class Partial(_CountingBackend):
+        async def translate_batch(self, text, source_lang, target_langs):
+            return {}
+
+    result = asyncio.run(_service(Partial()).translate("약", target_langs=("en",)))
+    assert result["en"] == TranslationResult(ok=False, text="약", reason="translation_failed")
+
+
+def test_local_backend_failure_modes():
+    backend = LocalTranslationBackend()
+    assert backend.translate_one("  ", "en").reason == "empty_text"
+    assert backend.translate_one("이거 맞나요??", "en").reason == "translation_uncertain"
+
+
+def test_translator_keeps_old_prefixes():
+    assert translate_text("안녕하세요", "en")["translated_text"] == "[EN] 안녕하세요"
+    assert translate_text("안녕하세요", "zh")["translated_text"] == "[ZH] 안녕하세요"
+    # 예전 더미는 en이 아니면 전부 [ZH]
+    assert translate_text("안녕하세요", "ja")["translated_text"] == "[ZH] 안녕하세요"
+    assert translate_text("", "en") == {"ok": False, "translated_text": "", "reason": "empty_text"}
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_lru_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
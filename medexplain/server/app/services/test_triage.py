@@ -0,0 +1,101 @@
+import pytest
+
+from app.services.triage import TriageMatcher, merge_caution, triage
+
+FLAGGED = [
+    ("갑자기 가슴이 너무 아파요", "흉통"),
+    ("흉통이 있어요", "흉통"),
+    ("가슴이 아픈데 괜찮을까요", "흉통"),
+    ("가슴이 아플 때가 있어요", "흉통"),
+    ("가슴이 찢어질 듯 아파요", "흉통"),
+    ("가슴이 찢어질 것 같이 아파요", "흉통"),
+    ("배가 아파요", "복통"),
+    ("My stomach really hurts", "복통"),
+    ("심장이 두근거려요", "두근거림"),
+    ("My heart is racing", "두근거림"),
+    ("가슴 쪽이 너무 심하게 조여요", "흉통"),
+    ("가슴이 답답해요", "흉통"),
+    ("숨이 너무 차요", "호흡곤란"),
+    ("숨 쉬기가 힘들어요", "호흡곤란"),
+    ("한쪽 팔다리가 저려요", "뇌졸중 의심"),
+    ("오른쪽 팔에 힘이 없어요", "뇌졸중 의심"),
+    ("변이 까매요", "심한 출혈"),
+    ("대변에 피가 섞여 나와요", "심한 출혈"),
+    ("목구멍이 부어올라요", "심한 알레르기 반응"),
+    ("입술이 부었어요", "심한 알레르기 반응"),
+    ("아랫배가 칼로 찌르듯이 아파요", "심한 복통"),
+    ("머리가 깨질 것 같아요", "심한 두통"),
+    ("어제 기절했어요", "의식 저하"),
+    ("I have chest pain", "흉통"),
+    ("My chest really hurts", "흉통"),
+    ("there is pain in my chest", "흉통"),
+    ("I don't have a fever but my chest hurts", "흉통"),
+    ("I can’t breathe", "호흡곤란"),
+    ("I fainted this morning", "의식 저하"),
+]
+
+NOT_FLAGGED = [
+    # 한 글자 어간이 다른 말 안에서 걸리던 경우
+    "차 타고 갈 때 숨을 참아요",
+    "변비가 있어요 검은 옷 입어도 되나요",
+    "녹차요 마셔도 되나요",
+    "배를 타도 되나요",
+    "배가 고파요",
+    # 흔한 증상 / 다른 뜻
+    "목이 좀 부었어요",
+    "오른쪽 다리가 저려요",
+    # 묶음이 멀리 떨어짐
+    "심장 초음파 결과가 답답하게 늦네요",
+    # 부정
+    "가슴은 안 아파요",
+    "가슴이 아프지는 않아요",
+    "가슴 통증은 없어요",
+    "흉통은 없어요",
+    "기절한 적은 없어요",
+    "숨이 차지 않아요",
+    "I don't have chest pain",
+    "My chest is not in pain",
+    "no chest pain since last week",
+    "I never had chest tightness",
+    "I don't have stomach pain",
+]
+
+
+@pytest.mark.parametrize("sentence, label", FLAGGED)
+def test_red_flags_are_found(sentence, label):
+    assert label in TriageMatcher().flags(sentence)
+
+
+@pytest.mark.parametrize("sentence", NOT_FLAGGED)
+def test_false_cautions_are_not_raised(sentence):
+    assert TriageMatcher().flags(sentence) == []
+
+
+def test_self_harm_ignores_negation_on_purpose():
+    # 자해 표현은 부정이 붙어도 한 번 더 확인하는 편으로
+    assert TriageMatcher().flags("I don't want to die") == ["자해/자살 위험"]
+    assert TriageMatcher().flags("죽고 싶지는 않아요") == ["자해/자살 위험"]
+
+
+def test_triage_splits_questions_but_not_decimals():
+    hits = triage("열이 38.5도예요. 가슴이 아파요? 약은 언제 먹어요")
+    assert hits == [{"question": "가슴이 아파요", "flags": ["흉통"]}]
+    assert triage("") == []
+
+
+def test_merge_caution_moves_missed_questions():
+    result = {
+        "general_info": [{"question": "가슴이 아파요?", "answer": "..."}],
+        "ask_doctor": ["가슴이 아파요?", "약은 언제 먹어요?"],
+        "caution": [],
+    }
+    merged = merge_caution(result, [{"question": "가슴이 아파요", "flags": ["흉통"]}])
+    assert merged == {"general_info": [], "ask_doctor": ["약은 언제 먹어요?"], "caution": ["가슴이 아파요"]}
+    assert result["caution"] == []
+    assert merge_caution(result, []) is result
+
+
+def test_merge_caution_keeps_llm_wording():
+    result = {"general_info": [], "ask_doctor": [], "caution": ["가슴이 아파요?"]}
+    merged = merge_caution(result, [{"question": "가슴이  아파요", "flags": ["흉통"]}])
+    assert merged["caution"] == ["가슴이 아파요?"]
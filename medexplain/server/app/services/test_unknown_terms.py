@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from app.services.glossary import Glossary, compile_glossary
+from app.services.unknown_terms import UNKNOWN_LABEL, detect_unknown_terms
+
+
+@pytest.fixture(scope="module")
+def glossary():
+    source = {
+        "version": "t",
+        "terms": [
+            {"term": "CT", "aliases": ["씨티"], "description": "단층 촬영"},
+            {"term": "PET-CT", "description": "양전자 단층 촬영"},
+            {"term": "gastric adenocarcinoma", "description": "위선암"},
+            {"term": "위염", "description": "위 점막 염증"},
+        ],
+    }
+    return Glossary(compile_glossary(json.dumps(source, ensure_ascii=False).encode("utf-8")))
+
+
+def _terms(text, glossary):
+    return [u["term"] for u in detect_unknown_terms(text, glossary)]
+
+
+def test_flags_out_of_dictionary_terms(glossary):
+    result = detect_unknown_terms("eGFR 수치가 낮고 사구체신염이 의심돼요", glossary)
+    assert result == [
+        {"term": "eGFR", "label": UNKNOWN_LABEL},
+        {"term": "사구체신염", "label": UNKNOWN_LABEL},
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "60 mL/min 정도예요",
+    "60mL/min/1.73m2 이상이면 괜찮아요",
+    "혈당 120 mg/dL, 칼륨 4.1 mmol/L",
+    "하루 2 mg/kg/day 로 드세요",
+    "산소 2 L/min, 체온 37.5 %",
+])
+def test_compound_units_are_known(text, glossary):
+    assert _terms(text, glossary) == []
+
+
+def test_unknown_unit_part_is_flagged(glossary):
+    assert _terms("60 mL/xyz 주세요", glossary) == ["60 mL/xyz"]
+
+
+def test_hyphenated_modifier_of_known_term_is_not_flagged(glossary):
+    assert _terms("CT-guided biopsy 예정", glossary) == ["biopsy"]
+    assert _terms("PET-CT-guided 검사", glossary) == []
+    # 하이픈 앞이 모르는 말이면 그대로 확인 필요
+    assert _terms("MR-guided 검사", glossary) == ["MR-guided"]
+
+
+def test_known_terms_and_their_parts_are_skipped(glossary):
+    assert _terms("gastric adenocarcinoma 진단, 위염도 있어요", glossary) == []
+    assert _terms("CT 찍고 씨티 결과 봐요", glossary) == []
+
+
+def test_common_words_and_duplicates(glossary):
+    assert _terms("OK yes 통증이 있어요 수술은 no", glossary) == []
+    assert _terms("eGFR, egfr, EGFR", glossary) == ["eGFR"]
+    assert detect_unknown_terms("   ", glossary) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["patient has fever and cough", "이 약은 3 times a day", "30 minutes 후에", "2 weeks 뒤에 다시 오세요"],
+)
+def test_plain_english_and_time_counts_are_not_flagged(glossary, text):
+    assert _terms(text, glossary) == []
+
+
+def test_latin_candidates_need_medical_shape(glossary):
+    assert _terms("HbA1c, B12, metformin, hepatitis 확인", glossary) == ["HbA1c", "B12", "metformin", "hepatitis"]
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from typing import List, Optional
+
+from app.services import question_analyzer, term_extractor
+from app.services.glossary import get_glossary
+from app.services.llm_cache import cached_llm_call, prompt_version
+from app.services.llm_client import get_llm_client
+from app.services.summarizer import (
+    SINGLE_PASS_CHARS,
+    _normalize_text,
+    summarize_long_text,
+    summarize_text_rule_based,
+)
+from app.services.triage import merge_caution, triage
+from app.services.unknown_terms import detect_unknown_terms
+
+_MAX_SUMMARY = 3
+_MAX_TERMS = 6
+
+
+_QUESTIONS_RULE = """
+[questions] 환자가 진료 전에 적은 질문을 분류:
+- general_info: 의학적 기본 지식으로 간단히 설명 가능한 것, answer는 1-2문장
+- ask_doctor: 반드시 담당 의사에게 물어봐야 하는 것, 질문 형태로 정리
+- caution: 즉시 주의가 필요하거나 응급 가능성이 있는 것
+- 불확실하면 ask_doctor로 분류
+"""
+
+_QUESTIONS_FORMAT = """,
+  "questions": {
+    "general_info": [{"question": "...", "answer": "..."}],
+    "ask_doctor": ["..."],
+    "caution": ["..."]
+  }"""
+
+
+def _build_prompt(text: str, questions_text: Optional[str] = None) -> str:
+    with_questions = questions_text is not None
+    questions_rule = _QUESTIONS_RULE if with_questions else ""
+    questions_format = _QUESTIONS_FORMAT if with_questions else ""
+    questions_block = f'\n\n환자 질문:\n"""{questions_text}"""' if with_questions else ""
+
+    return f"""
+너는 환자 이해 보조 시스템이다.
+
+아래는 병원 진료 설명을 STT로 전사한 한국어 텍스트다.
+한 번에 다음 작업을 모두 하라.
+
+[summary] 원문에 있는 사실만으로 핵심을 최대 {_MAX_SUMMARY}개의 짧고 쉬운 한국어 문장으로 요약
+[terms] 환자가 이해하기 어려울 수 있는 의료 용어, 검사명, 약물명, 진단명을 최대 {_MAX_TERMS}개 추출하고
+각각 1-2문장으로 쉽게 설명 (실제로 텍스트에 등장한 단어만, 치료/병원/의사 같은 일반 단어 제외)
+{questions_rule}
+반드시 지킬 규칙:
+1. 진단을 추론하지 말 것
+2. 치료를 추천하지 말 것
+3. 원문에 없는 내용을 추가하지 말 것
+4. 출력은 JSON만 할 것
+
+출력 형식:
+{{
+  "summary": ["문장1", "문장2", "문장3"],
+  "terms": [{{"term": "...", "description": "..."}}]{questions_format}
+}}
+
+입력 텍스트:
+\"\"\"{text}\"\"\"{questions_block}
+""".strip()
+
+
+# 질문 블록까지 들어간 템플릿으로 버전을 잡아야 질문 규칙이 바뀌어도 캐시가 갈린다
+_PROMPT_VERSION = prompt_version(lambda t: _build_prompt(t, t))
+
+
+def _clean_list(items, limit: Optional[int] = None) -> List[str]:
+    if not isinstance(items, list):
+        return []
+    cleaned = [str(i).strip() for i in items if isinstance(i, str) and str(i).strip()]
+    return cleaned[:limit] if limit else cleaned
+
+
+def _parse_response(raw: str, with_questions: bool) -> dict:
+    raw = raw.strip()
+    raw = re.sub(r"^```json\s*", "", raw)
+    raw = re.sub(r"^```\s*", "", raw)
+    raw = re.sub(r"\s*```$", "", raw)
+
+    data = json.loads(raw)
+
+    terms = []
+    for item in data.get("terms", []) or []:
+        if isinstance(item, dict):
+            term = str(item.get("term", "")).strip()
+            description = str(item.get("description", "")).strip()
+            if term and description:
+                terms.append({"term": term, "description": description})
+
+    result = {
+        "summary": _clean_list(data.get("summary"), _MAX_SUMMARY),
+        "terms": terms[:_MAX_TERMS],
+        "questions": None,
+    }
+
+    if with_questions:
+        questions = data.get("questions")
+        if isinstance(questions, dict):
+            general_info = []
+            for item in questions.get("general_info", []) or []:
+                if isinstance(item, dict):
+                    q = str(item.get("question", "")).strip()
+                    a = str(item.get("answer", "")).strip()
+                    if q and a:
+                        general_info.append({"question": q, "answer": a})
+            result["questions"] = {
+                "general_info": general_info,
+                "ask_doctor": _clean_list(questions.get("ask_doctor")),
+                "caution": _clean_list(questions.get("caution")),
+            }
+
+    return result
+
+
+def _local_analysis(text: str, questions_text: Optional[str]) -> dict:
+    """LLM 없이 만드는 결과 (요약 규칙, 용어 사전, 질문 전부 ask_doctor, 사전 밖 용어)."""
+    glossary = get_glossary()
+    return {
+        "summary": summarize_text_rule_based(text),
+        "terms": term_extractor.extract_terms_local(text),
+        "questions": (
+            question_analyzer.analyze_questions_local(questions_text) if questions_text is not None else None
+        ),
+        "terms_unknown": detect_unknown_terms(text, glossary),
+    }
+
+
+async def analyze_transcript_llm(text: str, questions_text: Optional[str] = None) -> dict:
+    prompt = _build_prompt(text, questions_text)
+    raw = await get_llm_client().generate(prompt)
+    result = _parse_response(raw, with_questions=questions_text is not None)
+
+    if not result["summary"] and not result["terms"]:
+        raise RuntimeError("LLM returned empty or invalid analysis")
+
+    return result
+
+
+async def analyze_transcript(text: str, questions_text: Optional[str] = None) -> dict:
+    """
+    /summary + /explain + /questions/analyze를 LLM 호출 한 번으로.
+    로컬 결과(규칙 요약, 사전 용어, 사전 밖 용어)는 LLM을 기다리는 동안 스레드에서 같이 만들고,
+    LLM 결과에서 빠진 항목을 채우거나 LLM이 실패하면 그대로 쓴다.
+
+    긴 전사문은 요약만 따로 map-reduce로 돌린다 (한 번에 요약하면 뒷부분이 묻힘).
+    질문의 응급 표현은 LLM 전에 로컬에서 먼저 찾아 두고 (triage), LLM이 놓친 것은 caution에 더한다.
+
+    반환: {"summary", "terms", "terms_unknown", "questions"(질문이 없으면 None)}
+    """
+    raw_text = text or ""
+    text = _normalize_text(raw_text)
+    if questions_text is not None:
+        questions_text = questions_text.strip() or None
+
+    if not text and questions_text is None:
+        return {"summary": [], "terms": [], "terms_unknown": [], "questions": None}
+
+    hits = triage(questions_text) if questions_text is not None else []
+    local = asyncio.ensure_future(asyncio.to_thread(_local_analysis, text, questions_text))
+    long_summary = None
+    if len(text) > SINGLE_PASS_CHARS:
+        long_summary = asyncio.ensure_future(summarize_long_text(raw_text))
+
+    # 전사문과 질문을 합친 것이 캐시 키
+    key_text = text if questions_text is None else f"{text}\x00{questions_text}"
+
+    try:
+        llm_result = await cached_llm_call(
+            "analysis",
+            key_text,
+            version=f"{_PROMPT_VERSION}:{get_glossary().version}",
+            compute=lambda: analyze_transcript_llm(text, questions_text),
+            # 이미 돌고 있는 로컬 결과를 그대로 쓴다. 합쳐진 다른 요청이 기다리는 중에
+            # 이 요청이 취소돼도 끊기지 않도록 shield
+            fallback=lambda: asyncio.shield(local),
+        )
+        local_result = await local
+        summary = await long_summary if long_summary is not None else None
+    except BaseException:
+        # local은 취소하지 않음: 스레드는 어차피 끝까지 돌고, 합쳐진 요청의 fallback일 수 있음
+        if long_summary is not None:
+            long_summary.cancel()
+        raise
+
+    questions = llm_result.get("questions")
+    if questions_text is not None and not questions:
+        questions = local_result["questions"]
+    if questions is not None:
+        questions = merge_caution(questions, hits)
+
+    return {
+        "summary": summary or llm_result.get("summary") or local_result["summary"],
+        "terms": llm_result.get("terms") or local_result["terms"],
+        "terms_unknown": local_result["terms_unknown"],
+        "questions": questions,
+    }
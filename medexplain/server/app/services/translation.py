@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol, Sequence
+
+from app.services.glossary import get_glossary
+from app.services.lru import LRUCache
+
+DEFAULT_TARGETS = ("en", "zh")
+
+
+@dataclass(frozen=True)
+class TranslationResult:
+    ok: bool
+    text: str
+    reason: Optional[str] = None
+
+
+def normalize_source_text(text: str) -> str:
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class TranslationBackend(Protocol):
+    """번역 엔진. 원문 하나를 여러 target 언어로 한 번에 번역한다."""
+
+    name: str
+
+    async def translate_batch(
+        self,
+        text: str,
+        source_lang: str,
+        target_langs: Sequence[str],
+    ) -> Dict[str, TranslationResult]:
+        ...
+
+
+class LocalTranslationBackend:
+    """
+    네트워크 없이 동작하는 결정적(deterministic) 번역 엔진.
+    실제 번역 API 붙이기 전 단계 + 벤치마크용.
+    - 빈 텍스트 -> 실패 (empty_text)
+    - "??"가 있으면 -> 불확실 (translation_uncertain), 원문 유지
+    - 그 외 -> "[EN] 원문" 형태, 사전에 있는 용어는 target 번역어로 치환
+    latency_ms를 주면 호출마다 그만큼 기다려 원격 API 왕복을 흉내낸다.
+    """
+
+    name = "local"
+
+    _PREFIXES = {"en": "[EN]", "zh": "[ZH]"}
+
+    def __init__(self, *, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def translate_one(self, text: str, target_lang: str) -> TranslationResult:
+        if not text.strip():
+            return TranslationResult(ok=False, text=text, reason="empty_text")
+
+        if "??" in text:
+            return TranslationResult(ok=False, text=text, reason="translation_uncertain")
+
+        prefix = self._PREFIXES.get(target_lang)
+        if prefix is None:
+            return TranslationResult(ok=True, text=text)
+        glossed = get_glossary().apply_gloss(text, target_lang)
+        return TranslationResult(ok=True, text=f"{prefix} {glossed}")
+
+    async def translate_batch(
+        self,
+        text: str,
+        source_lang: str,
+        target_langs: Sequence[str],
+    ) -> Dict[str, TranslationResult]:
+        if self.latency_ms > 0:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return {target: self.translate_one(text, target) for target in target_langs}
+
+
+class TranslationService:
+    """
+    번역 서비스.
+    - 원문 하나 -> 여러 target을 backend 한 번 호출로 처리
+    - (정규화 텍스트, source, target, glossary 버전) 키의 LRU 캐시
+    - 캐시에 없는 target만 backend로 보냄
+    실패/불확실 결과는 캐시하지 않는다.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[TranslationBackend] = None,
+        *,
+        cache_size: int = 4096,
+        glossary_version: Optional[str] = None,
+    ):
+        self.backend = backend or LocalTranslationBackend()
+        self.cache: LRUCache[TranslationResult] = LRUCache(cache_size)
+        # None이면 현재 로딩된 사전 버전을 따라감 (사전이 바뀌면 예전 캐시 키는 자연스럽게 밀려남)
+        self._glossary_version = glossary_version
+        self.backend_calls = 0
+        self.segments = 0
+
+    @property
+    def glossary_version(self) -> str:
+        if self._glossary_version is not None:
+            return self._glossary_version
+        return get_glossary().version
+
+    async def translate(
+        self,
+        text: str,
+        *,
+        source_lang: str = "ko",
+        target_langs: Sequence[str] = DEFAULT_TARGETS,
+    ) -> Dict[str, TranslationResult]:
+        self.segments += 1
+        normalized = normalize_source_text(text)
+        version = self.glossary_version
+
+        results: Dict[str, TranslationResult] = {}
+        missing = []
+        for target in target_langs:
+            cached = self.cache.get((normalized, source_lang, target, version))
+            if cached is not None:
+                results[target] = cached
+            else:
+                missing.append(target)
+
+        if missing:
+            self.backend_calls += 1
+            translated = await self.backend.translate_batch(normalized, source_lang, missing)
+            for target in missing:
+                result = translated.get(target) or TranslationResult(
+                    ok=False, text=normalized, reason="translation_failed"
+                )
+                if result.ok:
+                    self.cache.set((normalized, source_lang, target, version), result)
+                results[target] = result
+
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "glossary_version": self.glossary_version,
+            "segments": self.segments,
+            "backend_calls": self.backend_calls,
+            "cache": self.cache.stats(),
+        }
+
+
+_service: Optional[TranslationService] = None
+
+
+def get_translation_service() -> TranslationService:
+    global _service
+    if _service is None:
+        _service = TranslationService()
+    return _service
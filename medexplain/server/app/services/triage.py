@@ -0,0 +1,284 @@
+"""
+LLM 없이 바로 하는 응급 질문 분류 (caution).
+
+응급 가능성이 있는 표현(흉통, 호흡곤란, 의식 저하 등)을 규칙 목록으로 두고
+TermMatcher 하나로 문장마다 한 번 훑어서 찾는다 (질문 하나에 수십 us).
+LLM 결과를 기다리지 않고 caution을 먼저 보여 주고, LLM이 실패해도 caution은 남는다.
+
+규칙 = 개념 묶음 여러 개. 한 문장 안에서 모든 묶음이 서로 가까이 (사이에 부사/군말 말고
+다른 단어가 _MAX_GAP_WORDS개 이하) 나오면 해당
+("가슴" 묶음 + "아프/통증/조이" 묶음 -> "갑자기 가슴이 너무 아파요", "가슴 쪽이 조여요" O,
+"심장 초음파 결과가 답답하게 늦네요" X).
+한글은 공백을 빼고 어간으로 맞추므로 띄어쓰기/어미가 달라도 잡힌다.
+한 글자 어간("차", "변", "목")은 다른 말 안에서도 걸리므로 조사/어미가 붙은 꼴로만 둔다.
+증상 묶음이 부정이면 ("안 아파요", "아프지 않아요", "I don't have chest pain") 무시.
+불확실하면 caution 쪽으로 (놓치는 것보다 한 번 더 확인하는 편이 낫다).
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.services.term_matcher import TermMatcher, fold
+
+# (이름, 개념 묶음들). 한글 패턴은 공백 없이, 영어는 소문자 단어 사이 공백 하나로
+RED_FLAGS: List[Tuple[str, List[List[str]]]] = [
+    ("흉통", [
+        ["가슴", "흉부", "명치", "심장"],
+        [
+            "아프", "아파", "아팠", "아픈", "아플", "아픔", "통증", "조이", "조여", "쥐어짜", "짓눌",
+            "찌르", "찢어", "뻐근", "답답",
+        ],
+    ]),
+    # 증상 이름만 말해도 ("흉통이 있어요")
+    ("흉통", [["흉통", "가슴통증", "협심증", "심근경색"]]),
+    ("흉통", [
+        ["chest"],
+        ["pain", "pains", "hurt", "hurts", "hurting", "pressure", "tight", "tightness", "squeezing"],
+    ]),
+    ("호흡곤란", [
+        ["숨이", "숨을", "숨쉬", "숨막", "숨가", "숨차", "숨찼", "호흡"],
+        [
+            "차요", "차서", "차고", "차올", "차다", "찹니", "찼어", "찼고", "찼다",
+            "가쁘", "가빠", "막히", "막혀", "곤란", "못쉬", "안쉬어", "안쉬어져", "힘들", "힘드",
+        ],
+    ]),
+    ("호흡곤란", [[
+        "can't breathe", "cannot breathe", "can not breathe", "short of breath", "shortness of breath",
+        "trouble breathing", "difficulty breathing", "hard to breathe",
+    ]]),
+    ("의식 저하", [[
+        "의식을잃", "의식이없", "정신을잃", "기절", "실신", "쓰러졌", "쓰러지", "쓰러져",
+        "passed out", "pass out", "fainted", "fainting", "unconscious", "unresponsive",
+    ]]),
+    ("뇌졸중 의심", [
+        ["한쪽", "반쪽"],
+        ["마비", "힘이없", "힘이빠", "감각이없", "저리", "저려"],
+    ]),
+    # 왼쪽/오른쪽만 저린 것은 흔해서 (다리 저림 등) 마비/힘 빠짐만
+    ("뇌졸중 의심", [
+        ["왼쪽", "오른쪽"],
+        ["마비", "힘이없", "힘이빠", "감각이없"],
+    ]),
+    ("뇌졸중 의심", [[
+        "말이어눌", "발음이어눌", "혀가꼬", "입이돌아", "얼굴이돌아", "얼굴한쪽이처",
+        "slurred speech", "face drooping", "stroke",
+    ]]),
+    ("심한 출혈", [[
+        "피를토", "피토", "토혈", "각혈", "객혈", "피가멈추지", "피가안멈", "출혈이멈추지", "출혈이안멈",
+        "피가계속나", "혈변", "흑변", "검은변", "피가섞인변",
+        "vomiting blood", "throwing up blood", "coughing up blood", "black stool", "bloody stool",
+        "bleeding won't stop", "bleeding that won't stop",
+    ]]),
+    ("심한 출혈", [
+        ["대변", "변이", "변을", "변에", "변색"],
+        ["검은", "검정", "검게", "까만", "까맣", "까매", "피가섞", "피가묻", "피가나"],
+    ]),
+    ("심한 두통", [
+        ["두통", "머리"],
+        ["깨질", "터질", "극심", "최악", "벼락", "난생처음", "처음겪"],
+    ]),
+    ("심한 두통", [["worst headache", "thunderclap headache", "sudden severe headache"]]),
+    ("심한 복통", [
+        ["배가", "배를", "배꼽", "아랫배", "윗배", "복부", "복통"],
+        ["찢어", "극심", "참을수없", "참을수가없", "데굴데굴", "칼로"],
+    ]),
+    ("심한 복통", [["severe abdominal pain", "severe stomach pain"]]),
+    ("복통", [
+        ["배가", "배를", "배꼽", "아랫배", "윗배", "복부"],
+        ["아프", "아파", "아팠", "아픈", "아플", "아픔", "통증", "쥐어짜", "뒤틀", "찌르"],
+    ]),
+    ("복통", [["복통", "stomachache", "bellyache"]]),
+    ("복통", [
+        ["stomach", "abdominal", "abdomen", "belly", "tummy"],
+        ["pain", "pains", "hurt", "hurts", "hurting", "ache", "aches", "cramps"],
+    ]),
+    ("두근거림", [
+        ["심장", "가슴"],
+        ["두근", "벌렁", "쿵쾅", "빨리뛰", "빠르게뛰", "불규칙"],
+    ]),
+    ("두근거림", [["심계항진", "부정맥", "palpitation", "palpitations", "racing heart", "heart is racing"]]),
+    ("경련", [["경련", "발작", "seizure", "seizures", "convulsion", "convulsions"]]),
+    # "목이 부었어요"는 대개 인후염이라 목 안/목구멍만
+    ("심한 알레르기 반응", [
+        ["목구멍", "목안", "입술", "혀가", "혀도", "혀를"],
+        ["붓", "부었", "부어", "부풀"],
+    ]),
+    ("심한 알레르기 반응", [["아나필락시스", "anaphylaxis", "throat is swelling", "swollen throat"]]),
+    ("자해/자살 위험", [[
+        "자살", "죽고싶", "살기싫", "자해", "극단적선택",
+        "suicide", "suicidal", "kill myself", "want to die", "self-harm", "hurt myself",
+    ]]),
+]
+
+# 질문 나누기 (소수점 "38.5도"는 나누지 않음)
+_SENTENCE_RE = re.compile(r"[?!\n]|(?<!\d)\.(?!\d)")
+_SPACES_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\S+")
+# 증상 바로 앞뒤 부정 ("안 아파요", "아프지 않아요", "통증은 없어요")
+_NEGATED_RE = re.compile(r"[가-힣]{0,3}(?:않|없)")
+
+# 묶음 사이에 끼어도 되는 다른 단어 수 (아래 군말은 세지 않음)
+_MAX_GAP_WORDS = 1
+_FILLER_WORDS = {
+    "너무", "많이", "좀", "조금", "약간", "심하게", "갑자기", "자꾸", "계속", "막", "꽉", "아주",
+    "정말", "진짜", "엄청", "더", "쪽", "쪽이", "쪽도", "쪽에", "부분이", "부분도",
+    "듯", "듯이", "것", "것처럼", "같이", "처럼",
+    "a", "an", "the", "my", "is", "are", "was", "it", "it's", "feels", "feel", "like", "really",
+    "very", "so", "bit", "little", "lot", "of", "in", "and", "kind", "sort", "some", "bad", "badly",
+}
+# 영어 부정: 묶음 앞 _NEGATION_REACH 단어부터 묶음 사이까지 ("I don't have chest pain", "chest is not in pain")
+_NEGATION_WORDS = {
+    "no", "not", "never", "without", "don't", "dont", "doesn't", "doesnt", "didn't", "didnt",
+    "isn't", "isnt", "aren't", "wasn't", "haven't", "hasn't",
+}
+_NEGATION_REACH = 3
+# 부정이 붙어도 ("죽고 싶지 않아요") 한 번 더 확인하는 규칙
+_ALWAYS_FLAG = {"자해/자살 위험"}
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+def _negated(key: str, start: int, end: int) -> bool:
+    return (start > 0 and key[start - 1] == "안") or _NEGATED_RE.match(key, end) is not None
+
+
+def _match_key(sentence: str) -> Tuple[str, List[int], List[str]]:
+    """
+    (매칭용 문자열, 글자마다 원래 단어 번호, 단어들(소문자, 앞뒤 문장부호 뺌)).
+    한글 사이 공백은 빼고 (띄어쓰기 차이 무시), 나머지 공백은 하나로. ASCII 대소문자는 매처가 무시
+    """
+    parts: List[str] = []
+    word_of: List[int] = []
+    words: List[str] = []
+    for i, word in enumerate(_WORD_RE.findall(sentence.replace("’", "'"))):
+        if parts and not (_is_hangul(parts[-1][-1]) and _is_hangul(word[0])):
+            parts.append(" ")
+            word_of.append(i)
+        parts.append(word)
+        word_of.extend([i] * len(word))
+        words.append(fold(word).strip(".,;:!?\"'()"))
+    return "".join(parts), word_of, words
+
+
+def _related(words: List[str], a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+    """단어 범위 a, b가 가까이 있고 그 사이나 바로 앞에 영어 부정이 없는지."""
+    left, right = sorted((a, b))
+    between = words[left[1] + 1:right[0]]
+    if sum(1 for w in between if w not in _FILLER_WORDS) > _MAX_GAP_WORDS:
+        return False
+    scope = words[max(left[0] - _NEGATION_REACH, 0):right[1] + 1]
+    return not any(w in _NEGATION_WORDS for w in scope)
+
+
+class TriageMatcher:
+    """RED_FLAGS 전체를 매처 하나로 컴파일해 두고 문장마다 해당하는 규칙 이름을 돌려준다."""
+
+    def __init__(self, rules: Sequence[Tuple[str, List[List[str]]]] = RED_FLAGS):
+        self.rules = list(rules)
+        patterns: List[str] = []
+        ids: Dict[str, int] = {}
+        # pattern_id -> 이 패턴이 채우는 (규칙, 묶음)
+        self._slots: List[List[Tuple[int, int]]] = []
+        for rule_id, (_, groups) in enumerate(self.rules):
+            for group_id, group in enumerate(groups):
+                for pattern in group:
+                    key = fold(pattern)
+                    if key not in ids:
+                        ids[key] = len(patterns)
+                        patterns.append(key)
+                        self._slots.append([])
+                    self._slots[ids[key]].append((rule_id, group_id))
+        self._matcher = TermMatcher(patterns, stem_match=True)
+
+    def _negatable(self, rule_id: int, group_id: int) -> bool:
+        label, groups = self.rules[rule_id]
+        return label not in _ALWAYS_FLAG and (group_id > 0 or len(groups) == 1)
+
+    def flags(self, sentence: str) -> List[str]:
+        """문장 하나에 해당하는 규칙 이름 (중복 없이, 규칙 순서)."""
+        key, word_of, words = _match_key(sentence)
+        if not key:
+            return []
+        # (규칙, 묶음) -> 매치된 단어 범위들
+        found: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for m in self._matcher.find_all(key):
+            span = (word_of[m.start], word_of[m.end - 1])
+            for rule_id, group_id in self._slots[m.pattern_id]:
+                # 증상 쪽 묶음(두 번째부터, 묶음이 하나면 그 묶음)은 부정이면 무시
+                if self._negatable(rule_id, group_id) and _negated(key, m.start, m.end):
+                    continue
+                found.setdefault((rule_id, group_id), []).append(span)
+
+        labels: List[str] = []
+        for rule_id in sorted({rule_id for rule_id, _ in found}):
+            label, groups = self.rules[rule_id]
+            if label in labels:
+                continue
+            # 첫 묶음의 매치 하나 가까이에 나머지 묶음이 모두 (부정 없이) 있어야 함
+            if any(
+                all(
+                    any(_related(words, anchor, span) for span in found.get((rule_id, g), ()))
+                    for g in range(1, len(groups))
+                )
+                for anchor in found.get((rule_id, 0), ())
+            ):
+                labels.append(label)
+        return labels
+
+    def triage(self, text: str) -> List[Dict[str, Any]]:
+        """텍스트를 질문 단위로 나눠서 해당하는 것만: [{"question", "flags"}]"""
+        hits = []
+        for part in _SENTENCE_RE.split(text or ""):
+            part = part.strip()
+            if not part:
+                continue
+            labels = self.flags(part)
+            if labels:
+                hits.append({"question": part, "flags": labels})
+        return hits
+
+
+def _compact(text: str) -> str:
+    return _SPACES_RE.sub("", fold(text)).rstrip("?.!")
+
+
+def merge_caution(result: Dict[str, Any], hits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    LLM(또는 fallback) 분류 결과에 로컬 caution을 합친다 (원래 dict는 그대로 두고 새 dict).
+    LLM이 이미 caution에 넣은 질문은 그대로, 빠뜨린 것은 caution에 더하고 ask_doctor/general_info에서는 뺀다.
+    """
+    if not hits:
+        return result
+
+    caution = list(result.get("caution", []))
+    covered = [_compact(c) for c in caution]
+    flagged = set()
+    for hit in hits:
+        q = _compact(hit["question"])
+        flagged.add(q)
+        if not any(q in c or c in q for c in covered if c):
+            caution.append(hit["question"])
+            covered.append(q)
+
+    return {
+        "general_info": [i for i in result.get("general_info", []) if _compact(i["question"]) not in flagged],
+        "ask_doctor": [q for q in result.get("ask_doctor", []) if _compact(q) not in flagged],
+        "caution": caution,
+    }
+
+
+_matcher: Optional[TriageMatcher] = None
+
+
+def get_triage_matcher() -> TriageMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = TriageMatcher()
+    return _matcher
+
+
+def triage(text: str) -> List[Dict[str, Any]]:
+    return get_triage_matcher().triage(text)
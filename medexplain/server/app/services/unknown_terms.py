@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+from app.services.glossary import Glossary, get_glossary
+from app.services.term_matcher import fold
+
+UNKNOWN_LABEL = "확인 필요"
+
+# 단위 하나 ("mL", "m2") / 복합 단위는 "/"로 이어짐 ("mL/min/1.73m2")
+_UNIT = r"[A-Za-zµμ]+\d?"
+_UNIT_PART_RE = re.compile(r"(?:\d+(?:\.\d+)?)?(?P<unit>[a-zµμ]+\d?)")
+
+# 후보 추출: 숫자+단위 / 라틴 문자 토큰(약어 포함) / 한글 어절
+_CANDIDATE_RE = re.compile(
+    rf"(?P<unit>\d+(?:[.,]\d+)?\s?(?P<unit_name>{_UNIT}(?:/(?:\d+(?:\.\d+)?)?{_UNIT})*|%))"
+    r"|(?P<latin>[A-Za-z][A-Za-z0-9]*(?:-[A-Za-z0-9]+)*)"
+    r"|(?P<hangul>[가-힣]+)"
+)
+
+# 의학 용어에 자주 붙는 접미사
+_MEDICAL_SUFFIXES = (
+    "염", "증", "암", "종", "술", "병", "요법", "부전", "궤양", "경화", "결석", "제제",
+)
+
+# 접미사는 맞지만 일상적으로 쓰여서 굳이 확인할 필요 없는 말
+_COMMON_HANGUL = frozenset([
+    "통증", "수술", "기술", "각종", "최종", "질병", "발병", "문제", "확인증", "보증",
+    "증", "염", "암", "종", "술", "병", "검사", "치료", "진료", "처방", "입원", "혈압",
+])
+
+# 영어 일반 단어는 후보가 아님. 약어/대소문자 섞임/숫자 포함 토큰이나 이런 접미사로 끝나는 말만
+_LATIN_MEDICAL_SUFFIXES = (
+    "itis", "osis", "emia", "aemia", "oma", "ectomy", "otomy", "ostomy", "plasty", "scopy", "graphy",
+    "opsy", "pathy", "algia", "uria", "penia", "megaly", "plegia", "trophy", "cyte", "ase",
+    "mab", "nib", "pril", "sartan", "olol", "statin", "cillin", "mycin", "azole", "dipine",
+    "formin", "gliptin", "flozin", "parin", "oxacin",
+)
+
+# 약어처럼 보이지만 일반적인 말
+_COMMON_LATIN = frozenset([
+    "a", "an", "and", "are", "be", "but", "by", "do", "for", "if", "in", "is", "it",
+    "no", "not", "of", "ok", "okay", "on", "or", "so", "the", "to", "yes", "we", "you",
+    "vs", "etc", "am", "pm",
+])
+
+# 기본 단위만 둔다. 복합 단위는 "/"로 나눠 각각 확인 (_is_known_unit)
+_KNOWN_UNITS = frozenset(fold(u) for u in [
+    "mg", "g", "kg", "mcg", "ug", "µg", "μg", "ng", "ml", "cc", "l", "dl", "cm", "mm", "m",
+    "mmhg", "bpm", "iu", "u", "meq", "mmol", "mol", "kcal", "%", "cm2", "mm2", "m2",
+    "h", "hr", "min", "sec", "s", "d", "day", "wk",
+    # 시간/횟수 ("3 times a day", "30 minutes", "2 weeks")
+    "x", "time", "times", "second", "seconds", "mins", "minute", "minutes", "hrs", "hour", "hours",
+    "days", "wks", "week", "weeks", "month", "months", "year", "years", "yr", "yrs",
+    "tab", "tabs", "tablet", "tablets", "cap", "caps", "capsule", "capsules", "pill", "pills",
+    "dose", "doses", "drop", "drops", "puff", "puffs",
+])
+
+# 후보에서 떼어낼 조사 (긴 것부터)
+_PARTICLE_SUFFIXES = (
+    "에서는", "에서도", "으로는", "이라고", "입니다", "이에요",
+    "에서", "에게", "까지", "부터", "으로", "하고", "이랑", "처럼", "보다", "이나", "이고", "예요",
+    "은", "는", "이", "가", "을", "를", "에", "의", "도", "와", "과", "만", "로", "상",
+)
+
+# 한글 후보는 조사 떼고 이 길이 이상만 본다
+_MIN_HANGUL = 2
+
+
+def _strip_particles(word: str) -> str:
+    for _ in range(2):
+        for particle in _PARTICLE_SUFFIXES:
+            if word.endswith(particle) and len(word) - len(particle) >= _MIN_HANGUL:
+                word = word[: -len(particle)]
+                break
+        else:
+            break
+    return word
+
+
+def _is_latin_candidate(word: str) -> bool:
+    """약어("CRP"), 대소문자 섞임("eGFR"), 숫자 포함("HbA1c", "B12"), 의학 접미사("biopsy")만."""
+    if sum(1 for ch in word if ch.isupper()) >= 2 or any(ch.isdigit() for ch in word):
+        return True
+    if any(ch.isupper() for ch in word[1:]):
+        return True
+    return fold(word.split("-")[-1]).endswith(_LATIN_MEDICAL_SUFFIXES)
+
+
+def _is_known_unit(unit: str) -> bool:
+    """unit(/unit)* 형태이고 조각이 전부 아는 단위인지 ("mg/dL", "mL/min/1.73m2")"""
+    for part in fold(unit).split("/"):
+        m = _UNIT_PART_RE.fullmatch(part)
+        if part != "%" and (m is None or m.group("unit") not in _KNOWN_UNITS):
+            return False
+    return True
+
+
+def detect_unknown_terms(text: str, glossary: Optional[Glossary] = None) -> List[dict]:
+    """
+    final 세그먼트 하나에서 사전에 없는 의학 용어 후보를 찾아 "확인 필요"로 돌려준다.
+    LLM 호출 없이 정규식 한 번 + 사전 매처 한 번이라 세그먼트당 수 ms 안에 끝난다.
+
+    반환 예: [{"term": "eGFR", "label": "확인 필요"}]
+    """
+    if not text or not text.strip():
+        return []
+
+    glossary = glossary or get_glossary()
+
+    # 사전 용어가 차지한 구간 안의 후보는 이미 아는 용어의 일부 ("gastric adenocarcinoma"의 "gastric")
+    covered = bytearray(len(text))
+    for match in glossary.matcher.find_all(text):
+        covered[match.start:match.end] = b"\x01" * (match.end - match.start)
+
+    def is_covered(start: int, end: int) -> bool:
+        return 0 not in covered[start:end]
+
+    unknown: List[dict] = []
+    seen = set()
+
+    for m in _CANDIDATE_RE.finditer(text):
+        if m.group("unit"):
+            unit = m.group("unit_name")
+            if _is_known_unit(unit) or glossary.contains(unit):
+                continue
+            candidate = m.group("unit")
+            start, end = m.start(), m.end()
+        elif m.group("latin"):
+            candidate = m.group("latin")
+            start, end = m.start(), m.end()
+            if (
+                len(candidate) < 2
+                or fold(candidate) in _COMMON_LATIN
+                or not _is_latin_candidate(candidate)
+            ):
+                continue
+            # 하이픈 앞이 사전 용어면 그 용어의 수식어 ("CT-guided") -> 매처와 같은 경계 규칙
+            head = candidate.split("-", 1)[0]
+            if head != candidate and is_covered(start, start + len(head)):
+                continue
+        else:
+            candidate = _strip_particles(m.group("hangul"))
+            start, end = m.start(), m.start() + len(candidate)
+            if (
+                len(candidate) < _MIN_HANGUL
+                or candidate in _COMMON_HANGUL
+                or not candidate.endswith(_MEDICAL_SUFFIXES)
+            ):
+                continue
+
+        if is_covered(start, end) or glossary.contains(candidate):
+            continue
+
+        key = fold(candidate)
+        if key in seen:
+            continue
+        seen.add(key)
+        unknown.append({"term": candidate, "label": UNKNOWN_LABEL})
+
+    return unknown
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from app.storage.repositories import QuestionRepository, RecordRepository
+
+EXPORT_PAGE_SIZE = 500
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def iter_export(
+    records: RecordRepository,
+    questions: QuestionRepository,
+    *,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    department: Optional[str] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[bytes]:
+    """
+    기록 전체를 NDJSON으로 (한 줄에 기록 하나 + 연결된 질문 "questions").
+    seq keyset 페이지 단위로 읽고 페이지마다 bytes 한 덩어리를 내보내므로
+    기록이 몇 개든 메모리는 페이지 크기만큼만 쓴다.
+    """
+    after_seq = None
+    while True:
+        page, after_seq = records.export_page(
+            limit=page_size,
+            after_seq=after_seq,
+            date_from=date_from,
+            date_to=date_to,
+            department=department,
+        )
+        if page:
+            linked = questions.list_by_records([r["record_id"] for r in page])
+            lines = []
+            for record in page:
+                record["questions"] = linked.get(record["record_id"], [])
+                lines.append(json.dumps(record, ensure_ascii=False))
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+        if after_seq is None:
+            return
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = gzip 헤더
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+class NdjsonDecoder:
+    """
+    조각으로 들어오는 NDJSON 본문을 줄 단위 객체로. gzip이면 (앞 2바이트로 판단) 풀면서 읽는다.
+    feed()/close()는 (줄 번호, 객체 또는 None) 목록을 돌려준다 (None = JSON 아님).
+    """
+
+    def __init__(self):
+        self._decompressor = None
+        self._sniffed = False
+        self._head = b""
+        self._buffer = b""
+        self.line_no = 0
+
+    def feed(self, chunk: bytes) -> List[Tuple[int, Optional[Any]]]:
+        if not self._sniffed:
+            self._head += chunk
+            if len(self._head) < 2:
+                return []
+            chunk, self._head = self._head, b""
+            self._sniffed = True
+            if chunk.startswith(_GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(31)
+
+        if self._decompressor is not None:
+            chunk = self._decompressor.decompress(chunk)
+
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b"\n")
+        return self._parse_lines(lines)
+
+    def close(self) -> List[Tuple[int, Optional[Any]]]:
+        rest = self._head + (self._decompressor.flush() if self._decompressor is not None else b"")
+        self._head = b""
+        self._buffer += rest
+        line, self._buffer = self._buffer, b""
+        return self._parse_lines([line])
+
+    def _parse_lines(self, lines: List[bytes]) -> List[Tuple[int, Optional[Any]]]:
+        parsed = []
+        for line in lines:
+            self.line_no += 1
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                obj = None
+            parsed.append((self.line_no, obj if isinstance(obj, dict) else None))
+        return parsed
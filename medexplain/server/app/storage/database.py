@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_DB_PATH = DATA_DIR / "medexplain.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    department TEXT NOT NULL,
+    clean_text TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    terms TEXT NOT NULL,
+    summary_preview TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_records_date ON records(date);
+CREATE INDEX IF NOT EXISTS idx_records_department_date ON records(department, date);
+
+CREATE TABLE IF NOT EXISTS questions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    raw_text TEXT NOT NULL,
+    general_info TEXT NOT NULL,
+    ask_doctor TEXT NOT NULL,
+    caution TEXT NOT NULL,
+    record_id TEXT,
+    ask_doctor_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_questions_record_id ON questions(record_id);
+CREATE INDEX IF NOT EXISTS idx_questions_created_at ON questions(created_at);
+
+CREATE TABLE IF NOT EXISTS search_postings (
+    token TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (token, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_search_postings_seq ON search_postings(seq);
+
+CREATE TABLE IF NOT EXISTS search_docs (
+    seq INTEGER PRIMARY KEY,
+    length INTEGER NOT NULL
+);
+
+-- 재처리 작업이 마지막으로 처리한 입력/버전 (같으면 건너뜀)
+-- error: 마지막 시도가 실패한 이유 (있으면 다음 실행에서 다시)
+CREATE TABLE IF NOT EXISTS reprocess_state (
+    record_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    processed_at TEXT NOT NULL,
+    error TEXT
+);
+"""
+
+# 나중에 추가된 컬럼 (table, column, 정의, 기존 행 채우기 또는 None)
+_ADDED_COLUMNS = [
+    (
+        "records",
+        "summary_preview",
+        "TEXT NOT NULL DEFAULT ''",
+        "UPDATE records SET summary_preview = COALESCE(json_extract(summary, '$[0]'), '')",
+    ),
+    (
+        "questions",
+        "ask_doctor_count",
+        "INTEGER NOT NULL DEFAULT 0",
+        "UPDATE questions SET ask_doctor_count = json_array_length(ask_doctor)",
+    ),
+    # 요약/용어를 바꿀 때마다 올림 (ETag)
+    ("records", "version", "INTEGER NOT NULL DEFAULT 1", None),
+    ("reprocess_state", "error", "TEXT", None),
+]
+
+
+class Database:
+    """
+    기록/질문 저장소 (SQLite, WAL).
+    - 스레드마다 연결 하나 (sync 라우트는 threadpool에서 돌기 때문)
+    - WAL이라 읽기는 쓰기를 기다리지 않음
+    - 쓰기는 transaction() 안에서 BEGIN IMMEDIATE로 (동시 POST가 서로 덮어쓰지 않음)
+    """
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        # executescript는 자체적으로 COMMIT하므로 transaction() 밖에서
+        self.connection().executescript(_SCHEMA)
+        self._add_missing_columns()
+        self.instance_id = self._instance_id()
+
+    def _add_missing_columns(self) -> None:
+        # 예전 스키마로 만들어진 DB 파일
+        conn = self.connection()
+        for table, column, ddl, backfill in _ADDED_COLUMNS:
+            existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column in existing:
+                continue
+            with self.transaction():
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+                if backfill:
+                    conn.execute(backfill)
+
+    def _instance_id(self) -> str:
+        # DB 파일마다 한 번 만드는 id. 파일을 새로 만들거나 복원하면 seq/version이 겹쳐도 ETag는 달라진다
+        with self.transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('instance_id', ?)", (uuid.uuid4().hex,))
+        return self.get_meta("instance_id")
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), isolation_level=None, timeout=30.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self.connection()
+        if conn.in_transaction:
+            # 바깥 transaction에 합류
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+_db: Optional[Database] = None
+_db_lock = threading.Lock()
+
+
+def get_database() -> Database:
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                path = os.getenv("MEDEXPLAIN_DB_PATH")
+                _db = Database(Path(path) if path else DEFAULT_DB_PATH)
+    return _db
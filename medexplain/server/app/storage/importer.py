@@ -0,0 +1,87 @@
+"""
+예전 JSON 파일(records.json, questions.json)을 SQLite 저장소로 한 번 옮긴다.
+
+서버 시작 시 자동으로 돌고 (이미 옮겼으면 아무것도 안 함), 직접 돌릴 수도 있다:
+    python -m app.storage.importer [--force]
+
+JSON 파일은 지우지 않는다. id가 이미 있으면 건너뛰므로 여러 번 돌려도 안전하다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Optional
+
+from app.storage.database import DATA_DIR, Database, get_database
+from app.storage.repositories import QuestionRepository, RecordRepository
+
+RECORDS_JSON = DATA_DIR / "records.json"
+QUESTIONS_JSON = DATA_DIR / "questions.json"
+
+_IMPORTED_KEY = "json_imported"
+
+
+def _read_json_list(path: Path) -> list:
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else []
+
+
+def import_json(
+    db: Optional[Database] = None,
+    *,
+    records_path: Path = RECORDS_JSON,
+    questions_path: Path = QUESTIONS_JSON,
+    force: bool = False,
+) -> dict:
+    db = db or get_database()
+    if not force and db.get_meta(_IMPORTED_KEY):
+        return {"skipped": True}
+
+    records = [r for r in _read_json_list(records_path) if r.get("record_id")]
+    questions = [q for q in _read_json_list(questions_path) if q.get("question_id")]
+
+    # 기록/질문/완료 표시를 한 transaction으로 (중간에 죽으면 다음 시작 때 다시)
+    with db.transaction():
+        RecordRepository(db).insert_many(
+            {
+                "record_id": r["record_id"],
+                "date": r.get("date", ""),
+                "department": r.get("department", ""),
+                "clean_text": r.get("clean_text", ""),
+                "summary": r.get("summary", []),
+                "terms": r.get("terms", []),
+            }
+            for r in records
+        )
+        QuestionRepository(db).insert_many(
+            {
+                "question_id": q["question_id"],
+                "created_at": q.get("created_at", ""),
+                "raw_text": q.get("raw_text", ""),
+                "general_info": q.get("general_info", []),
+                "ask_doctor": q.get("ask_doctor", []),
+                "caution": q.get("caution", []),
+                "record_id": q.get("record_id"),
+            }
+            for q in questions
+        )
+        db.set_meta(_IMPORTED_KEY, "1")
+
+    result = {"skipped": False, "records": len(records), "questions": len(questions)}
+    print(f"[storage] imported json records={len(records)} questions={len(questions)}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="records.json / questions.json -> SQLite")
+    parser.add_argument("--force", action="store_true", help="이미 옮겼어도 다시 (있는 id는 건너뜀)")
+    args = parser.parse_args()
+    print(import_json(force=args.force))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.storage.database import Database, get_database
+from app.storage.search import SearchIndex
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def encode_cursor(seq: Optional[int]) -> Optional[str]:
+    return None if seq is None else str(seq)
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """목록 API의 cursor -> after_seq. 잘못된 값이면 ValueError."""
+    if not cursor:
+        return None
+    seq = int(cursor)
+    if seq < 0:
+        raise ValueError(cursor)
+    return seq
+
+
+def _page(
+    conn: sqlite3.Connection,
+    columns: str,
+    table: str,
+    where: List[str],
+    params: List[Any],
+    *,
+    limit: int,
+    after_seq: Optional[int],
+) -> Tuple[List[sqlite3.Row], Optional[int]]:
+    """
+    seq 기준 keyset 페이지. OFFSET 없이 seq > 커서라서 몇 번째 페이지든 비용이 같다.
+    한 줄 더 읽어서 다음 페이지가 있는지 본다.
+    """
+    if after_seq is not None:
+        where = where + ["seq > ?"]
+        params = params + [after_seq]
+    sql = f"SELECT seq, {columns} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY seq LIMIT ?"
+    rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1]["seq"]
+    return rows, None
+
+
+class RecordRepository:
+    """
+    진료 기록 저장소. dict 모양은 예전 records.json 항목과 같다.
+    record_id 조회는 UNIQUE 인덱스, 날짜/진료과 조회는 보조 인덱스를 탄다.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.search_index = SearchIndex(db)
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "record_id": row["record_id"],
+            "date": row["date"],
+            "department": row["department"],
+            "clean_text": row["clean_text"],
+            "summary": json.loads(row["summary"]),
+            "terms": json.loads(row["terms"]),
+        }
+
+    def insert(self, record: Dict[str, Any]) -> None:
+        self.insert_many([record])
+
+    def insert_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        # 검색 색인도 같은 transaction에서 (기록은 있는데 검색이 안 되는 상태가 없도록)
+        inserted = 0
+        with self.db.transaction() as conn:
+            for r in records:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO records "
+                    "(record_id, date, department, clean_text, summary, terms, summary_preview) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        r["record_id"],
+                        r["date"],
+                        r["department"],
+                        r["clean_text"],
+                        _dumps(r.get("summary", [])),
+                        _dumps(r.get("terms", [])),
+                        (r.get("summary") or [""])[0],
+                    ),
+                )
+                if cur.rowcount:
+                    self.search_index.add(conn, cur.lastrowid, r)
+                    inserted += 1
+        return inserted
+
+    def update_analysis(self, record_id: str, summary: List[str], terms: List[Dict[str, Any]]) -> bool:
+        """요약/용어만 바꾸고 검색 색인도 다시 (재처리용)."""
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                "SELECT seq, clean_text FROM records WHERE record_id = ?", (record_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute(
+                "UPDATE records SET summary = ?, terms = ?, summary_preview = ?, version = version + 1 "
+                "WHERE seq = ?",
+                (_dumps(summary), _dumps(terms), (summary or [""])[0], row["seq"]),
+            )
+            self.search_index.remove(conn, row["seq"])
+            self.search_index.add(
+                conn,
+                row["seq"],
+                {"clean_text": row["clean_text"], "summary": summary, "terms": terms},
+            )
+        return True
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        row = self.db.connection().execute(
+            "SELECT * FROM records WHERE record_id = ?", (record_id,)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def get_version(self, record_id: str) -> Optional[Tuple[int, int]]:
+        """(seq, version)만 (ETag 확인용, 본문은 읽지 않음)."""
+        row = self.db.connection().execute(
+            "SELECT seq, version FROM records WHERE record_id = ?", (record_id,)
+        ).fetchone()
+        return (row["seq"], row["version"]) if row else None
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute("SELECT * FROM records ORDER BY seq").fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def list_page(
+        self,
+        *,
+        limit: int,
+        after_seq: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        목록 화면용 페이지. 본문/용어는 읽지 않고 목록에 필요한 컬럼만.
+        돌려주는 두 번째 값은 다음 페이지의 after_seq (마지막 페이지면 None).
+        """
+        where, params = self._filters(date_from, date_to, department)
+        rows, next_seq = _page(
+            self.db.connection(),
+            "record_id, date, department, summary_preview",
+            "records",
+            where,
+            params,
+            limit=limit,
+            after_seq=after_seq,
+        )
+        items = [
+            {
+                "record_id": row["record_id"],
+                "date": row["date"],
+                "department": row["department"],
+                "summary_preview": row["summary_preview"],
+            }
+            for row in rows
+        ]
+        return items, next_seq
+
+    def page_versions(
+        self,
+        *,
+        limit: int,
+        after_seq: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+        """list_page와 같은 페이지의 (seq, version) 목록 (ETag 확인용)."""
+        where, params = self._filters(date_from, date_to, department)
+        rows, next_seq = _page(
+            self.db.connection(),
+            "version",
+            "records",
+            where,
+            params,
+            limit=limit,
+            after_seq=after_seq,
+        )
+        return [(row["seq"], row["version"]) for row in rows], next_seq
+
+    def export_page(
+        self,
+        *,
+        limit: int,
+        after_seq: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """내보내기용 페이지 (전체 컬럼). 페이지 단위로 읽어서 메모리는 페이지 크기만큼만."""
+        where, params = self._filters(date_from, date_to, department)
+        rows, next_seq = _page(
+            self.db.connection(),
+            "*",
+            "records",
+            where,
+            params,
+            limit=limit,
+            after_seq=after_seq,
+        )
+        return [self._row_to_dict(row) for row in rows], next_seq
+
+    def reprocess_page(
+        self,
+        *,
+        limit: int,
+        after_seq: Optional[int] = None,
+        failed_only: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """재처리 입력 페이지: seq, record_id, clean_text와 마지막 재처리 fingerprint/error."""
+        where = "r.seq > ?" + (" AND s.error IS NOT NULL" if failed_only else "")
+        rows = self.db.connection().execute(
+            "SELECT r.seq, r.record_id, r.clean_text, s.fingerprint, s.error FROM records r "
+            "LEFT JOIN reprocess_state s ON s.record_id = r.record_id "
+            f"WHERE {where} ORDER BY r.seq LIMIT ?",
+            (after_seq or 0, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_reprocessed(self, results: List[Tuple[str, List[str], List[Dict[str, Any]], str]]) -> None:
+        """(record_id, summary, terms, fingerprint) 여러 개를 transaction 하나로 (error는 지움)."""
+        with self.db.transaction() as conn:
+            for record_id, summary, terms, fingerprint in results:
+                if not self.update_analysis(record_id, summary, terms):
+                    continue
+                conn.execute(
+                    "INSERT OR REPLACE INTO reprocess_state (record_id, fingerprint, processed_at, error) "
+                    "VALUES (?, ?, datetime('now'), NULL)",
+                    (record_id, fingerprint),
+                )
+
+    def save_reprocess_failures(self, failures: List[Tuple[str, str]]) -> None:
+        """(record_id, error) 여러 개. 지난 fingerprint는 그대로 두고 error만 남긴다."""
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO reprocess_state (record_id, fingerprint, processed_at, error) "
+                "VALUES (?, '', datetime('now'), ?) "
+                "ON CONFLICT(record_id) DO UPDATE SET error = excluded.error, processed_at = excluded.processed_at",
+                failures,
+            )
+
+    @staticmethod
+    def _filters(
+        date_from: Optional[str],
+        date_to: Optional[str],
+        department: Optional[str],
+    ) -> Tuple[List[str], List[Any]]:
+        where, params = [], []
+        if date_from:
+            where.append("date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("date <= ?")
+            params.append(date_to)
+        if department:
+            where.append("department = ?")
+            params.append(department)
+        return where, params
+
+    def list_by_date(self, date: str) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute(
+            "SELECT * FROM records WHERE date = ? ORDER BY seq", (date,)
+        ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def list_by_department(self, department: str) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute(
+            "SELECT * FROM records WHERE department = ? ORDER BY date, seq", (department,)
+        ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def count(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+
+class QuestionRepository:
+    """사전 질문 저장소. dict 모양은 예전 questions.json 항목과 같다."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "question_id": row["question_id"],
+            "created_at": row["created_at"],
+            "raw_text": row["raw_text"],
+            "general_info": json.loads(row["general_info"]),
+            "ask_doctor": json.loads(row["ask_doctor"]),
+            "caution": json.loads(row["caution"]),
+            "record_id": row["record_id"],
+        }
+
+    def insert(self, question: Dict[str, Any]) -> None:
+        self.insert_many([question])
+
+    def insert_many(self, questions: Iterable[Dict[str, Any]]) -> int:
+        rows = [
+            (
+                q["question_id"],
+                q["created_at"],
+                q["raw_text"],
+                _dumps(q.get("general_info", [])),
+                _dumps(q.get("ask_doctor", [])),
+                _dumps(q.get("caution", [])),
+                q.get("record_id"),
+                len(q.get("ask_doctor", [])),
+            )
+            for q in questions
+        ]
+        with self.db.transaction() as conn:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO questions "
+                "(question_id, created_at, raw_text, general_info, ask_doctor, caution, record_id, "
+                "ask_doctor_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        # 이미 있는 id는 빠진 실제 저장 수
+        return cur.rowcount
+
+    def get_seq(self, question_id: str) -> Optional[int]:
+        row = self.db.connection().execute(
+            "SELECT seq FROM questions WHERE question_id = ?", (question_id,)
+        ).fetchone()
+        return row["seq"] if row else None
+
+    def get(self, question_id: str) -> Optional[Dict[str, Any]]:
+        row = self.db.connection().execute(
+            "SELECT * FROM questions WHERE question_id = ?", (question_id,)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute("SELECT * FROM questions ORDER BY seq").fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def list_page(
+        self,
+        *,
+        limit: int,
+        after_seq: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        record_id: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """목록 화면용 페이지 (RecordRepository.list_page와 같은 방식)."""
+        where, params = self._filters(date_from, date_to, record_id)
+        rows, next_seq = _page(
+            self.db.connection(),
+            "question_id, created_at, raw_text, ask_doctor_count, record_id",
+            "questions",
+            where,
+            params,
+            limit=limit,
+            after_seq=after_seq,
+        )
+        items = [
+            {
+                "question_id": row["question_id"],
+                "created_at": row["created_at"],
+                "raw_text": row["raw_text"],
+                "ask_doctor_count": row["ask_doctor_count"],
+                "record_id": row["record_id"],
+            }
+            for row in rows
+        ]
+        return items, next_seq
+
+    def page_seqs(
+        self,
+        *,
+        limit: int,
+        after_seq: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        record_id: Optional[str] = None,
+    ) -> Tuple[List[int], Optional[int]]:
+        """list_page와 같은 페이지의 seq 목록 (질문은 바뀌지 않으므로 seq만으로 ETag)."""
+        where, params = self._filters(date_from, date_to, record_id)
+        rows, next_seq = _page(
+            self.db.connection(),
+            "question_id",
+            "questions",
+            where,
+            params,
+            limit=limit,
+            after_seq=after_seq,
+        )
+        return [row["seq"] for row in rows], next_seq
+
+    @staticmethod
+    def _filters(
+        date_from: Optional[str],
+        date_to: Optional[str],
+        record_id: Optional[str],
+    ) -> Tuple[List[str], List[Any]]:
+        where, params = [], []
+        if date_from:
+            where.append("created_at >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("created_at <= ?")
+            params.append(date_to)
+        if record_id:
+            where.append("record_id = ?")
+            params.append(record_id)
+        return where, params
+
+    def list_by_record(self, record_id: str) -> List[Dict[str, Any]]:
+        rows = self.db.connection().execute(
+            "SELECT * FROM questions WHERE record_id = ? ORDER BY seq", (record_id,)
+        ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def list_by_records(self, record_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """기록 여러 개에 연결된 질문 (record_id 인덱스로 한 번에)."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {rid: [] for rid in record_ids}
+        if not record_ids:
+            return grouped
+        rows = self.db.connection().execute(
+            f"SELECT * FROM questions WHERE record_id IN ({','.join('?' * len(record_ids))}) ORDER BY seq",
+            record_ids,
+        ).fetchall()
+        for row in rows:
+            grouped[row["record_id"]].append(self._row_to_dict(row))
+        return grouped
+
+    def count(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+
+def get_record_repository() -> RecordRepository:
+    return RecordRepository(get_database())
+
+
+def get_question_repository() -> QuestionRepository:
+    return QuestionRepository(get_database())
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import sqlite3
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.storage.database import Database, get_database
+
+# 토크나이저나 가중치를 바꾸면 올림 -> 시작할 때 색인을 다시 만든다
+INDEX_VERSION = "1"
+_VERSION_KEY = "search_index_version"
+
+_TOKEN_RE = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9\-]*|\d+(?:[.,]\d+)?")
+
+# 필드 가중치 (요약/용어에 나온 말이 본문에만 나온 말보다 중요)
+_CLEAN_TEXT_WEIGHT = 1
+_SUMMARY_WEIGHT = 2
+_TERM_WEIGHT = 3
+
+# BM25
+_K1 = 1.2
+_B = 0.75
+
+# 문서 절반 넘게 나오는 토큰은 ("니다", "어요" 같은 어미) 점수에 거의 기여하지 않으면서
+# postings만 길어서 조회를 느리게 하므로, 더 드문 토큰이 있으면 빼고 찾는다
+_COMMON_DF_RATIO = 0.5
+
+_SNIPPET_RADIUS = 40
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한글은 어절 안의 글자 bigram (한 글자 어절은 그대로), 영문/숫자는 토큰 그대로 (소문자).
+    형태소 분석 없이도 조사가 붙은 말("CRP가", "혈압약을")이 찾아진다.
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(text or ""):
+        if "가" <= token[0] <= "힣":
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token.lower())
+    return tokens
+
+
+def _document_tokens(record: Dict[str, Any]) -> Counter:
+    counts: Counter = Counter()
+    for token in tokenize(record.get("clean_text", "")):
+        counts[token] += _CLEAN_TEXT_WEIGHT
+    for line in record.get("summary") or []:
+        for token in tokenize(str(line)):
+            counts[token] += _SUMMARY_WEIGHT
+    for term in record.get("terms") or []:
+        for token in tokenize(str(term.get("term", ""))):
+            counts[token] += _TERM_WEIGHT
+    return counts
+
+
+def _snippet(text: str, query: str) -> str:
+    """질문 단어가 처음 나오는 곳 앞뒤 조금. 못 찾으면 앞부분."""
+    text = " ".join(text.split())
+    lowered = text.lower()
+    hit = -1
+    for word in sorted(query.lower().split(), key=len, reverse=True):
+        hit = lowered.find(word)
+        if hit >= 0:
+            break
+    if hit < 0:
+        return text[: _SNIPPET_RADIUS * 2] + ("…" if len(text) > _SNIPPET_RADIUS * 2 else "")
+
+    start = max(hit - _SNIPPET_RADIUS, 0)
+    end = min(hit + _SNIPPET_RADIUS, len(text))
+    return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+class SearchIndex:
+    """
+    진료 기록 전문 검색 (SQLite 안의 역색인).
+    - search_postings(token, seq, tf): (token, seq) 기본키라 토큰별 postings가 모여 있음
+    - search_docs(seq, length): BM25 길이 정규화용
+    기록 insert와 같은 transaction 안에서 add()로 갱신한다.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def add(self, conn: sqlite3.Connection, seq: int, record: Dict[str, Any]) -> None:
+        counts = _document_tokens(record)
+        conn.executemany(
+            "INSERT OR REPLACE INTO search_postings (token, seq, tf) VALUES (?, ?, ?)",
+            [(token, seq, tf) for token, tf in counts.items()],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO search_docs (seq, length) VALUES (?, ?)",
+            (seq, sum(counts.values())),
+        )
+
+    def remove(self, conn: sqlite3.Connection, seq: int) -> None:
+        conn.execute("DELETE FROM search_postings WHERE seq = ?", (seq,))
+        conn.execute("DELETE FROM search_docs WHERE seq = ?", (seq,))
+
+    def rebuild(self) -> int:
+        conn = self.db.connection()
+        with self.db.transaction():
+            conn.execute("DELETE FROM search_postings")
+            conn.execute("DELETE FROM search_docs")
+            rows = conn.execute("SELECT seq, clean_text, summary, terms FROM records").fetchall()
+            for row in rows:
+                self.add(conn, row["seq"], _row_record(row))
+            self.db.set_meta(_VERSION_KEY, INDEX_VERSION)
+        return len(rows)
+
+    def ensure_built(self) -> None:
+        if self.db.get_meta(_VERSION_KEY) == INDEX_VERSION:
+            return
+        count = self.rebuild()
+        print(f"[search] rebuilt index version={INDEX_VERSION} records={count}")
+
+    def search(self, query: str, *, limit: int = 20) -> List[Dict[str, Any]]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        conn = self.db.connection()
+        total, avg_length = conn.execute(
+            "SELECT COUNT(*), COALESCE(AVG(length), 0) FROM search_docs"
+        ).fetchone()
+        if not total:
+            return []
+
+        marks = ",".join("?" * len(tokens))
+        df = dict(conn.execute(
+            f"SELECT token, COUNT(*) FROM search_postings WHERE token IN ({marks}) GROUP BY token",
+            tokens,
+        ).fetchall())
+        found = [t for t in tokens if df.get(t)]
+        if not found:
+            return []
+        rare = [t for t in found if df[t] <= total * _COMMON_DF_RATIO]
+        if rare:
+            found = rare
+
+        weights = [
+            (t, math.log(1.0 + (total - df[t] + 0.5) / (df[t] + 0.5)))
+            for t in found
+        ]
+        values = ",".join("(?, ?)" for _ in weights)
+        params: List[Any] = [x for pair in weights for x in pair]
+        rows = conn.execute(
+            f"""
+            WITH q(token, idf) AS (VALUES {values})
+            SELECT p.seq AS seq,
+                   COUNT(*) AS matched,
+                   SUM(q.idf * p.tf * ({_K1} + 1.0)
+                       / (p.tf + {_K1} * (1.0 - {_B} + {_B} * d.length / ?))) AS score
+            FROM q
+            JOIN search_postings p ON p.token = q.token
+            JOIN search_docs d ON d.seq = p.seq
+            GROUP BY p.seq
+            ORDER BY matched DESC, score DESC
+            LIMIT ?
+            """,
+            params + [avg_length or 1.0, limit],
+        ).fetchall()
+        if not rows:
+            return []
+
+        by_seq = {
+            row["seq"]: row
+            for row in conn.execute(
+                f"SELECT seq, record_id, date, department, summary_preview, clean_text "
+                f"FROM records WHERE seq IN ({','.join('?' * len(rows))})",
+                [row["seq"] for row in rows],
+            )
+        }
+        results = []
+        for row in rows:
+            record = by_seq.get(row["seq"])
+            if record is None:
+                continue
+            results.append({
+                "record_id": record["record_id"],
+                "date": record["date"],
+                "department": record["department"],
+                "summary_preview": record["summary_preview"],
+                "snippet": _snippet(record["clean_text"], query),
+                "score": round(row["score"], 4),
+            })
+        return results
+
+
+def _row_record(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "clean_text": row["clean_text"],
+        "summary": json.loads(row["summary"]),
+        "terms": json.loads(row["terms"]),
+    }
+
+
+_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> SearchIndex:
+    global _index
+    if _index is None:
+        _index = SearchIndex(get_database())
+    return _index
@@ -0,0 +1,59 @@
+import gzip
+import json
+
+from app.storage.bulk import NdjsonDecoder, gzip_stream, iter_export
+from app.storage.repositories import QuestionRepository, RecordRepository
+
+
+def _decode(chunks):
+    decoder = NdjsonDecoder()
+    items = []
+    for chunk in chunks:
+        items.extend(decoder.feed(chunk))
+    return items + decoder.close()
+
+
+def _split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+BODY = '{"a": 1}\n\nnot json\n[1, 2]\n{"b": "한글"}'.encode("utf-8")
+EXPECTED = [(1, {"a": 1}), (3, None), (4, None), (5, {"b": "한글"})]
+
+
+def test_decoder_reports_line_numbers_for_any_chunking():
+    # 1바이트 조각은 한글 UTF-8 중간에서도 잘림
+    for size in (1, 2, 5, len(BODY)):
+        assert _decode(_split(BODY, size)) == EXPECTED
+
+
+def test_decoder_unpacks_gzip_body():
+    packed = gzip.compress(BODY)
+    for size in (1, 3, len(packed)):
+        assert _decode(_split(packed, size)) == EXPECTED
+
+
+def test_decoder_handles_trailing_newline_and_tiny_bodies():
+    assert _decode([b'{"a": 1}\n']) == [(1, {"a": 1})]
+    assert _decode([b"{"]) == [(1, None)]
+    assert _decode([]) == []
+
+
+def test_gzip_stream_round_trips():
+    chunks = [b"first\n", b"", "둘째\n".encode("utf-8")]
+    assert gzip.decompress(b"".join(gzip_stream(chunks))) == b"".join(chunks)
+
+
+def test_export_pages_include_linked_questions(db, make_record, make_question):
+    records, questions = RecordRepository(db), QuestionRepository(db)
+    records.insert_many([make_record(i) for i in range(1, 6)])
+    questions.insert_many([make_question(1, record_id="r1"), make_question(2, record_id="r3"), make_question(3)])
+
+    chunks = list(iter_export(records, questions, page_size=2))
+    assert len(chunks) == 3
+    lines = [json.loads(line) for line in b"".join(chunks).decode("utf-8").splitlines()]
+    assert [r["record_id"] for r in lines] == ["r1", "r2", "r3", "r4", "r5"]
+    assert [[q["question_id"] for q in r["questions"]] for r in lines] == [["q1"], [], ["q2"], [], []]
+
+    only = list(iter_export(records, questions, department="내과", page_size=2))
+    assert [json.loads(line)["record_id"] for line in b"".join(only).decode().splitlines()] == ["r1", "r3", "r5"]
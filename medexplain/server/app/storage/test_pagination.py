@@ -0,0 +1,93 @@
+import pytest
+
+from app.storage.repositories import QuestionRepository, RecordRepository, decode_cursor, encode_cursor
+
+
+def _walk(page_fn, limit, **filters):
+    pages, after = [], None
+    while True:
+        items, after = page_fn(limit=limit, after_seq=after, **filters)
+        pages.append(items)
+        if after is None:
+            return pages
+
+
+def test_cursor_round_trip_and_invalid_values():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert encode_cursor(None) is None
+    assert decode_cursor(None) is None and decode_cursor("") is None
+    for bad in ("abc", "-1", "1.5", "0x10"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_pages_cover_everything_once_in_order(db, make_record):
+    repo = RecordRepository(db)
+    repo.insert_many(make_record(i) for i in range(1, 11))
+
+    pages = _walk(repo.list_page, 3)
+    assert [len(p) for p in pages] == [3, 3, 3, 1]
+    assert [r["record_id"] for p in pages for r in p] == [f"r{i}" for i in range(1, 11)]
+    # 목록에는 본문이 없음
+    assert set(pages[0][0]) == {"record_id", "date", "department", "summary_preview"}
+    assert pages[0][0]["summary_preview"] == "요약 1"
+
+
+def test_exact_multiple_of_limit_has_no_empty_last_page(db, make_record):
+    repo = RecordRepository(db)
+    repo.insert_many(make_record(i) for i in range(1, 7))
+    assert [len(p) for p in _walk(repo.list_page, 3)] == [3, 3]
+    assert repo.list_page(limit=3, after_seq=None) == repo.list_page(limit=3)
+
+
+def test_filters_apply_across_pages(db, make_record):
+    repo = RecordRepository(db)
+    repo.insert_many(make_record(i) for i in range(1, 11))
+    pages = _walk(repo.list_page, 2, department="내과", date_from="2026-01-03", date_to="2026-01-09")
+    assert [r["record_id"] for p in pages for r in p] == ["r3", "r5", "r7", "r9"]
+
+
+def test_rows_inserted_during_paging_are_not_skipped_or_repeated(db, make_record):
+    repo = RecordRepository(db)
+    repo.insert_many(make_record(i) for i in range(1, 5))
+    first, after = repo.list_page(limit=2)
+    repo.insert(make_record(5))
+    rest, _ = repo.list_page(limit=10, after_seq=after)
+    assert [r["record_id"] for r in first + rest] == ["r1", "r2", "r3", "r4", "r5"]
+
+
+def test_page_versions_and_export_follow_the_same_page(db, make_record):
+    repo = RecordRepository(db)
+    repo.insert_many(make_record(i) for i in range(1, 6))
+    versions, next_v = repo.page_versions(limit=2, after_seq=1)
+    exported, next_e = repo.export_page(limit=2, after_seq=1)
+    assert [seq for seq, _ in versions] == [2, 3] and next_v == next_e == 3
+    assert [r["record_id"] for r in exported] == ["r2", "r3"]
+    assert exported[0]["clean_text"] == make_record(2)["clean_text"]
+
+
+def test_question_pages(db, make_question):
+    repo = QuestionRepository(db)
+    repo.insert_many(make_question(i, "r1" if i % 2 else None) for i in range(1, 8))
+    pages = _walk(repo.list_page, 2, record_id="r1")
+    assert [q["question_id"] for p in pages for q in p] == ["q1", "q3", "q5", "q7"]
+    assert pages[0][0]["ask_doctor_count"] == 2
+    seqs, _ = repo.page_seqs(limit=2, record_id="r1")
+    assert seqs == [1, 3]
+
+
+def test_list_routes_chain_cursors_and_reject_bad_cursor(client, db, make_record):
+    RecordRepository(db).insert_many(make_record(i) for i in range(1, 6))
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/records", params=params).json()
+        seen += [r["record_id"] for r in body["records"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"r{i}" for i in range(1, 6)]
+    assert client.get("/records", params={"cursor": "abc"}).status_code == 400
+    assert client.get("/questions", params={"cursor": "-3"}).status_code == 400
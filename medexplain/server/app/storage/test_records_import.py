@@ -0,0 +1,106 @@
+import gzip
+import json
+
+from app.routes import records as records_route
+from app.storage.repositories import QuestionRepository, RecordRepository
+
+
+def _ndjson(items):
+    return ("\n".join(json.dumps(item, ensure_ascii=False) for item in items) + "\n").encode("utf-8")
+
+
+def _item(i, **overrides):
+    item = {
+        "record_id": f"r{i}",
+        "date": "2026-01-01",
+        "department": "내과",
+        "clean_text": f"{i}번 기록",
+        "summary": [f"요약 {i}"],
+        "terms": [],
+        "questions": [{"raw_text": f"{i}번 질문", "created_at": "2026-01-02"}],
+    }
+    item.update(overrides)
+    return item
+
+
+def test_reimporting_the_same_file_adds_nothing(client, db):
+    body = _ndjson([_item(1), _item(2)])
+
+    first = client.post("/records/import", content=body).json()
+    assert first == {"records": 2, "questions": 2, "skipped": 0, "invalid_lines": []}
+
+    second = client.post("/records/import", content=body).json()
+    assert second == {"records": 0, "questions": 0, "skipped": 2, "invalid_lines": []}
+    assert QuestionRepository(db).count() == 2
+
+
+def test_questions_without_id_get_stable_ids():
+    item = _item(1, questions=[
+        {"raw_text": "  같은 질문 ", "created_at": "2026-01-02"},
+        {"raw_text": "같은 질문", "created_at": "2026-01-03"},
+        {"raw_text": "   "},
+        "문자열은 무시",
+        {"raw_text": "id 있음", "question_id": "q-keep"},
+    ])
+    first = records_route._questions_from_import(item, "r1")
+    again = records_route._questions_from_import(item, "r1")
+    other_record = records_route._questions_from_import(item, "r2")
+
+    assert [q["question_id"] for q in first] == [q["question_id"] for q in again]
+    assert first[0]["question_id"] != first[1]["question_id"]
+    assert first[0]["question_id"] != other_record[0]["question_id"]
+    assert first[0]["raw_text"] == "같은 질문"
+    assert first[2]["question_id"] == "q-keep"
+    assert len(first) == 3
+
+
+def test_gzip_body_with_invalid_lines(client, db):
+    body = _ndjson([_item(1)]) + b"not json\n" + _ndjson([_item(2, clean_text="  ")]) + _ndjson([_item(3)])
+
+    result = client.post("/records/import", content=gzip.compress(body)).json()
+    assert result == {"records": 2, "questions": 2, "skipped": 0, "invalid_lines": [2, 3]}
+    assert RecordRepository(db).get("r3")["summary"] == ["요약 3"]
+
+
+def test_corrupt_gzip_is_rejected(client):
+    header = gzip.compress(b"")[:10]
+    assert client.post("/records/import", content=header + b"\xff" * 40).status_code == 400
+
+
+def test_import_is_written_in_batches(client, db, monkeypatch):
+    monkeypatch.setattr(records_route, "IMPORT_BATCH_SIZE", 2)
+    result = client.post("/records/import", content=_ndjson([_item(i) for i in range(1, 6)])).json()
+    assert result["records"] == 5 and result["questions"] == 5
+
+
+def test_export_then_import_into_an_empty_store(client, db):
+    client.post("/records/import", content=_ndjson([_item(1), _item(2)]))
+    exported = client.get("/records/export", params={"gzip": True}).content
+
+    with db.transaction() as conn:
+        for table in ("questions", "records", "search_postings", "search_docs"):
+            conn.execute(f"DELETE FROM {table}")
+    result = client.post("/records/import", content=exported).json()
+    assert result == {"records": 2, "questions": 2, "skipped": 0, "invalid_lines": []}
+    assert [q["raw_text"] for q in QuestionRepository(db).list_all()] == ["1번 질문", "2번 질문"]
+
+
+def test_records_without_id_are_not_duplicated_on_reimport(client, db):
+    first, second = _item(1), _item(2)
+    del first["record_id"], second["record_id"]
+    body = _ndjson([first, second])
+
+    assert client.post("/records/import", content=body).json()["records"] == 2
+    again = client.post("/records/import", content=body).json()
+    assert again == {"records": 0, "questions": 0, "skipped": 2, "invalid_lines": []}
+    assert RecordRepository(db).count() == 2
+    assert QuestionRepository(db).count() == 2
+
+
+def test_record_ids_follow_content():
+    item = _item(1)
+    del item["record_id"]
+    same = records_route._record_from_import(dict(item, clean_text="  1번 기록 "))
+    assert records_route._record_from_import(item)["record_id"] == same["record_id"]
+    assert records_route._record_from_import(dict(item, department="외과"))["record_id"] != same["record_id"]
+    assert records_route._record_from_import(dict(item, record_id="keep"))["record_id"] == "keep"
@@ -0,0 +1,109 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.storage.database import Database
+from app.storage.importer import import_json
+from app.storage.repositories import QuestionRepository, RecordRepository
+
+
+def test_record_round_trip_and_duplicate_ids(db, make_record):
+    repo = RecordRepository(db)
+    assert repo.insert_many([make_record(1), make_record(2), make_record(1, clean_text="덮어쓰기 아님")]) == 2
+    assert repo.get("r1") == make_record(1)
+    assert repo.get("missing") is None
+    assert repo.count() == 2
+    assert [r["record_id"] for r in repo.list_by_department("외과")] == ["r2"]
+    assert [r["record_id"] for r in repo.list_by_date("2026-01-01")] == ["r1"]
+
+
+def test_update_analysis_bumps_version(db, make_record):
+    repo = RecordRepository(db)
+    repo.insert(make_record(1))
+    seq, version = repo.get_version("r1")
+    assert repo.update_analysis("r1", ["새 요약"], [])
+    assert repo.get_version("r1") == (seq, version + 1)
+    assert repo.get("r1")["summary"] == ["새 요약"]
+    assert not repo.update_analysis("missing", [], [])
+
+
+def test_questions_grouped_by_record(db, make_question):
+    repo = QuestionRepository(db)
+    assert repo.insert_many([make_question(1, "r1"), make_question(2, "r2"), make_question(3, "r1"), make_question(1)]) == 3
+    grouped = repo.list_by_records(["r1", "r2", "r9"])
+    assert [q["question_id"] for q in grouped["r1"]] == ["q1", "q3"]
+    assert grouped["r9"] == []
+    assert repo.list_by_records([]) == {}
+    assert repo.get("q2")["ask_doctor"] == ["질문 2?", "또?"]
+
+
+def test_failed_transaction_rolls_back_including_joined_inner(db, make_record):
+    repo = RecordRepository(db)
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            repo.insert(make_record(1))  # 바깥 transaction에 합류
+            raise RuntimeError("boom")
+    assert repo.count() == 0
+    assert db.connection().execute("SELECT COUNT(*) FROM search_docs").fetchone()[0] == 0
+
+
+def test_instance_id_is_stable_per_file(tmp_path):
+    path = tmp_path / "a.sqlite3"
+    first = Database(path).instance_id
+    assert Database(path).instance_id == first
+    assert Database(tmp_path / "b.sqlite3").instance_id != first
+
+
+def test_old_schema_gets_new_columns_backfilled(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        """
+        CREATE TABLE records (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, record_id TEXT NOT NULL UNIQUE, date TEXT NOT NULL,
+            department TEXT NOT NULL, clean_text TEXT NOT NULL, summary TEXT NOT NULL, terms TEXT NOT NULL
+        );
+        CREATE TABLE questions (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, question_id TEXT NOT NULL UNIQUE, created_at TEXT NOT NULL,
+            raw_text TEXT NOT NULL, general_info TEXT NOT NULL, ask_doctor TEXT NOT NULL, caution TEXT NOT NULL,
+            record_id TEXT
+        );
+        CREATE TABLE reprocess_state (
+            record_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, processed_at TEXT NOT NULL
+        );
+        INSERT INTO reprocess_state VALUES ('r1', 'abc', '2026-01-01');
+        INSERT INTO records (record_id, date, department, clean_text, summary, terms)
+            VALUES ('r1', '2026-01-01', '내과', '본문', '["첫 줄", "둘째 줄"]', '[]');
+        INSERT INTO questions (question_id, created_at, raw_text, general_info, ask_doctor, caution)
+            VALUES ('q1', '2026-01-01', '질문', '[]', '["a?", "b?", "c?"]', '[]');
+        """
+    )
+    conn.close()
+
+    db = Database(path)
+    row = db.connection().execute("SELECT summary_preview, version FROM records").fetchone()
+    assert tuple(row) == ("첫 줄", 1)
+    assert db.connection().execute("SELECT ask_doctor_count FROM questions").fetchone()[0] == 3
+    assert db.connection().execute("SELECT error FROM reprocess_state").fetchone()[0] is None
+
+
+def test_import_json_once_then_skips(db, tmp_path, make_record, make_question):
+    records_path = tmp_path / "records.json"
+    questions_path = tmp_path / "questions.json"
+    records_path.write_text(json.dumps([make_record(1), {"no": "id"}], ensure_ascii=False), encoding="utf-8")
+    questions_path.write_text(json.dumps([make_question(1, "r1")], ensure_ascii=False), encoding="utf-8")
+
+    result = import_json(db, records_path=records_path, questions_path=questions_path)
+    assert result == {"skipped": False, "records": 1, "questions": 1}
+    assert import_json(db, records_path=records_path, questions_path=questions_path) == {"skipped": True}
+
+    # force로 다시 돌려도 있는 id는 그대로
+    import_json(db, records_path=records_path, questions_path=questions_path, force=True)
+    assert RecordRepository(db).count() == 1
+    assert QuestionRepository(db).count() == 1
+
+
+def test_import_without_files(db, tmp_path):
+    result = import_json(db, records_path=tmp_path / "none.json", questions_path=tmp_path / "none2.json")
+    assert result == {"skipped": False, "records": 0, "questions": 0}
@@ -0,0 +1,102 @@
+from app.storage import search as search_module
+from app.storage.repositories import RecordRepository
+from app.storage.search import SearchIndex, _snippet, tokenize
+
+
+def _rec(i, text, summary=(), terms=()):
+    return {
+        "record_id": f"r{i}",
+        "date": "2026-01-01",
+        "department": "내과",
+        "clean_text": text,
+        "summary": list(summary),
+        "terms": [{"term": t, "description": "-"} for t in terms],
+    }
+
+
+def _ids(results):
+    return [r["record_id"] for r in results]
+
+
+def test_tokenize_hangul_bigrams_and_latin_words():
+    assert tokenize("혈압약을 CRP-high 38.5 위") == ["혈압", "압약", "약을", "crp-high", "38.5", "위"]
+    assert tokenize("") == []
+
+
+def test_particles_do_not_block_matches(db):
+    repo = RecordRepository(db)
+    repo.insert_many([
+        _rec(1, "CRP가 높게 나왔어요"),
+        _rec(2, "혈압약을 바꿔 드릴게요"),
+    ])
+    index = SearchIndex(db)
+    assert _ids(index.search("crp")) == ["r1"]
+    assert _ids(index.search("혈압약")) == ["r2"]
+    assert index.search("없는말") == []
+    assert index.search("   ") == []
+
+
+def test_terms_and_summary_outweigh_body(db):
+    repo = RecordRepository(db)
+    repo.insert_many([
+        _rec(1, "위내시경 이야기가 잠깐 나왔습니다 오늘은 다른 얘기를 주로 했습니다"),
+        _rec(2, "다음 주 예약입니다", summary=["위내시경 예약"], terms=["위내시경"]),
+        _rec(3, "감기약 처방"),
+    ])
+    assert _ids(SearchIndex(db).search("위내시경")) == ["r2", "r1"]
+
+
+def test_documents_matching_more_query_tokens_rank_first(db):
+    repo = RecordRepository(db)
+    repo.insert_many([
+        _rec(1, "CRP CRP CRP CRP 수치"),
+        _rec(2, "CRP 그리고 MRI 결과"),
+        *(_rec(i, "감기") for i in range(3, 6)),
+    ])
+    assert _ids(SearchIndex(db).search("CRP MRI")) == ["r2", "r1"]
+
+
+def test_common_tokens_are_dropped_when_rarer_ones_exist(db):
+    repo = RecordRepository(db)
+    repo.insert_many([
+        _rec(1, "CRP 수치"),
+        _rec(2, "CRP 그리고 MRI 결과"),
+        _rec(3, "CRP 다시"),
+    ])
+    # crp는 문서 절반 넘게 나오므로 mri로만 찾음
+    assert _ids(SearchIndex(db).search("CRP MRI")) == ["r2"]
+    # 드문 토큰이 없으면 흔한 토큰으로라도 찾음
+    assert sorted(_ids(SearchIndex(db).search("CRP"))) == ["r1", "r2", "r3"]
+
+
+def test_update_reindexes_and_rebuild_matches(db):
+    repo = RecordRepository(db)
+    repo.insert(_rec(1, "감기약 처방"))
+    index = SearchIndex(db)
+    repo.update_analysis("r1", ["위내시경 예약"], [])
+    assert _ids(index.search("위내시경")) == ["r1"]
+
+    before = index.search("위내시경 감기")
+    assert index.rebuild() == 1
+    assert index.search("위내시경 감기") == before
+
+
+def test_ensure_built_rebuilds_on_version_change(db, monkeypatch):
+    RecordRepository(db).insert(_rec(1, "CRP 수치"))
+    index = SearchIndex(db)
+    index.ensure_built()
+    db.connection().execute("DELETE FROM search_postings")
+    index.ensure_built()  # 버전이 같으면 그대로
+    assert index.search("crp") == []
+
+    monkeypatch.setattr(search_module, "INDEX_VERSION", "test-next")
+    index.ensure_built()
+    assert _ids(index.search("crp")) == ["r1"]
+
+
+def test_snippet_centers_on_query_word():
+    text = "가" * 100 + " CRP 수치 " + "나" * 100
+    snippet = _snippet(text, "crp")
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "CRP" in snippet
+    assert _snippet("짧은 본문", "없음") == "짧은 본문"
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from app.storage.writer import GroupCommitWriter
+
+
+def _put(db, key, value):
+    def fn():
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, value))
+        return key
+    return fn
+
+
+def _blocked_writer(db):
+    """첫 작업이 gate를 기다리는 동안 뒤 작업들이 쌓이게 한다."""
+    writer = GroupCommitWriter(db)
+    gate = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        gate.wait(5)
+        return "held"
+
+    first = writer.submit(hold)
+    started.wait(5)
+    return writer, gate, first
+
+
+def test_queued_writes_share_one_commit(db):
+    writer, gate, first = _blocked_writer(db)
+    futures = [writer.submit(_put(db, f"k{i}", str(i))) for i in range(5)]
+    gate.set()
+
+    assert first.result(5) == "held"
+    assert [f.result(5) for f in futures] == [f"k{i}" for i in range(5)]
+    writer.close()
+
+    stats = writer.stats()
+    assert stats["writes"] == 6
+    assert stats["commits"] == 2
+    assert stats["max_batch"] == 5
+    assert stats["avg_batch"] == 3.0
+    assert db.get_meta("k4") == "4"
+
+
+def test_failing_write_does_not_undo_its_neighbours(db):
+    writer, gate, _ = _blocked_writer(db)
+
+    def half_then_fail():
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO meta (key, value) VALUES ('partial', 'x')")
+        raise ValueError("boom")
+
+    before = writer.submit(_put(db, "before", "1"))
+    bad = writer.submit(half_then_fail)
+    duplicate = writer.submit(_put(db, "before", "2"))  # PRIMARY KEY 위반
+    after = writer.submit(_put(db, "after", "3"))
+    gate.set()
+
+    assert before.result(5) == "before"
+    assert after.result(5) == "after"
+    with pytest.raises(ValueError):
+        bad.result(5)
+    with pytest.raises(Exception):
+        duplicate.result(5)
+    writer.close()
+
+    assert db.get_meta("before") == "1"
+    assert db.get_meta("after") == "3"
+    # 실패한 작업이 쓴 것만 되돌려짐
+    assert db.get_meta("partial") is None
+    stats = writer.stats()
+    assert stats["failed"] == 2 and stats["commits"] == 2
+
+
+def test_write_returns_after_commit_and_is_visible_to_other_connections(db):
+    writer = GroupCommitWriter(db)
+    assert writer.write(_put(db, "seen", "yes")) == "seen"
+
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(db.get_meta("seen")))
+    reader.start()
+    reader.join()
+    writer.close()
+    assert seen == ["yes"]
+
+
+def test_close_drains_already_submitted_work(db):
+    writer, gate, _ = _blocked_writer(db)
+    futures = [writer.submit(_put(db, f"d{i}", str(i))) for i in range(3)]
+    threading.Timer(0.05, gate.set).start()
+    writer.close()
+
+    assert all(f.done() for f in futures)
+    assert [db.get_meta(f"d{i}") for i in range(3)] == ["0", "1", "2"]
+
+
+def test_max_batch_splits_large_backlog(db):
+    writer = GroupCommitWriter(db, max_batch=2)
+    gate = threading.Event()
+    started = threading.Event()
+    writer.submit(lambda: (started.set(), gate.wait(5)))
+    started.wait(5)
+    futures = [writer.submit(_put(db, f"m{i}", str(i))) for i in range(5)]
+    gate.set()
+    for f in futures:
+        f.result(5)
+    writer.close()
+
+    stats = writer.stats()
+    assert stats["max_batch"] == 2
+    assert stats["commits"] == 4
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.storage.database import Database, get_database
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    저장 요청을 모아서 한 번에 commit하는 쓰기 전용 스레드.
+    - 요청 스레드는 write()로 작업을 넘기고 commit이 끝날 때까지 기다린다
+      (돌아왔으면 WAL에 fsync까지 된 상태, synchronous=FULL)
+    - 동시에 들어온 저장들은 transaction 하나, fsync 한 번으로 묶임
+    - 작업마다 SAVEPOINT라 하나가 실패해도 나머지는 저장됨
+    쓰는 연결이 하나뿐이라 요청끼리 쓰기 잠금을 두고 다투지 않는다.
+    max_wait_ms=0이면 기다리지 않고 앞 commit(fsync) 동안 쌓인 것만 묶는다
+    (한가할 때 지연이 늘지 않음).
+    """
+
+    def __init__(self, db: Database, *, max_batch: int = 64, max_wait_ms: float = 0.0):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._stats = {"writes": 0, "commits": 0, "failed": 0, "max_batch": 0}
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        future: Future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def write(self, fn: Callable[[], Any]) -> Any:
+        """fn을 쓰기 스레드의 transaction 안에서 실행하고, commit 후 결과를 돌려준다."""
+        return self.submit(fn).result()
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["avg_batch"] = round(stats["writes"] / stats["commits"], 2) if stats["commits"] else 0.0
+        return stats
+
+    def close(self, timeout: float = 5.0) -> None:
+        # 이미 받은 작업은 다 쓰고 멈춤
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self, first: Tuple) -> Tuple[List[Tuple], bool]:
+        batch = [first]
+        stop = False
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _commit(self, batch: List[Tuple]) -> None:
+        conn = self.db.connection()
+        results = []
+        try:
+            with self.db.transaction():
+                for i, (fn, _) in enumerate(batch):
+                    conn.execute(f"SAVEPOINT w{i}")
+                    try:
+                        results.append((True, fn()))
+                        conn.execute(f"RELEASE w{i}")
+                    except Exception as e:
+                        conn.execute(f"ROLLBACK TO w{i}")
+                        conn.execute(f"RELEASE w{i}")
+                        results.append((False, e))
+        except Exception as e:
+            # commit 자체가 실패하면 묶인 작업 전부 실패
+            print(f"[storage] group commit failed size={len(batch)}: {e}")
+            self._stats["failed"] += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self._stats["writes"] += len(batch)
+        self._stats["commits"] += 1
+        self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+        for (ok, value), (_, future) in zip(results, batch):
+            if ok:
+                future.set_result(value)
+            else:
+                self._stats["failed"] += 1
+                future.set_exception(value)
+
+    def _run(self) -> None:
+        # 이 스레드의 연결만 commit마다 fsync
+        self.db.connection().execute("PRAGMA synchronous=FULL")
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(first)
+            self._commit(batch)
+            if stop:
+                return
+
+
+_writer: Optional[GroupCommitWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> GroupCommitWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = GroupCommitWriter(
+                    get_database(),
+                    max_batch=int(os.getenv("DB_GROUP_COMMIT_MAX_BATCH", "64")),
+                    max_wait_ms=float(os.getenv("DB_GROUP_COMMIT_MAX_WAIT_MS", "0")),
+                )
+    return _writer
+
+
+def close_writer() -> None:
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
@@ -12,6 +12,8 @@ from typing import Callable, Optional
 
 from google.cloud import speech_v1 as speech
 
+from app.services.glossary import get_glossary
+
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"C:\Users\82107\Downloads\medexplain-stt-13e7cf056287.json"
 
 
@@ -43,16 +45,8 @@ def wav_bytes_to_pcm16(raw_wav: bytes) -> tuple[bytes, AudioFormat]:
 
 
 def _medical_phrase_hints() -> list[str]:
-    return [
-        "CRP", "CBC", "CT", "MRI", "PET-CT", "PET CT",
-        "biopsy", "endoscopy", "gastroscopy", "gastrectomy",
-        "chemotherapy", "radiotherapy", "adenocarcinoma",
-        "gastric adenocarcinoma", "carcinoma", "metastasis",
-        "lymph node", "lymph nodes", "lymphatic invasion",
-        "cancer", "stomach cancer",
-        "위선암", "위암", "조직 검사", "내시경", "항암화학요법",
-        "방사선 치료", "림프절",
-    ]
+    # 용어 사전(glossary.json)의 대표 용어 + 별칭
+    return get_glossary().phrase_hints()
 
 
 def _build_recognition_config(sample_rate: int, channels: int) -> speech.RecognitionConfig:
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app import reprocess
+from app.storage.repositories import RecordRepository
+
+
+def _record(i):
+    return {
+        "record_id": f"r{i}",
+        "date": "2026-01-01",
+        "department": "내과",
+        "clean_text": f"{i}번 기록입니다.",
+        "summary": ["예전 요약"],
+        "terms": [],
+    }
+
+
+@pytest.fixture
+def records(db, no_llm):
+    repo = RecordRepository(db)
+    repo.insert_many([_record(i) for i in range(1, 6)])
+    return repo
+
+
+@pytest.fixture
+def failing(monkeypatch):
+    """failing.add("2번")처럼 넣은 말이 들어간 기록은 처리 중 실패."""
+    broken = set()
+
+    async def process(text, tier):
+        if any(word in text for word in broken):
+            raise RuntimeError("llm down")
+        return [f"새 요약 {text}"], [{"term": "CRP", "description": "염증 수치"}]
+
+    monkeypatch.setattr(reprocess, "_process_llm", process)
+    return broken
+
+
+def _run(**options):
+    params = dict(tier="llm", local=False, processes=1, concurrency=2, page_size=2,
+                  restart=False, force=False, limit=None)
+    params.update(options)
+    return asyncio.run(reprocess.run(**params))
+
+
+def _state(db, record_id):
+    row = db.connection().execute(
+        "SELECT fingerprint, error FROM reprocess_state WHERE record_id = ?", (record_id,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def _checkpoint(db):
+    rows = db.connection().execute("SELECT value FROM meta WHERE key LIKE 'reprocess_checkpoint:%'").fetchall()
+    return [int(row[0]) for row in rows]
+
+
+def test_failed_record_is_kept_aside_and_checkpoint_moves_on(db, records, failing):
+    failing.add("2번")
+    totals = _run()
+
+    assert totals["updated"] == 4 and totals["failed"] == 1
+    assert _checkpoint(db) == [5]
+    assert "llm down" in _state(db, "r2")["error"]
+    assert _state(db, "r3")["error"] is None
+    assert records.get("r2")["summary"] == ["예전 요약"]
+    assert records.get("r3")["summary"] == ["새 요약 3번 기록입니다."]
+    assert records.get("r3")["terms"][0]["easy"] == "염증 수치"
+
+
+def test_next_run_retries_only_failed_records(db, records, failing):
+    failing.add("2번")
+    _run()
+    failing.clear()
+
+    totals = _run()
+    assert totals["retried"] == 1 and totals["updated"] == 1 and totals["seen"] == 1
+    assert _state(db, "r2")["error"] is None
+    assert records.get("r2")["summary"] == ["새 요약 2번 기록입니다."]
+    assert _checkpoint(db) == [5]
+
+
+def test_record_failing_again_keeps_its_error(db, records, failing):
+    failing.add("2번")
+    _run()
+    totals = _run()
+    assert totals["retried"] == 1 and totals["failed"] == 1
+    assert _state(db, "r2")["error"] is not None
+
+
+def test_new_records_after_checkpoint_are_picked_up(db, records, failing):
+    _run()
+    records.insert(_record(6))
+    totals = _run()
+    assert totals["seen"] == 1 and totals["updated"] == 1
+    assert _checkpoint(db) == [6]
+
+
+def test_restart_skips_unchanged_and_force_redoes_everything(db, records, failing):
+    _run()
+    assert _run(restart=True)["skipped"] == 5
+    assert _run(restart=True, force=True)["updated"] == 5
+
+
+def test_local_mode_uses_public_local_helpers(db, records):
+    summary, terms = reprocess._process_local("CRP 수치가 높습니다. 다음 주에 다시 봅니다.")
+    assert summary
+    assert "CRP" in [t["term"] for t in terms]
@@ -4,14 +4,36 @@ import asyncio
 import base64
 import json
 import traceback
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Dict, List, Optional
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from app.routes.session import end_session
+from app.services.rolling_summary import RollingSummarizer
+from app.services.speculative_translation import SpeculativeTranslator
+from app.services.stt_sessions import get_session_manager
+from app.services.translation import TranslationResult, get_translation_service
+from app.services.unknown_terms import detect_unknown_terms
 from app.stt_google_streaming import GoogleStreamingSttBridge
 
 RECORD_THEN_SEND = True
 
+# streaming 모드에서 안정된 interim prefix를 final 전에 미리 번역
+SPECULATIVE_TRANSLATION = True
+
+TRANSLATION_TARGETS = ("en", "zh")
+
+# 진행 중 요약: final N개마다 또는 T초마다 갱신해서 "summary" 이벤트로 보냄
+ROLLING_SUMMARY = True
+ROLLING_SUMMARY_EVERY_SEGMENTS = 5
+ROLLING_SUMMARY_EVERY_SECONDS = 60.0
+
+# session.end에서 서버에 모아 둔 전사문으로 분석 후 기록 저장 (record_id를 session.ended로 보냄)
+SAVE_RECORD_ON_SESSION_END = True
+
+# main.py의 세션 정리 루프가 같은 인스턴스를 씀
+session_manager = get_session_manager()
+
 
 async def _send_text(ws: WebSocket, text: str) -> None:
     await ws.send_text(text)
@@ -29,18 +51,13 @@ def _b64_to_bytes(b64: str) -> bytes:
     return base64.b64decode(b64)
 
 
-def _translate_text_mock(text: str, target_lang: str) -> str:
-    text = (text or "").strip()
-
-    if not text:
-        return text
-
-    if target_lang == "en":
-        return f"[EN] {text}"
-    if target_lang == "zh":
-        return f"[ZH] {text}"
-
-    return text
+async def _translate_targets(text: str) -> Dict[str, TranslationResult]:
+    # 원문 하나를 모든 target으로 한 번에 번역 (캐시 적중 시 backend 호출 없음)
+    return await get_translation_service().translate(
+        text,
+        source_lang="ko",
+        target_langs=TRANSLATION_TARGETS,
+    )
 
 
 def _make_stt_event(session_id: str, text: str, is_final: bool) -> str:
@@ -62,6 +79,7 @@ def _make_translation_event(
     translated_text: str,
     ok: bool,
     reason: Optional[str] = None,
+    is_final: bool = True,
 ) -> str:
     payload = {
         "type": "translate",
@@ -72,6 +90,7 @@ def _make_translation_event(
         "needsConfirm": not ok,
         "sourceLang": source_lang,
         "sttText": stt_text,
+        "isFinal": bool(is_final),
     }
 
     if reason is not None:
@@ -80,6 +99,34 @@ def _make_translation_event(
     return json.dumps(payload, ensure_ascii=False)
 
 
+def _make_terms_event(session_id: str, stt_text: str, terms_unknown: list) -> str:
+    payload = {
+        "type": "terms",
+        "session_id": session_id,
+        "ts": 0,
+        "sttText": stt_text,
+        "terms_unknown": terms_unknown,
+    }
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def _make_summary_event(
+    session_id: str,
+    summary: List[str],
+    segment_count: int,
+    is_final: bool = False,
+) -> str:
+    payload = {
+        "type": "summary",
+        "session_id": session_id,
+        "ts": 0,
+        "summary": summary,
+        "segmentCount": segment_count,
+        "isFinal": bool(is_final),
+    }
+    return json.dumps(payload, ensure_ascii=False)
+
+
 def _make_warning_event(session_id: str, message: str) -> str:
     payload = {
         "type": "warning",
@@ -122,37 +169,86 @@ async def ws_stt_endpoint(websocket: WebSocket) -> None:
         except Exception as e:
             print("[ws] push_stt failed:", e)
 
-    async def push_translation(stt_text: str, target_lang: str) -> None:
+    async def push_translation(stt_text: str, pending: Awaitable[Dict[str, TranslationResult]]) -> None:
         try:
-            translated_text = _translate_text_mock(stt_text, target_lang)
-
-            msg = _make_translation_event(
-                session_id=current_session_id,
-                source_lang="ko",
-                target_lang=target_lang,
-                stt_text=stt_text,
-                translated_text=translated_text,
-                ok=True,
-            )
-            await _send_text(websocket, msg)
-            print(f"[ws] pushed translation target={target_lang} text={translated_text!r}")
-
+            translations = await pending
         except Exception as e:
             print("[ws] push_translation failed:", e)
+            translations = {}
 
+        for target_lang in TRANSLATION_TARGETS:
+            result = translations.get(target_lang)
             try:
-                fail_msg = _make_translation_event(
+                if result is None:
+                    raise RuntimeError(f"no translation for target={target_lang}")
+
+                msg = _make_translation_event(
                     session_id=current_session_id,
                     source_lang="ko",
                     target_lang=target_lang,
                     stt_text=stt_text,
-                    translated_text=stt_text,
-                    ok=False,
-                    reason="translation_failed",
+                    translated_text=result.text,
+                    ok=result.ok,
+                    reason=result.reason,
                 )
-                await _send_text(websocket, fail_msg)
-            except Exception as inner_e:
-                print("[ws] push_translation fallback failed:", inner_e)
+                await _send_text(websocket, msg)
+                print(f"[ws] pushed translation target={target_lang} text={result.text!r}")
+
+            except Exception as e:
+                print("[ws] push_translation failed:", e)
+
+                try:
+                    fail_msg = _make_translation_event(
+                        session_id=current_session_id,
+                        source_lang="ko",
+                        target_lang=target_lang,
+                        stt_text=stt_text,
+                        translated_text=stt_text,
+                        ok=False,
+                        reason="translation_failed",
+                    )
+                    await _send_text(websocket, fail_msg)
+                except Exception as inner_e:
+                    print("[ws] push_translation fallback failed:", inner_e)
+
+    async def push_translation_preview(prefix: str, translations: Dict[str, TranslationResult]) -> None:
+        # 추측 번역: isFinal=false로만 보내고, final 번역은 따로 보낸다
+        try:
+            for target_lang, result in translations.items():
+                if not result.ok:
+                    continue
+                msg = _make_translation_event(
+                    session_id=current_session_id,
+                    source_lang="ko",
+                    target_lang=target_lang,
+                    stt_text=prefix,
+                    translated_text=result.text,
+                    ok=True,
+                    is_final=False,
+                )
+                await _send_text(websocket, msg)
+            print(f"[ws] pushed translation preview prefix={prefix!r}")
+        except Exception as e:
+            print("[ws] push_translation_preview failed:", e)
+
+    async def push_unknown_terms(stt_text: str) -> None:
+        # 사전에 없는 용어 후보를 "확인 필요"로 표시 (LLM 호출 없음)
+        try:
+            terms_unknown = detect_unknown_terms(stt_text)
+            if not terms_unknown:
+                return
+            await _send_text(websocket, _make_terms_event(current_session_id, stt_text, terms_unknown))
+            print(f"[ws] pushed terms_unknown={[t['term'] for t in terms_unknown]}")
+        except Exception as e:
+            print("[ws] push_unknown_terms failed:", e)
+
+    async def push_summary(summary: List[str], segment_count: int, is_final: bool = False) -> None:
+        try:
+            msg = _make_summary_event(current_session_id, summary, segment_count, is_final)
+            await _send_text(websocket, msg)
+            print(f"[ws] pushed summary final={is_final} segments={segment_count}")
+        except Exception as e:
+            print("[ws] push_summary failed:", e)
 
     async def push_warning(message: str) -> None:
         try:
@@ -168,6 +264,31 @@ async def ws_stt_endpoint(websocket: WebSocket) -> None:
         except Exception as e:
             print(f"[ws] submit {label} failed:", e)
 
+    speculator: Optional[SpeculativeTranslator] = None
+    if SPECULATIVE_TRANSLATION:
+        speculator = SpeculativeTranslator(
+            _translate_targets,
+            loop=loop,
+            on_preview=lambda prefix, translations: submit_coro(
+                push_translation_preview(prefix, translations),
+                "push_translation_preview",
+            ),
+        )
+
+    rolling: Optional[RollingSummarizer] = None
+
+    def new_rolling_summarizer() -> Optional[RollingSummarizer]:
+        if not ROLLING_SUMMARY:
+            return None
+        return RollingSummarizer(
+            on_update=lambda summary, count: submit_coro(
+                push_summary(summary, count),
+                "push_summary",
+            ),
+            every_segments=ROLLING_SUMMARY_EVERY_SEGMENTS,
+            every_seconds=ROLLING_SUMMARY_EVERY_SECONDS,
+        )
+
     def on_result(text: str, is_final: bool) -> None:
         print(f"[gcp] result final={is_final} text={text!r}")
 
@@ -176,16 +297,30 @@ async def ws_stt_endpoint(websocket: WebSocket) -> None:
 
         # final인데 텍스트가 비어 있으면 warning 전송
         if is_final and _is_empty_stt_text(text):
+            if speculator:
+                speculator.close()
+            session_manager.add_warning(current_session_id, "음성이 인식되지 않은 구간이 있습니다.")
             submit_coro(
                 push_warning("음성이 인식되지 않았습니다. 다시 녹음해주세요."),
                 "push_warning",
             )
             return
 
-        # final이고 텍스트가 있으면 번역 진행
-        if is_final:
-            submit_coro(push_translation(text, "en"), "push_translation_en")
-            submit_coro(push_translation(text, "zh"), "push_translation_zh")
+        # interim이면 안정된 prefix만 미리 번역 (final로 보내지 않음)
+        if not is_final:
+            if speculator and not _is_empty_stt_text(text):
+                speculator.on_interim(text)
+            return
+
+        # 전사문은 서버에서 모음 (세션 끝에 분석/저장)
+        session_manager.add_final(current_session_id, text)
+
+        # final이고 텍스트가 있으면 번역 진행 (추측 번역이 맞으면 재사용)
+        pending = speculator.finalize(text) if speculator else _translate_targets(text)
+        submit_coro(push_translation(text, pending), "push_translation")
+        submit_coro(push_unknown_terms(text), "push_unknown_terms")
+        if rolling:
+            rolling.add_segment(text)
 
     def on_error(message: str) -> None:
         print(f"[gcp] ERROR {message}")
@@ -244,6 +379,13 @@ async def ws_stt_endpoint(websocket: WebSocket) -> None:
                 started_streaming = False
                 print("[ws] bridge prepared")
 
+                session_manager.start(current_session_id, department=msg.get("department") or "")
+
+                # 세션마다 요약을 새로 시작
+                if rolling:
+                    rolling.close()
+                rolling = new_rolling_summarizer()
+
                 if channels != 1:
                     await _send_text(
                         websocket,
@@ -262,6 +404,7 @@ async def ws_stt_endpoint(websocket: WebSocket) -> None:
                     )
                     continue
 
+                session_manager.touch(current_session_id)
                 b64 = msg.get("audioB64") or msg.get("audio_b64")
                 if not b64:
                     await _send_text(
@@ -310,16 +453,30 @@ async def ws_stt_endpoint(websocket: WebSocket) -> None:
                 print(f"[ws] session.end sid={current_session_id}")
                 if bridge:
                     bridge.stop()
-                await _send_text(
-                    websocket,
-                    json.dumps(
-                        {
-                            "type": "session.ended",
-                            "session_id": current_session_id,
-                        },
-                        ensure_ascii=False,
-                    ),
-                )
+
+                # 진행 중 요약에 남은 세그먼트만 반영하면 최종 요약 완성
+                final_summary = None
+                if rolling:
+                    final_summary = await rolling.finish()
+                    await push_summary(final_summary, len(rolling.segments), is_final=True)
+
+                ended = {
+                    "type": "session.ended",
+                    "session_id": current_session_id,
+                }
+                session = session_manager.get(current_session_id)
+                if SAVE_RECORD_ON_SESSION_END and session is not None:
+                    try:
+                        result = await end_session(session, summary=final_summary)
+                        ended["record_id"] = result["record_id"]
+                    except Exception as e:
+                        print("[ws] end_session failed:", e)
+                        await _send_text(
+                            websocket,
+                            _make_warning_event(current_session_id, "기록을 저장하지 못했습니다."),
+                        )
+
+                await _send_text(websocket, json.dumps(ended, ensure_ascii=False))
                 continue
 
             print("[ws] unknown type:", mtype)
@@ -335,6 +492,10 @@ async def ws_stt_endpoint(websocket: WebSocket) -> None:
                 bridge.stop()
         except Exception:
             pass
+        if speculator:
+            speculator.close()
+        if rolling:
+            rolling.close()
         try:
             await websocket.close()
         except Exception:
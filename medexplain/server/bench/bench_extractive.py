@@ -0,0 +1,93 @@
+"""
+로컬 추출 요약 벤치마크: 예전 규칙 요약(앞 3문장) vs 추출 요약 (TextRank, numpy 유무)
+
+분량별 합성 진료 전사로 요약 한 번에 걸리는 시간을 잰다.
+
+실행 (medexplain/server 에서):
+    python -m bench.bench_extractive --minutes 10 30 60
+"""
+import argparse
+import random
+import time
+
+from app.services import extractive_summary as ex
+from app.services.glossary import get_glossary
+
+_SENTENCES = [
+    "오늘 검사 결과 설명드릴게요",
+    "위내시경에서 위선암이 확인됐습니다",
+    "조직 검사 결과 림프관 침범은 없었어요",
+    "CRP 수치는 정상 범위입니다",
+    "다음 주에 CT 찍고 수술 일정을 잡겠습니다",
+    "네 그렇군요",
+    "식사는 죽으로 시작하시면 돼요",
+    "약은 하루 두 번 식후에 드세요",
+    "공복 혈당이 조금 높게 나왔어요",
+    "궁금한 점 있으시면 물어보세요",
+    "아 네 알겠습니다",
+    "항암화학요법은 수술 후에 다시 상의하겠습니다",
+]
+
+# 한국어 진료 대화는 대략 분당 1000자 안팎으로 전사된다
+_CHARS_PER_MINUTE = 1000
+
+
+_LEADS = ["", "그리고 ", "지난번에 말씀드린 대로 ", "일단 ", "보시면 ", "그래서 ", "혹시 "]
+
+
+def _make_transcript(minutes: int, rng: random.Random) -> str:
+    # 같은 문장이 반복되지 않도록 앞말과 숫자를 섞음
+    lines = []
+    size = 0
+    while size < minutes * _CHARS_PER_MINUTE:
+        line = f"{rng.choice(_LEADS)}{rng.randint(1, 30)}일 {rng.choice(_SENTENCES)}"
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def _first_three(text: str) -> list:
+    # 예전 summarize_text_rule_based
+    parts = [p.strip() for p in text.replace("!", ".").replace("?", ".").split(".") if p.strip()]
+    return [p + "." for p in parts[:3]]
+
+
+def _timeit(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    glossary = get_glossary()
+    numpy_module = ex.np
+
+    for minutes in args.minutes:
+        text = _make_transcript(minutes, rng)
+        sentences = len(ex.split_sentences(text))
+
+        old_ms = _timeit(lambda: _first_three(text), args.repeat)
+        np_ms = _timeit(lambda: ex.extractive_summary(text, glossary=glossary), args.repeat)
+
+        ex.np = None
+        py_ms = _timeit(lambda: ex.extractive_summary(text, glossary=glossary), args.repeat)
+        ex.np = numpy_module
+
+        print(
+            f"{minutes:>3}분 ({len(text):,}자, {sentences:,}문장): "
+            f"앞 3문장 {old_ms:7.2f} ms | 추출 요약(numpy) {np_ms:7.2f} ms | 추출 요약(python) {py_ms:7.2f} ms"
+        )
+    print("요약 예:", ex.extractive_summary(text, glossary=glossary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+기록/질문 조회의 서버 쪽 비용: 매번 새로 만들기 vs 직렬화 bytes 캐시 vs If-None-Match 304
+
+임시 DB에 합성 기록을 넣고, 라우트 함수를 직접 불러서 요청 하나당 시간을 잰다
+(HTTP 전송/미들웨어 비용은 빼고 핸들러 안쪽만).
+
+실행 (medexplain/server 에서):
+    python -m bench.bench_http_cache --records 5000 --chars 3000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+
+def _request(path: str, query: str = "", etag: str = ""):
+    from starlette.requests import Request
+
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": headers})
+
+
+def _time(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--chars", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["MEDEXPLAIN_DB_PATH"] = str(Path(tmp) / "bench.sqlite3")
+
+    from bench.bench_search import _make_record
+    from app.routes import records as records_routes
+    from app.services.response_cache import get_response_cache
+    from app.storage.repositories import get_record_repository
+
+    rng = random.Random(7)
+    repo = get_record_repository()
+    repo.insert_many(_make_record(rng, args.chars) for _ in range(args.records))
+    record_id = repo.list_page(limit=1, after_seq=args.records // 2)[0][0]["record_id"]
+    detail_path = f"/records/{record_id}"
+
+    def detail_uncached():
+        get_response_cache().clear()
+        records_routes.get_record_detail(record_id, _request(detail_path))
+
+    def detail_cached():
+        records_routes.get_record_detail(record_id, _request(detail_path))
+
+    etag = records_routes.get_record_detail(record_id, _request(detail_path)).headers["etag"]
+
+    def detail_304():
+        records_routes.get_record_detail(record_id, _request(detail_path, etag=etag))
+
+    def list_call(etag=""):
+        return records_routes.get_records(
+            _request("/records", "limit=50", etag), limit=50, cursor=None, date_from=None, date_to=None, department=None
+        )
+
+    def list_uncached():
+        get_response_cache().clear()
+        list_call()
+
+    list_etag = list_call().headers["etag"]
+
+    print(f"records={args.records} chars={args.chars} (us/request)")
+    for name, fn in [
+        ("detail uncached", detail_uncached),
+        ("detail cached bytes", detail_cached),
+        ("detail 304", detail_304),
+        ("list50 uncached", list_uncached),
+        ("list50 cached bytes", list_call),
+        ("list50 304", lambda: list_call(list_etag)),
+    ]:
+        print(f"  {name:22s} {_time(fn, args.rounds):8.1f}")
+    print(get_response_cache().stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+AI 엔드포인트 부하 벤치마크 (네트워크/API 키 없이, 로컬 fake LLM backend)
+
+/summary, /explain, /questions/analyze, /analyze, 예전 /summarize를
+고정 동시성으로 두드리고 p50/p95/p99 지연, 처리량, fallback 비율을 낸다.
+요청마다 입력을 조금씩 바꿔서 LLM 캐시에 걸리지 않게 한다.
+
+실행 (medexplain/server 에서):
+    python -m bench.bench_llm_endpoints --concurrency 32 --requests 200 --latency-ms 800
+    python -m bench.bench_llm_endpoints --error-rate 0.2 --malformed-rate 0.05 --deadline 3
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+_TRANSCRIPT = (
+    "오늘 검사 결과 설명드릴게요. 위내시경에서 위선암이 확인됐습니다. "
+    "조직 검사 결과 림프관 침범은 없었어요. CRP 수치는 정상 범위이고 eGFR도 괜찮습니다. "
+    "다음 주에 CT 찍고 수술 일정을 잡겠습니다. 항암화학요법은 수술 후에 다시 상의하겠습니다."
+)
+_QUESTIONS = "CRP가 뭔가요?\n제 수치는 왜 높나요?\n수술 후에 바로 걸을 수 있나요?"
+
+_ENDPOINTS = {
+    "summary": ("/summary", lambda i: {"text": f"{_TRANSCRIPT} 기록 {i}."}),
+    "summary-fast": ("/summary?tier=fast", lambda i: {"text": f"{_TRANSCRIPT} 기록 {i}."}),
+    "explain": ("/explain", lambda i: {"text": f"{_TRANSCRIPT} 기록 {i}."}),
+    "questions": ("/questions/analyze", lambda i: {"text": f"{_QUESTIONS}\n{i}번 질문?"}),
+    "analyze": (
+        "/analyze",
+        lambda i: {"text": f"{_TRANSCRIPT} 기록 {i}.", "questions_text": f"{_QUESTIONS}\n{i}번 질문?"},
+    ),
+    "summarize": ("/summarize", lambda i: {"raw_text": f"{_TRANSCRIPT} 기록 {i}."}),
+}
+
+
+def _percentile(values, p):
+    ordered = sorted(values)
+    index = min(int(len(ordered) * p / 100.0), len(ordered) - 1)
+    return ordered[index]
+
+
+async def _run_endpoint(client, name, *, concurrency, total, offset):
+    from app.services.llm_cache import llm_call_stats
+
+    path, make_body = _ENDPOINTS[name]
+    latencies = []
+    errors = 0
+    legacy_fallbacks = 0
+    next_index = iter(range(offset, offset + total))
+    before = llm_call_stats()
+
+    async def worker():
+        nonlocal errors, legacy_fallbacks
+        for i in next_index:
+            start = time.perf_counter()
+            response = await client.post(path, json=make_body(i))
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+            elif name == "summarize" and any("기본 응답" in w for w in response.json()["warnings"]):
+                legacy_fallbacks += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    after = llm_call_stats()
+    calls = after["calls"] - before["calls"]
+    fallbacks = (
+        after["fallbacks"] - before["fallbacks"]
+        + after["deadline_fallbacks"] - before["deadline_fallbacks"]
+    )
+    if name == "summarize":
+        calls, fallbacks = total, legacy_fallbacks
+
+    ms = [x * 1000 for x in latencies]
+    print(
+        f"{name:<13} n={total:<5} {total / elapsed:8.1f} req/s | "
+        f"p50 {_percentile(ms, 50):7.1f} ms  p95 {_percentile(ms, 95):7.1f} ms  "
+        f"p99 {_percentile(ms, 99):7.1f} ms  mean {statistics.mean(ms):7.1f} ms | "
+        f"fallback {fallbacks / calls if calls else 0.0:6.1%}  errors {errors}"
+    )
+
+
+async def _main(args):
+    import httpx
+
+    from app.main import app
+    from app.services.glossary import get_glossary_store
+    from app.services.llm_client import get_llm_client, init_llm_client
+
+    # ASGITransport는 startup 이벤트를 돌리지 않으므로 필요한 것만 직접
+    init_llm_client()
+    get_glossary_store().reload()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        offset = 0
+        for name in args.endpoints:
+            await _run_endpoint(client, name, concurrency=args.concurrency, total=args.requests, offset=offset)
+            offset += args.requests
+
+    print("llm:", {k: v for k, v in get_llm_client().stats().items() if k != "breaker"})
+    print("breaker:", get_llm_client().stats()["breaker"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(_ENDPOINTS), default=list(_ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--deadline", type=float, default=10.0, help="요청당 LLM deadline (초)")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="LLM 동시 요청 제한")
+    parser.add_argument("--no-hedge", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # app import 전에 설정해야 init_llm_client가 fake backend를 만든다
+    os.environ.update({
+        "LLM_BACKEND": "fake",
+        "LLM_FAKE_LATENCY_MS": str(args.latency_ms),
+        "LLM_FAKE_LATENCY_SIGMA": str(args.sigma),
+        "LLM_FAKE_ERROR_RATE": str(args.error_rate),
+        "LLM_FAKE_MALFORMED_RATE": str(args.malformed_rate),
+        "LLM_FAKE_SEED": str(args.seed),
+        "LLM_REQUEST_DEADLINE_SECONDS": str(args.deadline),
+        "LLM_MAX_CONCURRENCY": str(args.max_concurrency),
+        "LLM_HEDGE": "0" if args.no_hedge else "1",
+        "LLM_CACHE_DISK": "0",
+    })
+
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
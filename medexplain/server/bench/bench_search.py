@@ -0,0 +1,116 @@
+"""
+기록 전문 검색 벤치마크: 예전 방식(전체 기록 읽어서 문자열 찾기) vs 역색인 (BM25)
+
+임시 DB에 합성 진료 기록을 넣고, 색인 크기와 질의당 시간을 잰다.
+
+실행 (medexplain/server 에서):
+    python -m bench.bench_search --records 20000 --chars 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from app.storage.database import Database
+from app.storage.repositories import RecordRepository
+from app.storage.search import SearchIndex
+
+_SENTENCES = [
+    "오늘 검사 결과 설명드릴게요",
+    "위내시경에서 위염 소견이 보입니다",
+    "혈압이 조금 높게 나왔어요",
+    "공복 혈당은 정상 범위입니다",
+    "다음 주에 CT 찍고 다시 뵙겠습니다",
+    "네 그렇군요",
+    "약은 하루 두 번 식후에 드세요",
+    "궁금한 점 있으시면 물어보세요",
+    "아 네 알겠습니다",
+    "콜레스테롤 수치가 조금 높아요",
+    "운동은 하루 30분 정도 걷기부터 하세요",
+]
+
+# 드물게만 나오는 문장 (찾고 싶은 방문)
+_RARE = [
+    "CRP 수치가 올라가 있어서 염증이 의심됩니다",
+    "갑상선 초음파에서 결절이 보였어요",
+    "헬리코박터 제균 치료를 시작하겠습니다",
+]
+
+_DEPARTMENTS = ["내과", "소화기내과", "내분비내과", "가정의학과"]
+
+_QUERIES = ["CRP", "갑상선 결절", "헬리코박터", "혈압", "콜레스테롤 수치", "없는말"]
+
+
+def _make_record(rng: random.Random, chars: int) -> dict:
+    lines = []
+    size = 0
+    while size < chars:
+        line = f"{rng.randint(1, 30)}일 {rng.choice(_SENTENCES)}"
+        if rng.random() < 0.002:
+            line = rng.choice(_RARE)
+        lines.append(line)
+        size += len(line) + 1
+    return {
+        "record_id": str(uuid.uuid4()),
+        "date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "department": rng.choice(_DEPARTMENTS),
+        "clean_text": "\n".join(lines),
+        "summary": lines[:3],
+        "terms": [],
+    }
+
+
+def _scan(repo: RecordRepository, query: str) -> int:
+    # 예전 방식: 전체 기록을 읽어서 부분 문자열 찾기
+    words = query.lower().split()
+    return sum(
+        1
+        for r in repo.list_all()
+        if all(w in r["clean_text"].lower() for w in words)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--chars", type=int, default=2000, help="기록 하나의 전사 길이")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.sqlite3"
+        db = Database(path)
+        repo = RecordRepository(db)
+        index = SearchIndex(db)
+
+        start = time.perf_counter()
+        batch = 500
+        for i in range(0, args.records, batch):
+            repo.insert_many(_make_record(rng, args.chars) for _ in range(min(batch, args.records - i)))
+        elapsed = time.perf_counter() - start
+        size_mb = sum(os.path.getsize(p) for p in Path(tmp).glob("bench.sqlite3*")) / 1e6
+        print(
+            f"insert+index records={args.records} {elapsed:.1f}s "
+            f"({elapsed / args.records * 1000:.2f} ms/record) db={size_mb:.0f}MB"
+        )
+
+        print(f"{'query':<16}{'hits':>6}{'index_ms':>10}{'scan_ms':>10}")
+        for query in _QUERIES:
+            best = float("inf")
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                results = index.search(query, limit=20)
+                best = min(best, time.perf_counter() - t)
+            t = time.perf_counter()
+            _scan(repo, query)
+            scan = time.perf_counter() - t
+            print(f"{query:<16}{len(results):>6}{best * 1000:>10.1f}{scan * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+번역 서비스 처리량 벤치마크 (네트워크 없이 로컬 엔진 사용)
+
+실행 (medexplain/server 에서):
+    python -m bench.bench_translation --segments 2000 --phrases 300 --latency-ms 2
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.translation import LocalTranslationBackend, TranslationService
+
+_TEMPLATES = [
+    "검사 전날 밤 9시 이후로는 금식하세요.",
+    "수술 전에 복용 중인 약을 모두 알려주세요.",
+    "CRP 수치가 {n} 정도로 올라가 있습니다.",
+    "다음 외래는 {n}주 뒤에 잡겠습니다.",
+    "조직 검사 결과는 일주일 정도 걸립니다.",
+    "항암화학요법은 {n}차까지 진행할 예정입니다.",
+]
+
+
+def _make_segments(segments: int, phrases: int, seed: int) -> list:
+    rng = random.Random(seed)
+    pool = [rng.choice(_TEMPLATES).format(n=i) for i in range(phrases)]
+    # 진료 대화는 같은 안내 문구가 자주 반복되므로 앞쪽 문구에 가중치
+    weights = [1.0 / (rank + 1) for rank in range(len(pool))]
+    return rng.choices(pool, weights=weights, k=segments)
+
+
+async def _run(service: TranslationService, segments: list, targets: tuple) -> float:
+    started = time.perf_counter()
+    for text in segments:
+        await service.translate(text, source_lang="ko", target_langs=targets)
+    return time.perf_counter() - started
+
+
+async def _run_per_target(backend: LocalTranslationBackend, segments: list, targets: tuple) -> float:
+    # 기존 방식: 캐시 없이 target마다 따로 호출
+    started = time.perf_counter()
+    for text in segments:
+        for target in targets:
+            await backend.translate_batch(text, "ko", [target])
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=2000)
+    parser.add_argument("--phrases", type=int, default=300)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="backend 호출당 지연")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    targets = ("en", "zh")
+    segments = _make_segments(args.segments, args.phrases, args.seed)
+
+    backend = LocalTranslationBackend(latency_ms=args.latency_ms)
+    baseline = asyncio.run(_run_per_target(backend, segments, targets))
+
+    service = TranslationService(backend, cache_size=args.cache_size)
+    elapsed = asyncio.run(_run(service, segments, targets))
+
+    print(f"segments={len(segments)} targets={len(targets)}")
+    print(f"per-target calls : {baseline:.3f}s ({len(segments) / baseline:,.0f} seg/s, "
+          f"{len(segments) * len(targets)} backend calls)")
+    print(f"batched + cache  : {elapsed:.3f}s ({len(segments) / elapsed:,.0f} seg/s)")
+    print(f"stats: {service.stats()}")
+
+
+if __name__ == "__main__":
+    main()
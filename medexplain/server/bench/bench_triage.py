@@ -0,0 +1,51 @@
+"""
+로컬 응급 질문 분류(triage) 지연 시간: 환자 질문 텍스트 하나당 몇 us인지
+
+LLM 호출 전에 매 요청마다 도는 단계라서 질문 길이별로 잰다.
+
+실행 (medexplain/server 에서):
+    python -m bench.bench_triage --questions 1 5 20
+"""
+import argparse
+import random
+import time
+
+from app.services.triage import get_triage_matcher
+
+_QUESTIONS = [
+    "CRP가 뭔가요?",
+    "제 CRP가 왜 높나요?",
+    "약은 식후에 먹어야 하나요?",
+    "수술 후에 운동은 언제부터 할 수 있나요?",
+    "내시경 전날 저녁은 먹어도 되나요?",
+    "갑자기 가슴이 너무 아파요",
+    "요즘 계단만 올라가도 숨이 차요",
+    "What does HbA1c mean?",
+    "my chest suddenly hurts badly",
+    "검사 결과는 언제 나오나요?",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    started = time.perf_counter()
+    matcher = get_triage_matcher()
+    print(f"compile {(time.perf_counter() - started) * 1000:.1f} ms, rules={len(matcher.rules)}")
+
+    for n in args.questions:
+        texts = ["\n".join(rng.choice(_QUESTIONS) for _ in range(n)) for _ in range(50)]
+        started = time.perf_counter()
+        for i in range(args.rounds):
+            matcher.triage(texts[i % len(texts)])
+        per_call = (time.perf_counter() - started) / args.rounds * 1e6
+        chars = sum(len(t) for t in texts) / len(texts)
+        print(f"questions={n:3d} chars={chars:6.0f}  {per_call:8.1f} us/text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+기록 저장 벤치마크: 예전 JSON 파일 다시 쓰기 vs 요청마다 SQLite commit vs group commit
+
+동시 저장 스레드 수별로 처리량과 저장 한 번의 지연(p50/p99)을 잰다.
+- json: 예전 방식 (파일 전체 읽기 -> 추가 -> 다시 쓰기, 잠금으로 직렬화, fsync 없음)
+- per-request: 요청 스레드마다 BEGIN IMMEDIATE ... COMMIT (synchronous=FULL)
+- group: GroupCommitWriter (동시 저장을 commit 하나로, synchronous=FULL)
+
+실행 (medexplain/server 에서):
+    python -m bench.bench_writes --threads 1 8 32 --writes 2000
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from app.storage.database import Database
+from app.storage.repositories import RecordRepository
+from app.storage.writer import GroupCommitWriter
+
+_TEXT = "오늘 검사 결과 설명드릴게요. 공복 혈당이 조금 높게 나왔어요. 약은 하루 두 번 식후에 드세요. " * 20
+
+
+def _record() -> dict:
+    return {
+        "record_id": str(uuid.uuid4()),
+        "date": "2026-10-19",
+        "department": "내과",
+        "clean_text": _TEXT,
+        "summary": ["공복 혈당이 조금 높게 나왔어요."],
+        "terms": [{"term": "공복 혈당", "easy": "", "description": ""}],
+    }
+
+
+def _json_saver(tmp: Path, preload: int):
+    path = tmp / "records.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([_record() for _ in range(preload)], f, ensure_ascii=False, indent=2)
+    lock = threading.Lock()
+
+    def save(record):
+        with lock:
+            with open(path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            records.append(record)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, indent=2)
+
+    return save, lambda: None
+
+
+def _per_request_saver(tmp: Path, preload: int):
+    db = Database(tmp / "per_request.sqlite3")
+    repo = RecordRepository(db)
+    repo.insert_many(_record() for _ in range(preload))
+    local = threading.local()
+
+    def save(record):
+        if not getattr(local, "ready", False):
+            db.connection().execute("PRAGMA synchronous=FULL")
+            local.ready = True
+        repo.insert(record)
+
+    return save, lambda: None
+
+
+def _group_saver(tmp: Path, preload: int):
+    db = Database(tmp / "group.sqlite3")
+    repo = RecordRepository(db)
+    repo.insert_many(_record() for _ in range(preload))
+    writer = GroupCommitWriter(db)
+
+    def save(record):
+        writer.write(lambda: repo.insert(record))
+
+    def report():
+        stats = writer.stats()
+        writer.close()
+        return f"avg_batch={stats['avg_batch']} max_batch={stats['max_batch']}"
+
+    return save, report
+
+
+def _run(save, threads: int, writes: int):
+    latencies = []
+    lock = threading.Lock()
+    per_thread = writes // threads
+
+    def worker():
+        mine = []
+        for _ in range(per_thread):
+            record = _record()
+            start = time.perf_counter()
+            save(record)
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+    return len(latencies) / elapsed, statistics.median(latencies), p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--writes", type=int, default=2000, help="설정마다 저장 횟수 (json은 1/10)")
+    parser.add_argument("--preload", type=int, default=1000, help="시작할 때 이미 있는 기록 수")
+    args = parser.parse_args()
+
+    savers = [("json", _json_saver), ("per-request", _per_request_saver), ("group", _group_saver)]
+    print(f"{'mode':<13}{'threads':>8}{'writes/s':>10}{'p50_ms':>9}{'p99_ms':>9}")
+    for threads in args.threads:
+        for name, make in savers:
+            with tempfile.TemporaryDirectory() as tmp:
+                save, report = make(Path(tmp), args.preload)
+                # json은 기록이 쌓일수록 느려져서 횟수를 줄임
+                writes = args.writes // 10 if name == "json" else args.writes
+                rate, p50, p99 = _run(save, threads, max(writes, threads))
+                extra = report() or ""
+                print(f"{name:<13}{threads:>8}{rate:>10.0f}{p50 * 1000:>9.2f}{p99 * 1000:>9.2f}  {extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from app.services import llm_cache, llm_client
+from app.services.llm_cache import LLMResultCache
+from app.services.single_flight import SingleFlight
+from app.storage import database, writer
+from app.storage.database import Database
+
+
+class ScriptedBackend:
+    """reply(prompt)로 답하는 테스트용 LLM backend. 예외를 돌려주면 그 예외를 낸다."""
+
+    name = "scripted"
+
+    def __init__(self, reply, *, delay: float = 0.0, chunk_size: int = 8):
+        self.reply = reply
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.prompts = []
+
+    async def generate(self, model, prompt):
+        self.prompts.append(prompt)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        value = self.reply(prompt)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    async def generate_stream(self, model, prompt):
+        text = await self.generate(model, prompt)
+        for i in range(0, len(text), self.chunk_size):
+            yield text[i:i + self.chunk_size]
+
+    async def aclose(self):
+        pass
+
+
+def _record(i, **overrides):
+    record = {
+        "record_id": f"r{i}",
+        "date": f"2026-01-{i:02d}",
+        "department": "내과" if i % 2 else "외과",
+        "clean_text": f"{i}번째 진료 CRP 수치 설명",
+        "summary": [f"요약 {i}"],
+        "terms": [{"term": "CRP", "description": "염증 수치"}],
+    }
+    record.update(overrides)
+    return record
+
+
+def _question(i, record_id=None):
+    return {
+        "question_id": f"q{i}",
+        "created_at": f"2026-01-{i:02d}T09:00:00",
+        "raw_text": f"질문 {i}",
+        "general_info": [],
+        "ask_doctor": [f"질문 {i}?", "또?"],
+        "caution": [],
+        "record_id": record_id,
+    }
+
+
+@pytest.fixture
+def make_record():
+    """make_record(i, **overrides) -> 저장용 기록 dict (record_id r{i}, 홀수 내과/짝수 외과, 2026-01-{i})."""
+    return _record
+
+
+@pytest.fixture
+def make_question():
+    """make_question(i, record_id=None) -> 저장용 질문 dict (question_id q{i})."""
+    return _question
+
+
+@pytest.fixture
+def memory_llm_cache(monkeypatch):
+    """디스크 없는 새 LLM 캐시 + 새 single-flight (테스트끼리 결과를 공유하지 않게)."""
+    cache = LLMResultCache(None)
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    monkeypatch.setattr(llm_cache, "_inflight", SingleFlight())
+    return cache
+
+
+@pytest.fixture
+def no_llm(monkeypatch, memory_llm_cache):
+    """LLM backend 없음 -> 모든 LLM 경로가 fallback."""
+    monkeypatch.delenv("LLM_BACKEND", raising=False)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setattr(llm_client, "_client", None)
+
+
+@pytest.fixture
+def scripted_llm(monkeypatch, memory_llm_cache):
+    """scripted_llm(reply, **client_options) -> 전역 LLMClient로 설치된 ScriptedBackend."""
+
+    def install(reply, *, delay: float = 0.0, **options) -> ScriptedBackend:
+        backend = ScriptedBackend(reply, delay=delay)
+        options.setdefault("hedge", False)
+        monkeypatch.setattr(llm_client, "_client", llm_client.LLMClient(backend, model="scripted", **options))
+        return backend
+
+    return install
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """임시 파일 DB를 전역 저장소로 (get_database()도 이걸 돌려줌)."""
+    instance = Database(tmp_path / "test.sqlite3")
+    monkeypatch.setattr(database, "_db", instance)
+    return instance
+
+
+@pytest.fixture
+def client(db, no_llm, monkeypatch):
+    """임시 DB와 LLM 없는 설정으로 띄운 앱 (startup 이벤트는 돌리지 않음)."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    monkeypatch.setattr(writer, "_writer", None)
+    yield TestClient(app)
+    writer.close_writer()
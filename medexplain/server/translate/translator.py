@@ -1,5 +1,9 @@
 from typing import Literal, Dict, Any
 
+from app.services.translation import LocalTranslationBackend
+
+_backend = LocalTranslationBackend()
+
 
 def translate_text(
     text: str,
@@ -7,30 +11,13 @@ def translate_text(
 ) -> Dict[str, Any]:
     """
     가짜 번역 함수 (M2용 더미)
-    - 실제 번역 API 붙이기 전 단계
+    - app.services.translation의 로컬 번역 엔진을 그대로 사용
     - 실패/불확실 상황도 흉내냄
+    - en이 아니면 전부 "[ZH]" (예전 더미와 같은 출력)
     """
-
-    # 방어: 빈 텍스트
-    if not text.strip():
-        return {
-            "ok": False,
-            "translated_text": text,
-            "reason": "empty_text",
-        }
-
-    # 예시: 특정 키워드가 있으면 '불확실' 처리
-    if "??" in text:
-        return {
-            "ok": False,
-            "translated_text": text,
-            "reason": "translation_uncertain",
-        }
-
-    # 정상 번역인 척
-    fake_prefix = "[EN]" if target_lang == "en" else "[ZH]"
+    result = _backend.translate_one(text, "en" if target_lang == "en" else "zh")
     return {
-        "ok": True,
-        "translated_text": f"{fake_prefix} {text}",
-        "reason": None,
+        "ok": result.ok,
+        "translated_text": result.text,
+        "reason": result.reason,
     }